@@ -2,7 +2,7 @@
 
 __author__: str = "Digital Horizons"
 
-from .service import BaseService
+from .service import BaseService, ShardedService
 from .settings import Settings, settings
 from .exceptions import (
     BaseAppException,
@@ -11,3 +11,5 @@ from .exceptions import (
     BaseNotFoundAppException,
     BaseBadRequestAppException,
 )
+from .conditional import make_etag, conditional_response
+from .serialization import dumps, loads, dumps_str, get_adapter, schema_response
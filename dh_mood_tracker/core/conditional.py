@@ -0,0 +1,99 @@
+"""Модуль условных GET запросов по ETag и Last-Modified"""
+
+__author__: str = "Digital Horizons"
+
+import hashlib
+from typing import Any, Callable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Сильный ETag из версии ресурса. Части версии должны однозначно определять тело ответа:
+    идентификатор и версию строки, параметры запроса и версию схемы ответа
+
+    :param parts: части версии
+    :type parts: Any
+    :return: ETag в кавычках
+    :rtype: str
+
+    .. code-block:: python
+        from dh_mood_tracker.core import make_etag
+
+        etag: str = make_etag("user", 1, user.id, user.updated_at)
+    """
+    version: str = "|".join(map(str, parts))
+    return f'"{hashlib.blake2b(version.encode(), digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Слабое сравнение If-None-Match (RFC 9110): префикс W/ не учитывается"""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    """Ресурс не изменялся после If-Modified-Since. Некорректная дата заголовка не учитывается"""
+    try:
+        since: datetime = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    build: Callable[[], Response],
+    last_modified: datetime | None = None,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    """
+    Ответ на условный GET запрос. Если версия у клиента совпадает с текущей - возвращается 304 без тела,
+    и build не вызывается: тело ответа не сериализуется. If-Modified-Since проверяется только без If-None-Match
+
+    :param request: запрос
+    :type request: Request
+    :param etag: текущий ETag ресурса из make_etag
+    :type etag: str
+    :param build: построение ответа с телом
+    :type build: Callable[[], Response]
+    :param last_modified: время последнего изменения ресурса с часовым поясом
+    :type last_modified: datetime | None
+    :param cache_control: значение Cache-Control. По умолчанию ответ хранится только клиентом
+        и перед использованием проверяется условным запросом
+    :type cache_control: str
+    :return: ответ 304 или ответ build с заголовками версии
+    :rtype: Response
+
+    .. code-block:: python
+        from dh_mood_tracker.core import conditional_response, make_etag, schema_response
+
+        @auth_routes.get("/me", response_model=PublicUserData)
+        def user_data_get(request: Request, user: UserModel = Depends(get_user_data)) -> Response:
+            return conditional_response(
+                request, make_etag(user.id, user.updated_at), lambda: schema_response(user, PublicUserData)
+            )
+    """
+    headers: dict[str, str] = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Cookie"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(UTC), usegmt=True)
+
+    if (if_none_match := request.headers.get("if-none-match")) is not None:
+        not_modified: bool = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and (if_modified_since := request.headers.get("if-modified-since")):
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response: Response = build()
+    response.headers.update(headers)
+
+    return response
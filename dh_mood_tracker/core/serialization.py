@@ -0,0 +1,129 @@
+"""Модуль сериализации JSON для ответов, кеша и событий"""
+
+__author__: str = "Digital Horizons"
+
+from typing import Any
+from functools import cache
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel as BaseSchema
+from pydantic import TypeAdapter
+
+# Опции orjson: ключи словарей не только строки (например, UUID или int)
+DUMPS_OPTIONS: int = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """
+    Преобразование типов, которые orjson не кодирует сам.
+    UUID, datetime, Enum и dataclass кодируются orjson без преобразования
+
+    :param value: значение
+    :type value: Any
+    :return: значение, которое orjson сможет закодировать
+    :rtype: Any
+
+    :exception TypeError: тип не поддерживается
+    """
+    if isinstance(value, BaseSchema):
+        return value.model_dump(mode="json")
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Кодирование данных в JSON
+
+    :param data: данные
+    :type data: Any
+    :return: JSON в UTF-8
+    :rtype: bytes
+
+    :exception orjson.JSONEncodeError: данные не сериализуются. Наследник TypeError
+
+    .. code-block:: python
+        from dh_mood_tracker.core.serialization import dumps
+
+        dumps({"supabase_id": uuid.uuid4(), "timestamp": datetime.now(UTC)})
+    """
+    return orjson.dumps(data, default=_default, option=DUMPS_OPTIONS)
+
+
+def dumps_str(data: Any) -> str:
+    """
+    Кодирование данных в строку JSON
+
+    :param data: данные
+    :type data: Any
+    :return: строка JSON
+    :rtype: str
+    """
+    return dumps(data).decode()
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Декодирование JSON
+
+    :param data: JSON
+    :type data: bytes | str
+    :return: данные
+    :rtype: Any
+
+    :exception orjson.JSONDecodeError: некорректный JSON. Наследник json.JSONDecodeError
+    """
+    return orjson.loads(data)
+
+
+@cache
+def get_adapter(schema: Any) -> TypeAdapter:
+    """
+    Адаптер pydantic для типа. Схема валидации и сериализации строится один раз на тип
+
+    :param schema: тип или схема данных
+    :type schema: Any
+    :return: адаптер типа
+    :rtype: TypeAdapter
+    """
+    return TypeAdapter(schema)
+
+
+def schema_response(data: Any, schema: Any, status_code: int = 200, validate: bool = False) -> Response:
+    """
+    Ответ JSON по схеме данных. Данные сериализуются сразу в байты адаптером схемы,
+    без промежуточного словаря и повторного кодирования.
+    По умолчанию данные не проверяются: ответ строится из записей БД, проверенных при записи,
+    а проверка EmailStr в разы дороже самой сериализации
+
+    :param data: данные или ORM модель
+    :type data: Any
+    :param schema: схема ответа
+    :type schema: Any
+    :param status_code: HTTP код ответа
+    :type status_code: int
+    :param validate: проверять данные по схеме. Для схем не на pydantic данные проверяются всегда
+    :type validate: bool
+    :return: ответ с JSON телом
+    :rtype: Response
+
+    .. code-block:: python
+        from dh_mood_tracker.core import schema_response
+
+        @auth_routes.post("/me", response_model=PublicUserData)
+        def user_data(user: UserModel = Depends(get_user_data)) -> Response:
+            return schema_response(user, PublicUserData)
+    """
+    adapter: TypeAdapter = get_adapter(schema)
+
+    if isinstance(schema, type) and issubclass(schema, BaseSchema) and not validate:
+        if not isinstance(data, schema):
+            data = schema.model_construct(**{name: getattr(data, name) for name in schema.model_fields})
+    else:
+        data = adapter.validate_python(data, from_attributes=True)
+
+    return Response(adapter.dump_json(data), status_code=status_code, media_type="application/json")
@@ -3,12 +3,18 @@
 
 __author__: str = "Digital Horizons"
 
-from typing import Any, Type, Generic, TypeVar
+from uuid import UUID
+from typing import TYPE_CHECKING, Any, Self, Type, Generic, TypeVar, AsyncIterator
+from contextlib import asynccontextmanager
 
 from pydantic import BaseModel as BaseSchema
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+if TYPE_CHECKING:
+    from dh_mood_tracker.db import ShardRouter
+    from dh_mood_tracker.events import BaseEvent
+
 # Тип для модели
 ModelType = TypeVar("ModelType")
 # Тип для схемы данных
@@ -70,12 +76,33 @@ class BaseService(Generic[ModelType, SchemaType]):
 
         return result
 
-    async def create(self, schema_data: SchemaType) -> ModelType:
+    def add_events(self, *events: "BaseEvent") -> None:
+        """
+        Запись событий в исходящие события (outbox) текущей транзакции.
+        События фиксируются вместе с данными и доставляются обработчикам только после фиксации
+
+        :param events: события
+        :type events: BaseEvent
+
+        .. code-block:: python
+            async def deactivate(self, user: UserModel) -> None:
+                user.is_active = False
+                self.add_events(UserDeactivated(user.id))
+                await self.session_db.commit()
+        """
+        # Импорт при вызове: пакет outbox зависит от db, который импортирует core
+        from dh_mood_tracker.outbox import OutboxMessage  # pylint: disable=import-outside-toplevel
+
+        self.session_db.add_all([OutboxMessage.from_event(event) for event in events])
+
+    async def create(self, schema_data: SchemaType, *events: "BaseEvent") -> ModelType:
         """
         Метод создания сущности в БД
 
         :param schema_data: данные для создания сущности
         :type schema_data: SchemaType
+        :param events: события, записываемые в outbox в одной транзакции с сущностью
+        :type events: BaseEvent
         :return: новая сущность в БД
         :rtype: ModelType
 
@@ -94,7 +121,65 @@ class BaseService(Generic[ModelType, SchemaType]):
                 setattr(model, key, value)
 
         self.session_db.add(model)
+        if events:
+            self.add_events(*events)
         await self.session_db.commit()
         await self.session_db.refresh(model)
 
         return model
+
+
+class ShardedService(BaseService[ModelType, SchemaType]):
+    """
+    Базовый сервис данных пользователя, распределенных по шардам: сессия открывается в БД шарда пользователя,
+    определяемого по ключу шарда через ShardRouter. Запросы сервиса не должны выходить за данные одного пользователя,
+    запросы по всем шардам выполняются через ShardRouter.scatter_gather.
+    Запрещается использовать напрямую, предназначен только для наследования
+
+    :ivar shard: номер шарда сессии
+    :type shard: int
+
+    .. code-block:: python
+        from dh_mood_tracker.core.service import ShardedService
+
+
+        class MoodService(ShardedService[MoodEntry, MoodEntryIn]):
+            _MODEL: MoodEntry = MoodEntry
+
+
+        async def get_mood_service(
+            user: UserModel = Depends(get_user_data), router: ShardRouter = Depends(get_shard_router)
+        ) -> AsyncIterator[MoodService]:
+            async with MoodService.for_key(router, user.supabase_id) as service:
+                yield service
+    """
+
+    def __init__(self, session_db: AsyncSession, shard: int = 0) -> None:
+        """
+        Инициализация сервиса
+
+        :param session_db: сессия подключения к БД шарда
+        :type session_db: AsyncSession
+        :param shard: номер шарда сессии
+        :type shard: int
+        """
+        super().__init__(session_db)
+        self.shard: int = shard
+
+    @classmethod
+    @asynccontextmanager
+    async def for_key(cls, router: "ShardRouter", shard_key: UUID) -> AsyncIterator[Self]:
+        """
+        Сервис в сессии шарда пользователя. Транзакция фиксируется при выходе и откатывается при ошибке
+
+        :param router: маршрутизатор шардов
+        :type router: ShardRouter
+        :param shard_key: ключ шарда - UUID пользователя в SupaBase
+        :type shard_key: UUID
+        :return: сервис в сессии шарда
+        :rtype: AsyncIterator[Self]
+        """
+        shard: int = router.shard_of(shard_key)
+
+        async with router.session(shard) as session:
+            yield cls(session, shard)
@@ -26,6 +26,127 @@ class Settings(BaseSettings):
     :type SUPABASE_TOKEN: str
     :cvar DEBUG: режим отладки
     :type DEBUG: bool
+    :cvar DB_CONNECTION_BUDGET: общее количество соединений с БД на все процессы всех реплик приложения.
+        Должно оставаться меньше max_connections PostgreSQL с запасом на миграции и администрирование
+    :type DB_CONNECTION_BUDGET: int
+    :cvar DB_WORKERS: количество процессов приложения на реплике (uvicorn --workers)
+    :type DB_WORKERS: int
+    :cvar DB_REPLICAS: количество реплик приложения, подключенных к одной БД
+    :type DB_REPLICAS: int
+    :cvar DB_POOL_SIZE: постоянные соединения пула процесса вместо расчета из бюджета. 0 - без пула (NullPool)
+    :type DB_POOL_SIZE: int | None
+    :cvar DB_MAX_OVERFLOW: временные соединения пула процесса сверх DB_POOL_SIZE
+    :type DB_MAX_OVERFLOW: int | None
+    :cvar DB_POOL_TIMEOUT: сколько секунд ждать свободного соединения пула до ошибки
+    :type DB_POOL_TIMEOUT: float
+    :cvar DB_PGBOUNCER: подключение через PgBouncer в режиме pool_mode=transaction:
+        выключает кеш подготовленных выражений asyncpg
+    :type DB_PGBOUNCER: bool
+    :cvar DB_PREWARM_CONNECTIONS: количество соединений с БД, открываемых до приема трафика. 0 - без прогрева
+    :type DB_PREWARM_CONNECTIONS: int
+    :cvar DB_SHARD_URLS: адреса БД шардов данных пользователей (записей настроения). Пусто - один шард DATABASE_URL.
+        Пользователи распределяются по шардам согласованным хешированием supabase_id, поэтому шарды
+        добавляются только в конец списка. Бюджет соединений DB_CONNECTION_BUDGET действует для каждой БД.
+        После задания или расширения списка новые шарды мигрируются (alembic -x shard=N upgrade head),
+        а записи, оставшиеся в прежних шардах или в DATABASE_URL, переносятся командой
+        python -m dh_mood_tracker.moods: до переноса они не видны в рядах настроения
+    :type DB_SHARD_URLS: list[str]
+    :cvar DB_MIGRATION_LOCK_TIMEOUT: сколько секунд миграция ждет блокировки таблицы до ошибки,
+        чтобы не задерживать запросы приложения в очереди за собой
+    :type DB_MIGRATION_LOCK_TIMEOUT: float
+    :cvar DB_MIGRATION_STATEMENT_TIMEOUT: максимальная длительность запроса миграции в секундах.
+        Не действует на операции CONCURRENTLY: они не блокируют запись в таблицы
+    :type DB_MIGRATION_STATEMENT_TIMEOUT: float
+    :cvar REDIS_PREWARM_CONNECTIONS: количество соединений с Redis, открываемых до приема трафика. 0 - без прогрева
+    :type REDIS_PREWARM_CONNECTIONS: int
+    :cvar RATE_LIMIT_ENABLED: включение ограничения частоты запросов к роутам, обращающимся к SupaBase
+    :type RATE_LIMIT_ENABLED: bool
+    :cvar SUPABASE_BREAKER_FAILURE_RATE: доля сбоев SupaBase в окне вызовов, при которой размыкается предохранитель
+    :type SUPABASE_BREAKER_FAILURE_RATE: float
+    :cvar SUPABASE_BREAKER_MIN_CALLS: минимум вызовов в окне для оценки доли сбоев
+    :type SUPABASE_BREAKER_MIN_CALLS: int
+    :cvar SUPABASE_BREAKER_WINDOW: размер окна последних вызовов SupaBase
+    :type SUPABASE_BREAKER_WINDOW: int
+    :cvar SUPABASE_BREAKER_RESET_TIMEOUT: сколько секунд предохранитель разомкнут перед пробным вызовом
+    :type SUPABASE_BREAKER_RESET_TIMEOUT: float
+    :cvar TOKEN_CACHE_TTL: максимальное время жизни пользователя в кеше по токену доступа в секундах
+    :type TOKEN_CACHE_TTL: int
+    :cvar TOKEN_CACHE_LOCAL_TTL: максимальное время жизни записи кеша токенов в памяти процесса в секундах.
+        Ограничивает срок действия отозванного токена в других воркерах, если сообщение об удалении потеряно:
+        доставка через pub/sub не гарантирована
+    :type TOKEN_CACHE_LOCAL_TTL: float
+    :cvar INVALIDATION_CHANNEL: канал Redis для удаления записей кешей в памяти процессов всех воркеров
+    :type INVALIDATION_CHANNEL: str
+    :cvar INVALIDATION_BATCH_DELAY: сколько секунд копить удаления записей кеша перед отправкой одним сообщением
+    :type INVALIDATION_BATCH_DELAY: float
+    :cvar REDIS_TRACKING_PREFIXES: префиксы часто читаемых ключей Redis, кешируемых в памяти процесса
+        с удалением по сообщениям Redis. Пустой список - кеш выключен
+    :type REDIS_TRACKING_PREFIXES: list[str]
+    :cvar REDIS_TRACKING_MAX_KEYS: максимальное количество отслеживаемых ключей в памяти процесса
+    :type REDIS_TRACKING_MAX_KEYS: int
+    :cvar TOKEN_CACHE_LOCAL_SIZE: максимальное количество токенов в памяти процесса
+    :type TOKEN_CACHE_LOCAL_SIZE: int
+    :cvar CACHE_COMPRESSION_THRESHOLD: минимальный размер JSON данных в байтах, с которого они сжимаются в Redis
+    :type CACHE_COMPRESSION_THRESHOLD: int
+    :cvar CACHE_COMPRESSION_ALGORITHM: алгоритм сжатия JSON данных в Redis: zlib или zstd (пакет zstandard)
+    :type CACHE_COMPRESSION_ALGORITHM: str
+    :cvar IDEMPOTENCY_TTL: время хранения ответа по ключу идемпотентности в секундах
+    :type IDEMPOTENCY_TTL: int
+    :cvar IDEMPOTENCY_LOCK_TTL: время блокировки ключа идемпотентности на время обработки запроса в секундах
+    :type IDEMPOTENCY_LOCK_TTL: int
+    :cvar IDEMPOTENCY_WAIT_TIMEOUT: сколько секунд повторный запрос ждет ответа первого перед ответом 409
+    :type IDEMPOTENCY_WAIT_TIMEOUT: float
+    :cvar IDEMPOTENCY_SECRET: секрет HMAC отпечатков тел запросов с ключом идемпотентности,
+        хранящихся в Redis. Общий для всех реплик приложения
+    :type IDEMPOTENCY_SECRET: str
+    :cvar HEALTH_CHECK_INTERVAL: интервал фоновой проверки PostgreSQL, Redis и SupaBase в секундах
+    :type HEALTH_CHECK_INTERVAL: float
+    :cvar HEALTH_CHECK_TIMEOUT: таймаут проверки одной зависимости в секундах
+    :type HEALTH_CHECK_TIMEOUT: float
+    :cvar OUTBOX_RELAY_ENABLED: запуск доставки исходящих событий в процессе приложения
+    :type OUTBOX_RELAY_ENABLED: bool
+    :cvar OUTBOX_BATCH_SIZE: максимальное количество исходящих событий, выбираемых одним запросом
+    :type OUTBOX_BATCH_SIZE: int
+    :cvar OUTBOX_POLL_INTERVAL: пауза между опросами пустой очереди исходящих событий в секундах
+    :type OUTBOX_POLL_INTERVAL: float
+    :cvar OUTBOX_LEASE: время аренды пакета исходящих событий обработчиком в секундах
+    :type OUTBOX_LEASE: float
+    :cvar OUTBOX_MAX_ATTEMPTS: количество попыток обработки исходящего события, после которых оно остается с ошибкой
+    :type OUTBOX_MAX_ATTEMPTS: int
+    :cvar OUTBOX_RETRY_DELAY: пауза перед первым повтором исходящего события в секундах, удваивается с попыткой
+    :type OUTBOX_RETRY_DELAY: float
+    :cvar USER_SEARCH_CACHE_TTL: время хранения первой страницы поиска пользователей в кеше в секундах
+    :type USER_SEARCH_CACHE_TTL: int
+    :cvar USER_SEARCH_CACHE_PREFIX_LENGTH: максимальная длина запроса поиска пользователей, кешируемого в Redis.
+        Короткие префиксы при наборе запрашиваются чаще всего и находят больше всего строк
+    :type USER_SEARCH_CACHE_PREFIX_LENGTH: int
+    :cvar MOOD_INGEST_ENABLED: запуск записи пакетов буфера приема записей настроения в процессе приложения
+    :type MOOD_INGEST_ENABLED: bool
+    :cvar MOOD_INGEST_STREAM: поток Redis буфера приема записей настроения
+    :type MOOD_INGEST_STREAM: str
+    :cvar MOOD_INGEST_GROUP: группа читателей потока буфера приема
+    :type MOOD_INGEST_GROUP: str
+    :cvar MOOD_INGEST_BATCH_SIZE: максимальное количество записей настроения в одной вставке
+    :type MOOD_INGEST_BATCH_SIZE: int
+    :cvar MOOD_INGEST_FLUSH_INTERVAL: интервал записи пакетов записей настроения в БД в секундах
+    :type MOOD_INGEST_FLUSH_INTERVAL: float
+    :cvar MOOD_INGEST_CLAIM_IDLE: через сколько секунд записи остановленного процесса забираются другим процессом
+    :type MOOD_INGEST_CLAIM_IDLE: float
+    :cvar MOOD_INGEST_DEAD_LETTER_STREAM: поток Redis нечитаемых записей буфера приема для разбора вручную
+    :type MOOD_INGEST_DEAD_LETTER_STREAM: str
+    :cvar MOOD_SERIES_MAX_BUCKETS: максимальное количество интервалов в ряду настроения
+    :type MOOD_SERIES_MAX_BUCKETS: int
+    :cvar MOOD_PARTITIONS_AHEAD: количество месяцев, включая текущий, на которые заранее создаются секции записей
+    :type MOOD_PARTITIONS_AHEAD: int
+    :cvar OUTBOX_RETENTION: срок хранения обработанных исходящих событий в секундах
+    :type OUTBOX_RETENTION: float
+    :cvar TOKEN_CACHE_WARM_LIMIT: максимальное количество токенов недавно активных пользователей,
+        загружаемых в память процесса при прогреве
+    :type TOKEN_CACHE_WARM_LIMIT: int
+    :cvar SCHEDULER_ENABLED: запуск периодических задач в процессе приложения
+    :type SCHEDULER_ENABLED: bool
+    :cvar SCHEDULER_LEADER_TTL: время аренды лидерства реплики для единственных задач в секундах
+    :type SCHEDULER_LEADER_TTL: float
     """
 
     APP_NAME: str = "Base App"
@@ -38,6 +159,74 @@ class Settings(BaseSettings):
 
     DEBUG: bool = False
 
+    DB_CONNECTION_BUDGET: int = 50
+    DB_WORKERS: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    DB_REPLICAS: int = 1
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_PGBOUNCER: bool = False
+
+    DB_PREWARM_CONNECTIONS: int = 0
+    DB_SHARD_URLS: list[str] = []
+    DB_MIGRATION_LOCK_TIMEOUT: float = 5.0
+    DB_MIGRATION_STATEMENT_TIMEOUT: float = 60.0
+    REDIS_PREWARM_CONNECTIONS: int = 0
+
+    RATE_LIMIT_ENABLED: bool = True
+
+    SUPABASE_BREAKER_FAILURE_RATE: float = 0.5
+    SUPABASE_BREAKER_MIN_CALLS: int = 20
+    SUPABASE_BREAKER_WINDOW: int = 100
+    SUPABASE_BREAKER_RESET_TIMEOUT: float = 30.0
+
+    TOKEN_CACHE_TTL: int = 300
+    TOKEN_CACHE_LOCAL_TTL: float = 30.0
+    TOKEN_CACHE_LOCAL_SIZE: int = 10000
+
+    INVALIDATION_CHANNEL: str = "cache:invalidate"
+    INVALIDATION_BATCH_DELAY: float = 0.01
+
+    REDIS_TRACKING_PREFIXES: list[str] = []
+    REDIS_TRACKING_MAX_KEYS: int = 10000
+
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+    CACHE_COMPRESSION_ALGORITHM: str = "zlib"
+
+    IDEMPOTENCY_TTL: int = 86400
+    IDEMPOTENCY_LOCK_TTL: int = 30
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 15.0
+    IDEMPOTENCY_SECRET: str = "<SECRET>"
+
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_LEASE: float = 60.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETRY_DELAY: float = 1.0
+
+    USER_SEARCH_CACHE_TTL: int = 30
+    USER_SEARCH_CACHE_PREFIX_LENGTH: int = 5
+
+    MOOD_INGEST_ENABLED: bool = True
+    MOOD_INGEST_STREAM: str = "moods:ingest"
+    MOOD_INGEST_GROUP: str = "moods:writers"
+    MOOD_INGEST_BATCH_SIZE: int = 1000
+    MOOD_INGEST_FLUSH_INTERVAL: float = 0.5
+    MOOD_INGEST_CLAIM_IDLE: float = 30.0
+    MOOD_INGEST_DEAD_LETTER_STREAM: str = "moods:ingest:dead"
+    MOOD_SERIES_MAX_BUCKETS: int = 1000
+    MOOD_PARTITIONS_AHEAD: int = 3
+
+    OUTBOX_RETENTION: float = 7 * 24 * 3600.0
+    TOKEN_CACHE_WARM_LIMIT: int = 1000
+
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LEADER_TTL: float = 15.0
+
     class Config:
         """Конфигуратор работы класса"""
 
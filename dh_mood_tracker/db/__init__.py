@@ -4,4 +4,6 @@ __author__: str = "Digital Horizons"
 
 from .redis import RedisManager, get_redis_manager
 from .types import SessionManagerType
+from .warmup import prewarm_connections
 from .session import BaseModel, get_db_session
+from .sharding import ShardRouter, get_shard_router
@@ -0,0 +1,129 @@
+"""Модуль сжатия значений кеша в Redis"""
+
+__author__: str = "Digital Horizons"
+
+import zlib
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd необязателен, без него используется zlib
+    zstandard = None
+
+# Заголовки сжатых значений. Несжатые значения хранятся без заголовка: JSON не начинается с этих байт,
+# поэтому значения, записанные до включения сжатия, читаются как раньше
+ZLIB_HEADER: bytes = b"\x01"
+ZSTD_HEADER: bytes = b"\x02"
+# Уровни сжатия: быстрое сжатие важнее последних процентов размера
+ZLIB_LEVEL: int = 3
+ZSTD_LEVEL: int = 3
+
+
+class CompressionError(ValueError):
+    """Ошибка распаковки значения: поврежденные данные или нет библиотеки алгоритма"""
+
+
+class CacheMetrics:
+    """
+    Метрики кеша JSON данных в Redis
+
+    :ivar hits: количество чтений с найденным значением
+    :type hits: int
+    :ivar misses: количество чтений без значения
+    :type misses: int
+    :ivar writes: количество записей
+    :type writes: int
+    :ivar compressed_writes: количество сжатых записей
+    :type compressed_writes: int
+    :ivar raw_bytes: размер записанных значений до сжатия
+    :type raw_bytes: int
+    :ivar stored_bytes: размер записанных значений в Redis
+    :type stored_bytes: int
+    """
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+        self.compressed_writes: int = 0
+        self.raw_bytes: int = 0
+        self.stored_bytes: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: счетчики, доля попаданий и степень сжатия записанных значений
+        :rtype: dict[str, Any]
+        """
+        reads: int = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / reads, 3) if reads else 0.0,
+            "writes": self.writes,
+            "compressed_writes": self.compressed_writes,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "compression_ratio": round(self.raw_bytes / self.stored_bytes, 3) if self.stored_bytes else 1.0,
+        }
+
+
+def compress(data: bytes, algorithm: str, threshold: int) -> bytes:
+    """
+    Сжатие значения, если оно не меньше порога и сжатие уменьшает размер
+
+    :param data: значение
+    :type data: bytes
+    :param algorithm: алгоритм: zlib или zstd. Без библиотеки zstandard используется zlib
+    :type algorithm: str
+    :param threshold: минимальный размер значения для сжатия в байтах
+    :type threshold: int
+    :return: значение с заголовком алгоритма или исходное значение
+    :rtype: bytes
+
+    .. code-block:: python
+        from dh_mood_tracker.db.compression import compress, decompress
+
+        stored: bytes = compress(b'{"rows": [...]}', "zlib", 1024)
+        decompress(stored) # b'{"rows": [...]}'
+    """
+    if len(data) < threshold:
+        return data
+
+    if algorithm == "zstd" and zstandard is not None:
+        compressed: bytes = ZSTD_HEADER + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    else:
+        compressed = ZLIB_HEADER + zlib.compress(data, ZLIB_LEVEL)
+
+    return compressed if len(compressed) < len(data) else data
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Распаковка значения по заголовку. Значение без заголовка возвращается как есть
+
+    :param data: значение из Redis
+    :type data: bytes
+    :return: исходное значение
+    :rtype: bytes
+
+    :exception CompressionError: поврежденные данные или нет библиотеки zstandard
+    """
+    header: bytes = data[:1]
+
+    try:
+        if header == ZLIB_HEADER:
+            return zlib.decompress(data[1:])
+
+        if header == ZSTD_HEADER:
+            if zstandard is None:
+                raise CompressionError("Значение сжато zstd, но библиотека zstandard не установлена")
+            return zstandard.ZstdDecompressor().decompress(data[1:])
+    except (zlib.error, ValueError) as e:
+        if isinstance(e, CompressionError):
+            raise
+        raise CompressionError(f"Поврежденное сжатое значение: {e}") from e
+
+    return data
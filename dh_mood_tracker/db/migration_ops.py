@@ -0,0 +1,286 @@
+"""Модуль операций миграций без блокировки записи в таблицы"""
+
+__author__: str = "Digital Horizons"
+
+import time
+from typing import Any, Iterator
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Connection
+
+# Максимальная длина идентификатора PostgreSQL
+MAX_IDENTIFIER_LENGTH: int = 63
+# Код ошибки PostgreSQL превышения lock_timeout
+LOCK_NOT_AVAILABLE: str = "55P03"
+# Интервал вывода хода заполнения в секундах
+PROGRESS_INTERVAL: float = 5.0
+
+
+def _index_sql(
+    name: str,
+    table: str,
+    columns: list[str],
+    unique: bool,
+    using: str | None,
+    include: list[str] | None,
+    where: str | None,
+    prefix: str,
+) -> str:
+    """Текст CREATE INDEX. prefix - CONCURRENTLY, ON ONLY или пусто"""
+    sql: str = f"CREATE {'UNIQUE ' if unique else ''}INDEX {'CONCURRENTLY ' if prefix == 'CONCURRENTLY' else ''}"
+    sql += f"{name} ON {'ONLY ' if prefix == 'ON ONLY' else ''}{table}"
+    if using:
+        sql += f" USING {using}"
+    sql += f" ({', '.join(columns)})"
+    if include:
+        sql += f" INCLUDE ({', '.join(include)})"
+    if where:
+        sql += f" WHERE {where}"
+
+    return sql
+
+
+def _relkind(bind: Connection, name: str) -> str | None:
+    """Вид отношения pg_class.relkind: r - таблица, p - секционированная таблица, I - ее индекс. None - нет"""
+    return bind.execute(sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": name}).scalar()
+
+
+def _index_valid(bind: Connection, name: str) -> bool | None:
+    """Состояние индекса: None - нет индекса, False - недостроен после сбоя CONCURRENTLY, True - готов"""
+    return bind.execute(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+
+
+def _partitions(bind: Connection, table: str) -> list[str] | None:
+    """Секции таблицы. None - таблица не секционирована"""
+    if _relkind(bind, table) != "p":
+        return None
+
+    return list(
+        bind.execute(
+            sa.text(
+                "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass(:table) ORDER BY 1"
+            ),
+            {"table": table},
+        ).scalars()
+    )
+
+
+def _attached_partitions(bind: Connection, name: str) -> set[str]:
+    """Секции, индексы которых уже присоединены к индексу секционированной таблицы"""
+    return set(
+        bind.execute(
+            sa.text(
+                "SELECT index.indrelid::regclass::text FROM pg_inherits "
+                "JOIN pg_index index ON index.indexrelid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass(:name)"
+            ),
+            {"name": name},
+        ).scalars()
+    )
+
+
+@contextmanager
+def _unbounded(bind: Connection) -> Iterator[None]:
+    """
+    Снятие lock_timeout и statement_timeout на время операций CONCURRENTLY: они ждут завершения текущих
+    транзакций и долго читают таблицу, но не блокируют запись в нее
+    """
+    previous: dict[str, str] = {
+        setting: bind.execute(sa.text(f"SHOW {setting}")).scalar() for setting in ("lock_timeout", "statement_timeout")
+    }
+    for setting in previous:
+        bind.execute(sa.text("SELECT set_config(:setting, '0', false)"), {"setting": setting})
+
+    try:
+        yield
+    finally:
+        for setting, value in previous.items():
+            bind.execute(sa.text("SELECT set_config(:setting, :value, false)"), {"setting": setting, "value": value})
+
+
+def _build_concurrently(bind: Connection, name: str, table: str, **index: Any) -> None:
+    """Построение индекса обычной таблицы CONCURRENTLY с удалением недостроенного индекса прошлой попытки"""
+    state: bool | None = _index_valid(bind, name)
+    if state:
+        return
+
+    with _unbounded(bind):
+        if state is False:
+            bind.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        bind.execute(sa.text(_index_sql(name, table, prefix="CONCURRENTLY", **index)))
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: list[str],
+    unique: bool = False,
+    using: str | None = None,
+    include: list[str] | None = None,
+    where: str | None = None,
+) -> None:
+    """
+    Создание индекса без блокировки записи в таблицу. Индекс обычной таблицы строится CONCURRENTLY.
+    Секционированная таблица CONCURRENTLY не поддерживает: индекс создается на ней без секций (ON ONLY),
+    индексы секций строятся CONCURRENTLY и присоединяются к нему, после присоединения всех секций индекс готов.
+    Повторный запуск после сбоя достраивает индекс. В режиме offline выводится обычный CREATE INDEX
+
+    :param name: название индекса
+    :type name: str
+    :param table: таблица
+    :type table: str
+    :param columns: столбцы и выражения индекса в SQL
+    :type columns: list[str]
+    :param unique: уникальный индекс
+    :type unique: bool
+    :param using: метод доступа индекса
+    :type using: str | None
+    :param include: неключевые столбцы покрывающего индекса
+    :type include: list[str] | None
+    :param where: условие частичного индекса в SQL
+    :type where: str | None
+
+    .. code-block:: python
+        from dh_mood_tracker.db.migration_ops import create_index_concurrently
+
+        def upgrade() -> None:
+            create_index_concurrently("ux_users_login_lower", "users", ["lower(login)"], unique=True)
+    """
+    index: dict[str, Any] = {"columns": columns, "unique": unique, "using": using, "include": include, "where": where}
+
+    if op.get_context().as_sql:
+        op.execute(_index_sql(name, table, prefix="", **index))
+        return
+
+    bind: Connection = op.get_bind()
+    with op.get_context().autocommit_block():
+        partitions: list[str] | None = _partitions(bind, table)
+        if partitions is None:
+            _build_concurrently(bind, name, table, **index)
+            return
+
+        if _index_valid(bind, name) is None:
+            bind.execute(sa.text(_index_sql(name, table, prefix="ON ONLY", **index)))
+
+        attached: set[str] = _attached_partitions(bind, name)
+        for partition in partitions:
+            if partition in attached:
+                continue
+            suffix: str = partition.removeprefix(f"{table}_")
+            partition_index: str = f"{name[: MAX_IDENTIFIER_LENGTH - len(suffix) - 1]}_{suffix}"
+            _build_concurrently(bind, partition_index, partition, **index)
+            bind.execute(sa.text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+def drop_index_concurrently(name: str) -> None:
+    """
+    Удаление индекса без блокировки записи в таблицу. Индекс секционированной таблицы удаляется обычным
+    DROP INDEX: CONCURRENTLY для него не поддерживается, ожидание блокировки ограничено lock_timeout миграций
+
+    :param name: название индекса
+    :type name: str
+
+    .. code-block:: python
+        from dh_mood_tracker.db.migration_ops import drop_index_concurrently
+
+        def upgrade() -> None:
+            drop_index_concurrently("ix_users_login")
+    """
+    if op.get_context().as_sql:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        return
+
+    bind: Connection = op.get_bind()
+    if _relkind(bind, name) == "I":
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+        return
+
+    with op.get_context().autocommit_block(), _unbounded(bind):
+        bind.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def backfill(
+    table: str,
+    assignments: str,
+    where: str,
+    batch_size: int = 1000,
+    pause: float = 0.1,
+    key: str = "id",
+    retries: int = 5,
+) -> int:
+    """
+    Заполнение столбцов пакетами: каждый пакет - отдельная короткая транзакция UPDATE по возрастанию ключа,
+    поэтому строки не блокируются надолго, а репликам хватает времени на применение изменений между пакетами.
+    Пакет, не дождавшийся блокировки строк за lock_timeout, повторяется после паузы.
+    Условие должно отбирать только незаполненные строки: тогда повторный запуск продолжает заполнение.
+    В режиме offline выводится один UPDATE
+
+    :param table: таблица
+    :type table: str
+    :param assignments: присваивания SET в SQL
+    :type assignments: str
+    :param where: условие строк для заполнения в SQL
+    :type where: str
+    :param batch_size: строк в пакете
+    :type batch_size: int
+    :param pause: пауза между пакетами в секундах
+    :type pause: float
+    :param key: уникальный индексированный столбец для обхода таблицы
+    :type key: str
+    :param retries: повторов пакета при превышении lock_timeout
+    :type retries: int
+    :return: количество заполненных строк
+    :rtype: int
+
+    .. code-block:: python
+        from dh_mood_tracker.db.migration_ops import backfill
+
+        def upgrade() -> None:
+            op.add_column("users", sa.Column("search_name", sa.Text(), nullable=True))
+            backfill("users", "search_name = lower(login)", "search_name IS NULL", batch_size=5000)
+    """
+    if op.get_context().as_sql:
+        op.execute(f"UPDATE {table} SET {assignments} WHERE {where}")
+        return 0
+
+    bind: Connection = op.get_bind()
+    statement = sa.text(
+        f"WITH batch AS (SELECT {key} FROM {table} WHERE (:last IS NULL OR {key} > :last) "
+        f"AND ({where}) ORDER BY {key} LIMIT :limit) "
+        f"UPDATE {table} SET {assignments} FROM batch WHERE {table}.{key} = batch.{key} RETURNING {table}.{key}"
+    )
+
+    with op.get_context().autocommit_block():
+        total: int = bind.execute(sa.text(f"SELECT count(*) FROM {table} WHERE {where}")).scalar()
+        done, last, attempt = 0, None, 0
+        reported: float = time.monotonic()
+
+        while True:
+            try:
+                keys: list = list(bind.execute(statement, {"last": last, "limit": batch_size}).scalars())
+            except OperationalError as e:
+                if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or attempt >= retries:
+                    raise
+                attempt += 1
+                time.sleep(pause * 2**attempt)
+                continue
+
+            if not keys:
+                break
+
+            attempt = 0
+            done += len(keys)
+            last = max(keys)
+            if time.monotonic() - reported >= PROGRESS_INTERVAL:
+                print(f"Заполнение {table}: {done} из {total}")
+                reported = time.monotonic()
+            time.sleep(pause)
+
+    print(f"✅ Заполнение {table} завершено: {done} строк")
+
+    return done
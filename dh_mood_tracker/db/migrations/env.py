@@ -2,10 +2,12 @@ from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import pool, engine_from_config
+from alembic.util import CommandError
 
 from dh_mood_tracker.db import BaseModel
 from dh_mood_tracker.core import settings
 from dh_mood_tracker.models import *
+from dh_mood_tracker.moods.partitions import PARTITION_PATTERN
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -22,7 +24,35 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = BaseModel.metadata
 
-context.config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("asyncpg", "psycopg2"))
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Секции таблиц создаются миграциями и задачами, а не моделями: автогенерация их не удаляет"""
+    table_name = name if type_ == "table" else getattr(getattr(obj, "table", None), "name", "")
+    return not (reflected and compare_to is None and PARTITION_PATTERN.match(table_name or ""))
+
+
+def get_database_url() -> str:
+    """
+    Адрес мигрируемой БД: основной БД или шарда из DB_SHARD_URLS по номеру.
+    Шарды мигрируются отдельно: alembic -x shard=1 upgrade head
+    """
+    shard = context.get_x_argument(as_dictionary=True).get("shard")
+    if shard is None:
+        return settings.DATABASE_URL.replace("asyncpg", "psycopg2")
+
+    urls = settings.DB_SHARD_URLS or [settings.DATABASE_URL]
+    if not shard.isdigit() or int(shard) >= len(urls):
+        raise CommandError(f"Нет шарда {shard!r}: в DB_SHARD_URLS шарды с номерами от 0 до {len(urls) - 1}")
+    return urls[int(shard)].replace("asyncpg", "psycopg2")
+
+
+context.config.set_main_option("sqlalchemy.url", get_database_url())
+
+# Миграция не ждет блокировок дольше lock_timeout, пока за ней в очереди стоят запросы приложения
+TIMEOUTS = {
+    "lock_timeout": int(settings.DB_MIGRATION_LOCK_TIMEOUT * 1000),
+    "statement_timeout": int(settings.DB_MIGRATION_STATEMENT_TIMEOUT * 1000),
+}
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -46,11 +76,15 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
+        for setting, value in TIMEOUTS.items():
+            context.execute(f"SET {setting} = {value}")
         context.run_migrations()
 
 
@@ -65,10 +99,18 @@ def run_migrations_online() -> None:
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        connect_args={"options": " ".join(f"-c {setting}={value}" for setting, value in TIMEOUTS.items())},
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # Транзакция на каждую миграцию: операции CONCURRENTLY (migration_ops) выполняются вне транзакции
+        # и фиксируют ее, поэтому она не должна включать предыдущие миграции
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            transaction_per_migration=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
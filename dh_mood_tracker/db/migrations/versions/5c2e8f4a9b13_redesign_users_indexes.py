@@ -0,0 +1,41 @@
+"""Redesign users indexes
+
+Revision ID: 5c2e8f4a9b13
+Revises: 3f9a1c7d2e45
+Create Date: 2026-10-19 15:10:00.000000
+
+"""
+
+from typing import Union, Sequence
+
+from dh_mood_tracker.db.migration_ops import drop_index_concurrently, create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8f4a9b13"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c7d2e45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently("ux_users_login_lower", "users", ["lower(login)"], unique=True)
+    create_index_concurrently("ux_users_email_lower", "users", ["lower(email)"], unique=True)
+    create_index_concurrently("ix_users_login_email", "users", ["login"], include=["email"])
+    drop_index_concurrently("ix_users_login")
+    drop_index_concurrently("ix_users_email")
+    drop_index_concurrently("ix_users_name")
+    drop_index_concurrently("ix_users_surname")
+    drop_index_concurrently("ix_users_patronymic")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently("ix_users_patronymic", "users", ["patronymic"], unique=True)
+    create_index_concurrently("ix_users_surname", "users", ["surname"], unique=True)
+    create_index_concurrently("ix_users_name", "users", ["name"], unique=True)
+    create_index_concurrently("ix_users_email", "users", ["email"], unique=True)
+    create_index_concurrently("ix_users_login", "users", ["login"], unique=True)
+    drop_index_concurrently("ix_users_login_email")
+    drop_index_concurrently("ux_users_email_lower")
+    drop_index_concurrently("ux_users_login_lower")
@@ -0,0 +1,33 @@
+"""Add users search trigram index
+
+Revision ID: 9d4b7e1f3a62
+Revises: 5c2e8f4a9b13
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+
+from typing import Union, Sequence
+
+from alembic import op
+
+from dh_mood_tracker.db.migration_ops import drop_index_concurrently, create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b7e1f3a62"
+down_revision: Union[str, Sequence[str], None] = "5c2e8f4a9b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    create_index_concurrently(
+        "ix_users_search_trgm", "users", ["(login || ' ' || name || ' ' || surname) gin_trgm_ops"], using="gin"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширение pg_trgm не удаляется: его могут использовать другие объекты БД
+    drop_index_concurrently("ix_users_search_trgm")
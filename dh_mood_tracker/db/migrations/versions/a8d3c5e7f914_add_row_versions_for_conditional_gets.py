@@ -0,0 +1,41 @@
+"""Add row versions for conditional GETs
+
+Revision ID: a8d3c5e7f914
+Revises: e4a1f6c8b2d7
+Create Date: 2026-10-19 20:20:00.000000
+
+"""
+
+from typing import Union, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from dh_mood_tracker.db.migration_ops import drop_index_concurrently, create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3c5e7f914"
+down_revision: Union[str, Sequence[str], None] = "e4a1f6c8b2d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    create_index_concurrently(
+        "ix_mood_entries_user_recorded_score_id", "mood_entries", ["user_id", "recorded_at"], include=["score", "id"]
+    )
+    drop_index_concurrently("ix_mood_entries_user_recorded_score")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently(
+        "ix_mood_entries_user_recorded_score", "mood_entries", ["user_id", "recorded_at"], include=["score"]
+    )
+    drop_index_concurrently("ix_mood_entries_user_recorded_score_id")
+    op.drop_column("users", "updated_at")
@@ -0,0 +1,47 @@
+"""Create mood entries table
+
+Revision ID: b7e3c9a1d5f8
+Revises: 9d4b7e1f3a62
+Create Date: 2026-10-19 17:30:00.000000
+
+"""
+
+from typing import Union, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from dh_mood_tracker.moods.partitions import DEFAULT_PARTITION, upcoming_months, create_partition_sql
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3c9a1d5f8"
+down_revision: Union[str, Sequence[str], None] = "9d4b7e1f3a62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "mood_entries",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column("entry_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.SmallInteger(), nullable=False),
+        sa.Column("note", sa.Text(), nullable=True),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id", "recorded_at"),
+        sa.UniqueConstraint("entry_id", "recorded_at", name="uq_mood_entries_entry_id"),
+        postgresql_partition_by="RANGE (recorded_at)",
+    )
+    op.create_index("ix_mood_entries_user_recorded", "mood_entries", ["user_id", "recorded_at"], unique=False)
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF mood_entries DEFAULT")
+    for month in upcoming_months(3):
+        op.execute(create_partition_sql(month))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_mood_entries_user_recorded", table_name="mood_entries")
+    op.drop_table("mood_entries")
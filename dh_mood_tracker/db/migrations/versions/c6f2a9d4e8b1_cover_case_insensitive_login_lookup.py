@@ -0,0 +1,34 @@
+"""Cover case-insensitive login lookup
+
+Revision ID: c6f2a9d4e8b1
+Revises: a8d3c5e7f914
+Create Date: 2026-10-19 22:40:00.000000
+
+"""
+
+from typing import Union, Sequence
+
+from dh_mood_tracker.db.migration_ops import drop_index_concurrently, create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f2a9d4e8b1"
+down_revision: Union[str, Sequence[str], None] = "a8d3c5e7f914"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Новый уникальный индекс строится до удаления старого, поэтому уникальность логина не прерывается
+    create_index_concurrently(
+        "ux_users_login_lower_email", "users", ["lower(login)"], unique=True, include=["login", "email"]
+    )
+    drop_index_concurrently("ux_users_login_lower")
+    drop_index_concurrently("ix_users_login_email")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently("ix_users_login_email", "users", ["login"], include=["email"])
+    create_index_concurrently("ux_users_login_lower", "users", ["lower(login)"], unique=True)
+    drop_index_concurrently("ux_users_login_lower_email")
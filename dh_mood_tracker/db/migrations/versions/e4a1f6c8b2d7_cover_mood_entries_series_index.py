@@ -0,0 +1,31 @@
+"""Cover mood entries series index
+
+Revision ID: e4a1f6c8b2d7
+Revises: b7e3c9a1d5f8
+Create Date: 2026-10-19 19:10:00.000000
+
+"""
+
+from typing import Union, Sequence
+
+from dh_mood_tracker.db.migration_ops import drop_index_concurrently, create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a1f6c8b2d7"
+down_revision: Union[str, Sequence[str], None] = "b7e3c9a1d5f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently(
+        "ix_mood_entries_user_recorded_score", "mood_entries", ["user_id", "recorded_at"], include=["score"]
+    )
+    drop_index_concurrently("ix_mood_entries_user_recorded")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently("ix_mood_entries_user_recorded", "mood_entries", ["user_id", "recorded_at"])
+    drop_index_concurrently("ix_mood_entries_user_recorded_score")
@@ -0,0 +1,94 @@
+"""Модуль расчета параметров пула соединений с PostgreSQL"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+from typing import Any
+from dataclasses import dataclass
+
+from sqlalchemy.pool import NullPool
+
+from dh_mood_tracker.core import Settings
+
+
+@dataclass(frozen=True)
+class PoolSizing:
+    """
+    Размер пула соединений одного процесса
+
+    :cvar pool_size: постоянные соединения. 0 - без пула, соединение открывается на каждую сессию
+    :type pool_size: int
+    :cvar max_overflow: временные соединения сверх pool_size при пиковой нагрузке
+    :type max_overflow: int
+    """
+
+    pool_size: int
+    max_overflow: int
+
+    @property
+    def max_connections(self) -> int:
+        """Максимум соединений процесса"""
+        return self.pool_size + self.max_overflow
+
+
+def get_pool_sizing(config: Settings) -> PoolSizing:
+    """
+    Размер пула процесса из общего бюджета соединений приложения.
+    Бюджет DB_CONNECTION_BUDGET делится на все процессы: DB_WORKERS воркеров на DB_REPLICAS репликах,
+    половина доли процесса - постоянные соединения, остальное - временные.
+    Поэтому добавление воркеров и реплик уменьшает пул процесса, а не превышает max_connections PostgreSQL
+
+    :param config: настройки приложения
+    :type config: Settings
+    :return: размер пула процесса
+    :rtype: PoolSizing
+
+    .. code-block:: python
+        from dh_mood_tracker.core import settings
+        from dh_mood_tracker.db.pool import get_pool_sizing
+
+        # DB_CONNECTION_BUDGET=80, DB_WORKERS=8, DB_REPLICAS=2
+        get_pool_sizing(settings) # PoolSizing(pool_size=2, max_overflow=3)
+    """
+    if config.DB_POOL_SIZE is not None:
+        return PoolSizing(config.DB_POOL_SIZE, config.DB_MAX_OVERFLOW or 0)
+
+    share: int = max(config.DB_CONNECTION_BUDGET // max(config.DB_WORKERS * config.DB_REPLICAS, 1), 1)
+    pool_size: int = max(share // 2, 1)
+
+    return PoolSizing(pool_size, share - pool_size)
+
+
+def get_engine_options(config: Settings) -> dict[str, Any]:
+    """
+    Параметры create_async_engine для пула соединений.
+    В режиме DB_PGBOUNCER (PgBouncer в режиме pool_mode=transaction) соединение сервера меняется
+    между транзакциями, поэтому кеш подготовленных выражений asyncpg выключается,
+    а имена выражений делаются уникальными, чтобы не пересекаться на общем соединении сервера
+
+    :param config: настройки приложения
+    :type config: Settings
+    :return: именованные параметры движка
+    :rtype: dict[str, Any]
+    """
+    sizing: PoolSizing = get_pool_sizing(config)
+    options: dict[str, Any] = {"pool_pre_ping": True}  # Проверка соединения перед использованием
+
+    if sizing.pool_size == 0:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=sizing.pool_size,
+            max_overflow=sizing.max_overflow,
+            pool_timeout=config.DB_POOL_TIMEOUT,  # Ожидание свободного соединения вместо открытия нового
+            pool_recycle=3600,  # Пересоздание соединения каждый час
+        )
+
+    if config.DB_PGBOUNCER:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    return options
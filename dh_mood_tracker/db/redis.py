@@ -2,36 +2,133 @@
 
 __author__: str = "Digital Horizons"
 
-import json
+from typing import Any, Callable, Awaitable, AsyncIterator
+from contextlib import asynccontextmanager
 
 import redis
-from pycparser.ply.yacc import resultlimit
+import orjson
+import redis.asyncio as aioredis
+from redis.client import NEVER_DECODE
+from redis.asyncio.client import Pipeline
 
-from dh_mood_tracker.core import settings
+from dh_mood_tracker.core import dumps, loads, settings
+
+from .tracking import ClientSideCache
+from .compression import CacheMetrics, CompressionError, compress, decompress
 
 
 class RedisManager:
     """
-    Менеджер для работы с Redis с удобными методами для кэширования
+    Менеджер для работы с Redis с удобными методами для кэширования.
+    Клиент создается лениво при первом обращении и не открывает соединений при импорте.
+    JSON данные от CACHE_COMPRESSION_THRESHOLD байт сжимаются, сжатые значения помечаются байтом заголовка,
+    поэтому записанные ранее несжатые значения читаются без изменений
 
     !!! Важно - можно использовать через зависимость Depends
 
-    :ivar client: клиент подключения к Redis
-    :type client: redis.Redis
+    :ivar _client: клиент подключения к Redis или None, если еще не создан
+    :type _client: aioredis.Redis | None
+    :ivar _tracking: кеш отслеживаемых ключей в памяти процесса или None, если отслеживание не включено
+    :type _tracking: ClientSideCache | None
+    :ivar metrics: метрики чтения и сжатия JSON данных
+    :type metrics: CacheMetrics
     """
 
-    def __init__(self):
-        self.client: redis.Redis = self._get_redis_client()
+    def __init__(self, client: aioredis.Redis | None = None) -> None:
+        """
+        Инициализация менеджера
+
+        :param client: готовый клиент подключения. Если не задан - создается из настроек при первом обращении
+        :type client: aioredis.Redis | None
+        """
+        self._client: aioredis.Redis | None = client
+        self._tracking: ClientSideCache | None = None
+        self.metrics: CacheMetrics = CacheMetrics()
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """
+        Клиент подключения к Redis. Создается при первом обращении
 
-    def get_client(self) -> redis.Redis:
+        :return: клиент подключения к Redis
+        :rtype: aioredis.Redis
+        """
+        if self._client is None:
+            self._client = self._get_redis_client()
+
+        return self._client
+
+    def get_client(self) -> aioredis.Redis:
         """
         Получение клиента подключения к Redis
 
         :return: клиент подключения к Redis
-        :rtype: redis.Redis
+        :rtype: aioredis.Redis
         """
         return self.client
 
+    async def connect(self) -> None:
+        """
+        Проверка подключения к Redis. Вызывается в lifespan приложения
+
+        :exception redis.ConnectionError: Redis недоступен
+        """
+        try:
+            await self.client.ping()
+            print("✅ Подключение к Redis установлено")
+        except redis.ConnectionError as e:
+            print(f"❌ Не удалось подключиться к Redis: {e}")
+            raise
+
+    async def start_tracking(self, prefixes: list[str], max_keys: int) -> None:
+        """
+        Включение кеша в памяти процесса для ключей с префиксами. Redis сообщает об изменении ключей,
+        поэтому get_key и get_json по этим ключам читают память без сетевого запроса и без устаревших данных.
+        Вызывается в lifespan приложения
+
+        :param prefixes: префиксы часто читаемых ключей
+        :type prefixes: list[str]
+        :param max_keys: максимальное количество ключей в памяти
+        :type max_keys: int
+
+        .. code-block:: python
+            @asynccontextmanager
+            async def lifespan(_: FastAPI):
+                await get_redis_manager().start_tracking(["config:", "user:"], 10000)
+                yield
+        """
+        if self._tracking is None and prefixes:
+            self._tracking = ClientSideCache(self.get_client, prefixes, max_keys)
+            await self._tracking.start()
+
+    def tracking_snapshot(self) -> dict | None:
+        """
+        Состояние кеша отслеживаемых ключей для мониторинга
+
+        :return: состояние кеша или None - если отслеживание не включено
+        :rtype: dict | None
+        """
+        return self._tracking.snapshot() if self._tracking else None
+
+    def cache_snapshot(self) -> dict:
+        """
+        Метрики JSON данных для мониторинга: попадания, промахи и степень сжатия
+
+        :return: метрики кеша
+        :rtype: dict
+        """
+        return self.metrics.snapshot()
+
+    async def close(self) -> None:
+        """Закрытие клиента и всех соединений пула"""
+        if self._tracking is not None:
+            await self._tracking.stop()
+            self._tracking = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def set_key(self, key: str, value: str, expire_seconds: int | None = None) -> bool:
         """
         Установка ключа с возможным временем жизни
@@ -75,8 +172,43 @@ class RedisManager:
             manager: RedisManager = RedisManager()
             manager.get_key("user_name") # "JohnDoe"
         """
+        # Значение читается без декодирования и распаковывается: ключ мог быть записан сжатым через set_json
+        value: bytes | None = await self._get_raw(key)
+        if value is None:
+            return None
+
         try:
-            return await self.client.get(key)
+            return decompress(value).decode()
+        except (CompressionError, UnicodeDecodeError) as e:
+            print(f"Ошибка распаковки записи из Redis: {e}")
+
+            return None
+
+    async def _get_raw(self, key: str) -> bytes | None:
+        """
+        Получение значения по ключу без декодирования: из памяти для отслеживаемых ключей или из Redis
+
+        :param key: ключ записи для получения
+        :type key: str
+        :return: данные записи или None - если ее нет или Redis недоступен
+        :rtype: bytes | None
+        """
+        if self._tracking is not None and self._tracking.tracks(key):
+            return await self._tracking.get(key, self._get_remote_raw)
+
+        return await self._get_remote_raw(key)
+
+    async def _get_remote_raw(self, key: str) -> bytes | None:
+        """
+        Получение значения по ключу из Redis без декодирования: сжатые данные не являются строкой
+
+        :param key: ключ записи для получения
+        :type key: str
+        :return: данные записи или None - если ее нет или Redis недоступен
+        :rtype: bytes | None
+        """
+        try:
+            return await self.client.execute_command("GET", key, **{NEVER_DECODE: True})
         except redis.RedisError as e:
             print(f"Ошибка получения записи из Redis: {e}")
 
@@ -129,7 +261,8 @@ class RedisManager:
 
     async def set_json(self, key: str, data: dict, expire_seconds: int | None = None) -> bool:
         """
-        Сохранение JSON данных в Redis
+        Сохранение JSON данных в Redis. UUID и datetime кодируются без преобразования.
+        Данные от CACHE_COMPRESSION_THRESHOLD байт сжимаются
 
         :param key: ключ записи
         :type key: str
@@ -147,15 +280,16 @@ class RedisManager:
             manager.set_json("user_data", {"name": "JohnDoe", "age": 25}, 900)
         """
         try:
-            json_data = json.dumps(data, ensure_ascii=False)
-            return await self.set_key(key, json_data, expire_seconds)
-        except TypeError as e:
+            json_data = dumps(data)
+        except orjson.JSONEncodeError as e:
             print(f"Ошибка кодировки JSON в строку: {e}")
             return False
 
+        return await self.set_key(key, self._compress(json_data), expire_seconds)  # type: ignore[arg-type]
+
     async def get_json(self, key: str) -> dict | None:
         """
-        Получение JSON данных из Redis
+        Получение JSON данных из Redis. Сжатые данные распаковываются по байту заголовка
 
         :param key: ключ записи
         :type key: str
@@ -168,15 +302,165 @@ class RedisManager:
             manager: RedisManager = RedisManager()
             manager.get_json("user_data") # {"name": "JohnDoe", "age": 25}
         """
-        try:
-            data = await self.get_key(key)
-            if data:
-                return json.loads(data)
+        data: bytes | None = await self._get_raw(key)
+        if not data:
+            self.metrics.misses += 1
             return None
-        except json.JSONDecodeError as e:
+
+        self.metrics.hits += 1
+        try:
+            return loads(decompress(data))
+        except (CompressionError, orjson.JSONDecodeError) as e:
             print(f"Ошибка преобразования строки в JSON: {e}")
             return None
 
+    async def get_many_json(self, keys: list[str]) -> list[dict | None]:
+        """
+        Получение JSON данных по нескольким ключам одной командой MGET
+
+        :param keys: ключи записей
+        :type keys: list[str]
+        :return: данные в порядке ключей. None - если ключа нет, данные повреждены или Redis недоступен
+        :rtype: list[dict | None]
+
+        .. code-block:: python
+            from dh_mood_tracker.db import RedisManager
+
+            manager: RedisManager = RedisManager()
+            manager.get_many_json(["user:1", "user:2"]) # [{"name": "JohnDoe"}, None]
+        """
+        if not keys:
+            return []
+
+        try:
+            values: list[bytes | None] = await self.client.execute_command("MGET", *keys, **{NEVER_DECODE: True})
+        except redis.RedisError as e:
+            print(f"Ошибка получения записей из Redis: {e}")
+            return [None] * len(keys)
+
+        result: list[dict | None] = []
+        for key, value in zip(keys, values):
+            if not value:
+                self.metrics.misses += 1
+                result.append(None)
+                continue
+
+            self.metrics.hits += 1
+            try:
+                result.append(loads(decompress(value)))
+            except (CompressionError, orjson.JSONDecodeError) as e:
+                print(f"Ошибка преобразования строки в JSON по ключу {key}: {e}")
+                result.append(None)
+
+        return result
+
+    async def set_many_json(self, items: dict[str, dict], expire_seconds: int | None = None) -> bool:
+        """
+        Сохранение JSON данных по нескольким ключам за один сетевой запрос.
+        Записи, которые не удалось закодировать, пропускаются
+
+        :param items: данные для записи по ключу
+        :type items: dict[str, dict]
+        :param expire_seconds: время жизни записей в секундах
+        :type expire_seconds: int | None
+        :return: успешность записи всех данных
+        :rtype: bool
+
+        .. code-block:: python
+            from dh_mood_tracker.db import RedisManager
+
+            manager: RedisManager = RedisManager()
+            manager.set_many_json({"user:1": {"name": "JohnDoe"}, "user:2": {"name": "JaneDoe"}}, 900)
+        """
+        encoded: dict[str, bytes] = {}
+        for key, data in items.items():
+            try:
+                encoded[key] = self._compress(dumps(data))
+            except orjson.JSONEncodeError as e:
+                print(f"Ошибка кодировки JSON в строку по ключу {key}: {e}")
+
+        if not encoded:
+            return not items
+
+        if not expire_seconds:
+            try:
+                return bool(await self.client.mset(encoded)) and len(encoded) == len(items)
+            except redis.RedisError as e:
+                print(f"Ошибка записи в Redis: {e}")
+                return False
+
+        results: list[Any] = []
+        async with self.pipeline() as pipe:
+            for key, value in encoded.items():
+                pipe.setex(key, expire_seconds, value)
+            results = await pipe.execute()
+
+        return len(results) == len(items) and all(results)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """
+        Пакет команд, отправляемых за один сетевой запрос.
+        Команды, оставшиеся в пакете к концу блока, выполняются при выходе.
+        Ошибки Redis в блоке не пробрасываются, как и в остальных методах менеджера
+
+        :param transaction: выполнить пакет атомарно через MULTI/EXEC
+        :type transaction: bool
+        :return: пакет команд
+        :rtype: AsyncIterator[Pipeline]
+
+        .. code-block:: python
+            from dh_mood_tracker.db import RedisManager
+
+            manager: RedisManager = RedisManager()
+            results: list = []
+            async with manager.pipeline() as pipe:
+                pipe.get("user:1")
+                pipe.incrby("user_count", 1)
+                results = await pipe.execute() # ["JohnDoe", 5] или [] при недоступности Redis
+        """
+        pipe: Pipeline = self.client.pipeline(transaction=transaction)
+
+        try:
+            yield pipe
+            if pipe.command_stack:
+                await pipe.execute()
+        except redis.RedisError as e:
+            print(f"Ошибка выполнения пакета команд в Redis: {e}")
+        finally:
+            await pipe.reset()
+
+    async def transaction(self, func: Callable[[Pipeline], Awaitable[Any]], *watches: str) -> Any | None:
+        """
+        Оптимистичная транзакция: func читает наблюдаемые ключи и ставит команды после pipe.multi().
+        При изменении наблюдаемых ключей другим клиентом до EXEC транзакция повторяется
+
+        :param func: функция транзакции
+        :type func: Callable[[Pipeline], Awaitable[Any]]
+        :param watches: наблюдаемые ключи
+        :type watches: str
+        :return: результат func или None - если Redis недоступен
+        :rtype: Any | None
+
+        .. code-block:: python
+            from dh_mood_tracker.db import RedisManager
+
+            async def take_token(pipe: Pipeline) -> bool:
+                tokens: int = int(await pipe.get("tokens") or 0)
+                pipe.multi()
+                if tokens > 0:
+                    pipe.decr("tokens")
+                return tokens > 0
+
+            manager: RedisManager = RedisManager()
+            await manager.transaction(take_token, "tokens") # True
+        """
+        try:
+            return await self.client.transaction(func, *watches, value_from_callable=True)
+        except redis.RedisError as e:
+            print(f"Ошибка выполнения транзакции в Redis: {e}")
+            return None
+
     async def increment_counter(self, key: str, amount: int = 1) -> int:
         """
         Инкремент счетчика в Redis
@@ -240,7 +524,7 @@ class RedisManager:
             manager.get_set_members("user_count") # 1, 2, 3, 4
         """
         try:
-            return await self.client.smembers(key) # type: ignore[awaitable-return]
+            return await self.client.smembers(key)  # type: ignore[awaitable-return]
         except redis.RedisError as e:
             print(f"Ошибка получения множества: {e}")
             return set()
@@ -268,15 +552,34 @@ class RedisManager:
             print(f"Ошибка публикации сообщения в Redis: {e}")
             return 0
 
+    def _compress(self, data: bytes) -> bytes:
+        """
+        Сжатие JSON данных по настройкам с учетом метрик
+
+        :param data: закодированные JSON данные
+        :type data: bytes
+        :return: данные для записи в Redis
+        :rtype: bytes
+        """
+        stored: bytes = compress(data, settings.CACHE_COMPRESSION_ALGORITHM, settings.CACHE_COMPRESSION_THRESHOLD)
+
+        self.metrics.writes += 1
+        self.metrics.raw_bytes += len(data)
+        self.metrics.stored_bytes += len(stored)
+        if stored is not data:
+            self.metrics.compressed_writes += 1
+
+        return stored
+
     @staticmethod
-    def _get_redis_client() -> redis.Redis:
+    def _get_redis_client() -> aioredis.Redis:
         """
-        Создание клиента Redis с проверкой работы
+        Создание клиента Redis. Соединения открываются пулом при первой команде
 
-        :return: клиент Redis с корректным подключением
-        :rtype: redis.Redis
+        :return: клиент Redis
+        :rtype: aioredis.Redis
         """
-        redis_client = redis.from_url(
+        return aioredis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,  # Автоматическое декодирование из bytes в str
@@ -284,18 +587,8 @@ class RedisManager:
             socket_keepalive=True,
         )
 
-        # Тестирование соединения
-        try:
-            redis_client.ping()
-            print("✅ Подключение к Redis установлено")
-        except redis.ConnectionError as e:
-            print(f"❌ Не удалось подключиться к Redis: {e}")
-            raise
-
-        return redis_client
-
 
-# Глобальный экземпляр менеджера Redis
+# Глобальный экземпляр менеджера Redis. Подключение создается лениво
 redis_manager = RedisManager()
 
 
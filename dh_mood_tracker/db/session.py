@@ -4,11 +4,12 @@
 __author__: str = "Digital Horizons"
 
 from sqlalchemy import Integer
-from sqlalchemy.orm import DeclarativeBase, declarative_base, Mapped, mapped_column
+from sqlalchemy.orm import Mapped, DeclarativeBase, mapped_column, declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from dh_mood_tracker.core import settings
 
+from .pool import get_engine_options
 from .types import SessionManagerType
 
 
@@ -23,14 +24,11 @@ class BaseModel(DeclarativeBase):
     id: Mapped[int] = mapped_column(Integer, unique=True, primary_key=True)
 
 
-# Создание асинхронного движка базы данных
+# Создание асинхронного движка базы данных. Размер пула рассчитывается из бюджета соединений на все процессы
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,  # Логирование SQL запросов
-    pool_pre_ping=True,  # Проверка соединения перед использованием
-    pool_recycle=3600,  # Пересоздание соединения каждый час
-    pool_size=20,  # Размер пула соединений
-    max_overflow=30,  # Максимальное количество соединений сверх pool_size
+    **get_engine_options(settings),
 )
 
 # Создание асинхронной фабрики сессий
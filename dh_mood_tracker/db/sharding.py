@@ -0,0 +1,218 @@
+"""Модуль распределения данных пользователей по шардам PostgreSQL"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+import hashlib
+from uuid import UUID
+from typing import Any, TypeVar, Callable, Awaitable, AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from dh_mood_tracker.core import Settings, settings
+
+from .pool import get_engine_options
+from .session import AsyncSessionLocal
+
+# Тип результата запроса к шарду
+ResultType = TypeVar("ResultType")
+# Параметры фабрик сессий шардов, как у основной фабрики
+SESSION_OPTIONS: dict[str, Any] = {"expire_on_commit": False, "autoflush": False, "autocommit": False}
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Согласованное хеширование Jump Consistent Hash (Lamping, Veach). При добавлении шарда в конец списка
+    на новый шард переезжает только его доля ключей, остальные ключи остаются на своих шардах
+
+    :param key: 64-битный ключ
+    :type key: int
+    :param buckets: количество шардов
+    :type buckets: int
+    :return: номер шарда от 0 до buckets - 1
+    :rtype: int
+    """
+    bucket, candidate = -1, 0
+
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+
+    return bucket
+
+
+def shard_key_hash(shard_key: UUID) -> int:
+    """
+    64-битный хеш ключа шарда. Не зависит от процесса, в отличие от hash()
+
+    :param shard_key: ключ шарда - UUID пользователя в SupaBase
+    :type shard_key: UUID
+    :return: хеш ключа
+    :rtype: int
+    """
+    return int.from_bytes(hashlib.blake2b(shard_key.bytes, digest_size=8).digest(), "big")
+
+
+class ShardRouter:
+    """
+    Маршрутизация данных пользователей по шардам: пользователь по хешу supabase_id относится к одному шарду,
+    и все его данные читаются и пишутся в БД этого шарда. У каждого шарда свой движок и фабрика сессий.
+    Запросы ко всем шардам выполняются параллельно через scatter_gather.
+    Новые шарды добавляются только в конец списка: порядок шардов определяет размещение пользователей
+
+    !!! Важно - использовать через зависимость get_shard_router
+
+    :ivar _session_factories: фабрики сессий шардов по номеру шарда
+    :type _session_factories: list[async_sessionmaker[AsyncSession]]
+    :ivar _engines: собственные движки шардов, закрываемые при остановке
+    :type _engines: list[AsyncEngine]
+    """
+
+    def __init__(
+        self, session_factories: list[async_sessionmaker[AsyncSession]], engines: list[AsyncEngine] | None = None
+    ) -> None:
+        """
+        Инициализация
+
+        :param session_factories: фабрики сессий шардов по номеру шарда
+        :type session_factories: list[async_sessionmaker[AsyncSession]]
+        :param engines: собственные движки шардов, закрываемые в dispose
+        :type engines: list[AsyncEngine] | None
+        """
+        if not session_factories:
+            raise ValueError("Не задано ни одного шарда")
+
+        self._session_factories: list[async_sessionmaker[AsyncSession]] = session_factories
+        self._engines: list[AsyncEngine] = engines or []
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "ShardRouter":
+        """
+        Маршрутизатор из настроек. Без DB_SHARD_URLS - один шард на основном движке приложения.
+        Шард с адресом DATABASE_URL использует основной движок, а не второй пул к той же БД
+
+        :param config: настройки приложения
+        :type config: Settings
+        :return: маршрутизатор
+        :rtype: ShardRouter
+        """
+        factories: list[async_sessionmaker[AsyncSession]] = []
+        engines: list[AsyncEngine] = []
+
+        for url in config.DB_SHARD_URLS or [config.DATABASE_URL]:
+            if url == config.DATABASE_URL:
+                factories.append(AsyncSessionLocal)
+                continue
+
+            shard_engine: AsyncEngine = create_async_engine(url, echo=config.DEBUG, **get_engine_options(config))
+            engines.append(shard_engine)
+            factories.append(async_sessionmaker(bind=shard_engine, class_=AsyncSession, **SESSION_OPTIONS))
+
+        return cls(factories, engines)
+
+    def __len__(self) -> int:
+        return len(self._session_factories)
+
+    def shard_of(self, shard_key: UUID) -> int:
+        """
+        Номер шарда пользователя
+
+        :param shard_key: UUID пользователя в SupaBase
+        :type shard_key: UUID
+        :return: номер шарда
+        :rtype: int
+        """
+        if len(self._session_factories) == 1:
+            return 0
+        return jump_hash(shard_key_hash(shard_key), len(self._session_factories))
+
+    def session_factory(self, shard: int) -> async_sessionmaker[AsyncSession]:
+        """
+        Фабрика сессий шарда
+
+        :param shard: номер шарда
+        :type shard: int
+        :return: фабрика сессий
+        :rtype: async_sessionmaker[AsyncSession]
+        """
+        return self._session_factories[shard]
+
+    @asynccontextmanager
+    async def session(self, shard: int) -> AsyncIterator[AsyncSession]:
+        """
+        Сессия шарда с фиксацией транзакции при выходе и откатом при ошибке, как в get_db_session
+
+        :param shard: номер шарда
+        :type shard: int
+        :return: сессия шарда
+        :rtype: AsyncIterator[AsyncSession]
+
+        .. code-block:: python
+            from dh_mood_tracker.db import ShardRouter, get_shard_router
+
+            router: ShardRouter = get_shard_router()
+            async with router.session(router.shard_of(user.supabase_id)) as session:
+                await MoodService(session).insert_batch(entries)
+        """
+        async with self._session_factories[shard]() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def scatter_gather(self, query: Callable[[AsyncSession, int], Awaitable[ResultType]]) -> list[ResultType]:
+        """
+        Параллельное выполнение запроса на всех шардах, каждый - в своей сессии. Время ответа определяется
+        самым медленным шардом, а не суммой. При ошибке на шарде исключение пробрасывается,
+        остальные шарды завершают свои запросы
+
+        :param query: запрос: получает сессию и номер шарда
+        :type query: Callable[[AsyncSession, int], Awaitable[ResultType]]
+        :return: результаты по номеру шарда
+        :rtype: list[ResultType]
+
+        .. code-block:: python
+            from dh_mood_tracker.db import ShardRouter, get_shard_router
+
+            async def count(session: AsyncSession, _: int) -> int:
+                return await session.scalar(select(func.count()).select_from(MoodEntry))
+
+            total: int = sum(await get_shard_router().scatter_gather(count))
+        """
+
+        async def run(shard: int) -> ResultType:
+            async with self.session(shard) as session:
+                return await query(session, shard)
+
+        return await asyncio.gather(*(run(shard) for shard in range(len(self._session_factories))))
+
+    async def dispose(self) -> None:
+        """Закрытие собственных движков шардов. Основной движок закрывается отдельно"""
+        await asyncio.gather(*(shard_engine.dispose() for shard_engine in self._engines))
+
+    def engines(self) -> list[AsyncEngine]:
+        """
+        Движки всех шардов, включая основной
+
+        :return: движки по номеру шарда
+        :rtype: list[AsyncEngine]
+        """
+        return [factory.kw["bind"] for factory in self._session_factories]
+
+
+# Глобальный маршрутизатор шардов. Движки шардов подключаются лениво, как и основной движок
+shard_router: ShardRouter = ShardRouter.from_settings(settings)
+
+
+def get_shard_router() -> ShardRouter:
+    """
+    Метод для зависимости получения маршрутизатора шардов
+
+    :return: маршрутизатор шардов
+    :rtype: ShardRouter
+    """
+    return shard_router
@@ -0,0 +1,196 @@
+"""Модуль кеша значений Redis в памяти процесса с удалением по сообщениям Redis (client side caching)"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from typing import Any, Callable, Awaitable
+from collections import OrderedDict
+
+import redis
+import redis.asyncio as aioredis
+from redis.asyncio.client import PubSub
+
+# Канал, в который Redis отправляет ключи измененных записей
+INVALIDATE_CHANNEL: str = "__redis__:invalidate"
+# Пауза перед переподключением в секундах
+RECONNECT_DELAY: float = 1.0
+
+
+class ClientSideCache:
+    """
+    Кеш значений ключей Redis в памяти процесса. Redis сам сообщает об изменении ключей:
+    соединение подписчика включает CLIENT TRACKING в режиме BCAST по префиксам ключей
+    с перенаправлением сообщений самому себе в канал __redis__:invalidate (Redis 6+).
+    Пока подписчик не подключен, чтение идет напрямую в Redis.
+    При потере соединения кеш очищается, так как сообщения могли быть пропущены
+
+    :ivar _get_client: получение клиента Redis
+    :type _get_client: Callable[[], aioredis.Redis]
+    :ivar _prefixes: префиксы отслеживаемых ключей
+    :type _prefixes: tuple[str, ...]
+    :ivar _max_keys: максимальное количество ключей в памяти
+    :type _max_keys: int
+    :ivar _values: значения в порядке использования
+    :type _values: OrderedDict[str, Any]
+    :ivar _inflight: читаемые из Redis ключи: признак изменения ключа во время чтения
+    :type _inflight: dict[str, bool]
+    """
+
+    def __init__(self, get_client: Callable[[], aioredis.Redis], prefixes: list[str], max_keys: int) -> None:
+        """
+        Инициализация кеша
+
+        :param get_client: получение клиента Redis
+        :type get_client: Callable[[], aioredis.Redis]
+        :param prefixes: префиксы отслеживаемых ключей
+        :type prefixes: list[str]
+        :param max_keys: максимальное количество ключей в памяти
+        :type max_keys: int
+        """
+        self._get_client: Callable[[], aioredis.Redis] = get_client
+        self._prefixes: tuple[str, ...] = tuple(prefixes)
+        self._max_keys: int = max_keys
+        self._values: OrderedDict[str, Any] = OrderedDict()
+        self._inflight: dict[str, bool] = {}
+        self._ready: bool = False
+        self._listener_task: asyncio.Task | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def tracks(self, key: str) -> bool:
+        """
+        Признак отслеживания ключа
+
+        :param key: ключ записи
+        :type key: str
+        :return: ключ начинается с одного из префиксов
+        :rtype: bool
+        """
+        return key.startswith(self._prefixes)
+
+    async def get(self, key: str, fetch: Callable[[str], Awaitable[Any]]) -> Any:
+        """
+        Получение значения из памяти или из Redis с сохранением в память
+
+        :param key: ключ записи
+        :type key: str
+        :param fetch: чтение значения из Redis
+        :type fetch: Callable[[str], Awaitable[Any]]
+        :return: значение
+        :rtype: Any
+        """
+        if not self._ready:
+            return await fetch(key)
+
+        if key in self._values:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return self._values[key]
+
+        self.misses += 1
+        self._inflight[key] = False
+        try:
+            value: Any = await fetch(key)
+        finally:
+            changed: bool = self._inflight.pop(key, True)
+
+        # Ключ изменился, пока шло чтение: прочитанное значение могло устареть
+        if self._ready and not changed and value is not None:
+            self._values[key] = value
+            while len(self._values) > self._max_keys:
+                self._values.popitem(last=False)
+
+        return value
+
+    async def start(self) -> None:
+        """Запуск подписчика"""
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Остановка подписчика и очистка кеша"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+        self._reset()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: признак работы, количество ключей, попаданий, промахов и удалений
+        :rtype: dict[str, Any]
+        """
+        return {
+            "ready": self._ready,
+            "keys": len(self._values),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+    async def _listen(self) -> None:
+        """Включение отслеживания и прием сообщений с переподключением при потере соединения"""
+        while True:
+            pubsub: PubSub = self._get_client().pubsub()
+            try:
+                await self._subscribe(pubsub)
+                self._ready = True
+                print(f"✅ Кеширование ключей Redis в памяти по префиксам: {', '.join(self._prefixes)}")
+
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._invalidate(message["data"])
+            except redis.RedisError as e:
+                print(f"Ошибка отслеживания ключей Redis: {e}")
+                self._reset()
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                self._reset()
+                await pubsub.aclose()
+
+    async def _subscribe(self, pubsub: PubSub) -> None:
+        """Включение отслеживания на соединении подписчика с перенаправлением сообщений ему же"""
+        await pubsub.connect()
+        connection = pubsub.connection
+
+        await connection.send_command("CLIENT", "ID")
+        client_id: int = await connection.read_response()
+
+        prefix_args: list[str] = [arg for prefix in self._prefixes for arg in ("PREFIX", prefix)]
+        await connection.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefix_args)
+        await connection.read_response()
+
+        await pubsub.subscribe(INVALIDATE_CHANNEL)
+
+    def _invalidate(self, keys: list[str] | None) -> None:
+        """
+        Удаление измененных ключей. None - Redis очищен целиком
+
+        :param keys: ключи измененных записей
+        :type keys: list[str] | None
+        """
+        if keys is None:
+            self._values.clear()
+            for key in self._inflight:
+                self._inflight[key] = True
+            return
+
+        for key in keys:
+            self.invalidations += 1
+            self._values.pop(key, None)
+            if key in self._inflight:
+                self._inflight[key] = True
+
+    def _reset(self) -> None:
+        """Отключение кеша до следующего подключения"""
+        self._ready = False
+        self._values.clear()
+        for key in self._inflight:
+            self._inflight[key] = True
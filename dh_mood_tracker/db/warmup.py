@@ -0,0 +1,83 @@
+"""Модуль предварительного прогрева пулов соединений"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from .redis import RedisManager
+from .session import engine
+
+
+async def _prewarm_db(connections: int) -> int:
+    """
+    Открытие соединений с PostgreSQL. Соединения удерживаются одновременно,
+    чтобы пул создал каждое из них, после чего возвращаются в пул
+
+    :param connections: количество соединений
+    :type connections: int
+    :return: количество открытых соединений
+    :rtype: int
+    """
+    # Соединения сверх размера пула закрываются при возврате, прогревать их бессмысленно.
+    # Без пула (NullPool) соединения не сохраняются вовсе
+    connections = min(connections, engine.pool.size() if isinstance(engine.pool, QueuePool) else 0)
+    if connections <= 0:
+        return 0
+    barrier: asyncio.Barrier = asyncio.Barrier(connections)
+
+    async def open_connection() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await barrier.wait()
+
+    await asyncio.gather(*(open_connection() for _ in range(connections)))
+
+    return connections
+
+
+async def _prewarm_redis(redis_manager: RedisManager, connections: int) -> int:
+    """
+    Открытие соединений с Redis в пуле клиента
+
+    :param redis_manager: менеджер Redis
+    :type redis_manager: RedisManager
+    :param connections: количество соединений
+    :type connections: int
+    :return: количество открытых соединений
+    :rtype: int
+    """
+    pool = redis_manager.get_client().connection_pool
+    opened = [await pool.get_connection() for _ in range(connections)]
+
+    for connection in opened:
+        await pool.release(connection)
+
+    return len(opened)
+
+
+async def prewarm_connections(redis_manager: RedisManager, db_connections: int, redis_connections: int) -> None:
+    """
+    Прогрев пулов соединений до приема трафика, чтобы первые запросы после деплоя
+    не тратили время на установку соединений
+
+    :param redis_manager: менеджер Redis
+    :type redis_manager: RedisManager
+    :param db_connections: количество соединений с PostgreSQL. 0 - не прогревать
+    :type db_connections: int
+    :param redis_connections: количество соединений с Redis. 0 - не прогревать
+    :type redis_connections: int
+
+    .. code-block:: python
+        @asynccontextmanager
+        async def lifespan(_: FastAPI):
+            await prewarm_connections(get_redis_manager(), settings.DB_PREWARM_CONNECTIONS, 0)
+            yield
+    """
+    if db_connections > 0:
+        print(f"✅ Прогрето соединений с PostgreSQL: {await _prewarm_db(db_connections)}")
+
+    if redis_connections > 0:
+        print(f"✅ Прогрето соединений с Redis: {await _prewarm_redis(redis_manager, redis_connections)}")
@@ -3,5 +3,6 @@
 __author__: str = "Digital Horizons"
 
 from .base import BaseEvent
+from .codec import EVENT_REGISTRY, decode_event, encode_event, register_event
 from .consts import EventNames
 from .supabase import SupaBaseUserCreate
@@ -3,16 +3,44 @@
 
 __author__: str = "Digital Horizons"
 
-import json
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any
+from uuid import UUID
+from typing import Any, Self, ClassVar
 from datetime import UTC, datetime
 
+from dh_mood_tracker.core import dumps_str
 from dh_mood_tracker.events.consts import EventNames
 
 
 class BaseEvent(ABC):
-    """Базовое событие"""
+    """
+    Базовое событие. Идентификатор и время создания фиксируются при создании события
+    и сохраняются при передаче через очереди
+
+    :cvar VERSION: версия схемы данных события. Увеличивается при несовместимом изменении _get_data
+    :type VERSION: int
+    :ivar event_id: идентификатор события
+    :type event_id: UUID
+    :ivar created_at: время создания события
+    :type created_at: datetime
+    """
+
+    __slots__ = ("event_id", "created_at")
+
+    VERSION: ClassVar[int] = 1
+
+    def __init__(self, event_id: UUID | None = None, created_at: datetime | None = None) -> None:
+        """
+        Инициализация события
+
+        :param event_id: идентификатор события. Задается при восстановлении события из очереди
+        :type event_id: UUID | None
+        :param created_at: время создания события. Задается при восстановлении события из очереди
+        :type created_at: datetime | None
+        """
+        self.event_id: UUID = event_id or uuid.uuid4()
+        self.created_at: datetime = created_at or datetime.now(UTC)
 
     @property
     @abstractmethod
@@ -30,10 +58,10 @@ class BaseEvent(ABC):
         """
         Метка времени события
 
-        :return: метка времени
+        :return: время создания события
         :rtype: datetime
         """
-        return datetime.now(UTC)
+        return self.created_at
 
     def to_dict(self) -> dict[str, Any]:
         """
@@ -43,8 +71,9 @@ class BaseEvent(ABC):
         :rtype: dict[str, Any]
         """
         return {
+            "event_id": self.event_id,
             "event_type": self.event_type,
-            "timestamp": self.timestamp,
+            "timestamp": self.created_at,
             "data": self._get_data(),
         }
 
@@ -58,11 +87,30 @@ class BaseEvent(ABC):
         """
         ...
 
+    @classmethod
+    @abstractmethod
+    def from_data(cls, data: dict[str, Any], version: int, event_id: UUID, created_at: datetime) -> Self:
+        """
+        Восстановление события из данных _get_data
+
+        :param data: данные события
+        :type data: dict[str, Any]
+        :param version: версия схемы данных, с которой событие было закодировано
+        :type version: int
+        :param event_id: идентификатор события
+        :type event_id: UUID
+        :param created_at: время создания события
+        :type created_at: datetime
+        :return: событие
+        :rtype: Self
+        """
+        ...
+
     def to_json(self) -> str:
         """
-        Преобразование события в строку JSON
+        Преобразование события в строку JSON. UUID и datetime кодируются без преобразования
 
-        :return:  событие в виде строки JSON
+        :return: событие в виде строки JSON
         :rtype: str
         """
-        return json.dumps(self.to_dict())
+        return dumps_str(self.to_dict())
@@ -0,0 +1,130 @@
+"""Модуль бинарного кодирования событий для очередей и потоков"""
+
+__author__: str = "Digital Horizons"
+
+from uuid import UUID
+from typing import Any, Type, TypeVar, Callable
+
+import msgpack
+
+from .base import BaseEvent
+from .consts import EventNames
+
+# Тип класса события
+EventType = TypeVar("EventType", bound=Type[BaseEvent])
+
+# Версия формата конверта события. Увеличивается при изменении состава конверта
+ENVELOPE_VERSION: int = 1
+# Код расширения msgpack для UUID
+UUID_EXT_CODE: int = 1
+
+# Реестр классов событий по названию
+EVENT_REGISTRY: dict[EventNames, Type[BaseEvent]] = {}
+
+
+def register_event(event_name: EventNames) -> Callable[[EventType], EventType]:
+    """
+    Декоратор регистрации класса события для декодирования
+
+    :param event_name: название события из EventNames
+    :type event_name: EventNames
+    :return: декоратор класса события
+    :rtype: Callable[[EventType], EventType]
+
+    :exception ValueError: название события уже занято другим классом
+
+    .. code-block:: python
+        from dh_mood_tracker.events.codec import register_event
+
+        @register_event(EventNames.SB_USER_CREATED)
+        class SupaBaseUserCreate(BaseEvent):
+            ...
+    """
+
+    def decorator(event_class: EventType) -> EventType:
+        if EVENT_REGISTRY.get(event_name, event_class) is not event_class:
+            raise ValueError(f'Событие "{event_name}" уже зарегистрировано')
+
+        EVENT_REGISTRY[event_name] = event_class
+        return event_class
+
+    return decorator
+
+
+def _default(value: Any) -> Any:
+    """Кодирование типов, которые msgpack не поддерживает сам"""
+    if isinstance(value, UUID):
+        return msgpack.ExtType(UUID_EXT_CODE, value.bytes)
+
+    raise TypeError(f"Тип {type(value).__name__} не кодируется в msgpack")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    """Декодирование расширений msgpack"""
+    if code == UUID_EXT_CODE:
+        return UUID(bytes=data)
+
+    return msgpack.ExtType(code, data)
+
+
+# Упаковщик переиспользуется: создание упаковщика на каждый вызов дороже самой упаковки.
+# Не потокобезопасен - события кодируются в потоке цикла событий
+_packer: msgpack.Packer = msgpack.Packer(default=_default, datetime=True)
+
+
+def encode_event(event: BaseEvent) -> bytes:
+    """
+    Кодирование события в msgpack. Конверт: версия конверта, название события, версия схемы данных,
+    идентификатор, время создания и данные события
+
+    :param event: событие
+    :type event: BaseEvent
+    :return: закодированное событие
+    :rtype: bytes
+
+    .. code-block:: python
+        from dh_mood_tracker.events import SupaBaseUserCreate, encode_event, decode_event
+
+        payload: bytes = encode_event(SupaBaseUserCreate(supabase_id, user_data))
+        event: SupaBaseUserCreate = decode_event(payload)
+    """
+    return _packer.pack(
+        (
+            ENVELOPE_VERSION,
+            str(event.event_type),
+            event.VERSION,
+            event.event_id.bytes,
+            event.created_at,
+            event._get_data(),  # pylint: disable=protected-access
+        )
+    )
+
+
+def decode_event(payload: bytes) -> BaseEvent:
+    """
+    Декодирование события из msgpack
+
+    :param payload: закодированное событие
+    :type payload: bytes
+    :return: событие зарегистрированного класса
+    :rtype: BaseEvent
+
+    :exception ValueError: неизвестная версия конверта, неизвестное событие или поврежденные данные
+    """
+    try:
+        envelope_version, event_name, version, event_id, created_at, data = msgpack.unpackb(
+            payload, ext_hook=_ext_hook, timestamp=3, strict_map_key=False
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Поврежденные данные события: {e}") from e
+
+    if envelope_version != ENVELOPE_VERSION:
+        raise ValueError(f"Неизвестная версия конверта события: {envelope_version}")
+
+    if (event_class := EVENT_REGISTRY.get(event_name)) is None:  # type: ignore[call-overload]
+        raise ValueError(f'Неизвестное событие "{event_name}"')
+
+    try:
+        return event_class.from_data(data, version, UUID(bytes=event_id), created_at)
+    except (KeyError, ValueError, TypeError) as e:
+        raise ValueError(f"Поврежденные данные события: {e}") from e
@@ -3,12 +3,15 @@
 __author__: str = "Digital Horizons"
 
 from uuid import UUID
-from typing import Any
+from typing import Any, Self
+from datetime import datetime
 
 from .base import BaseEvent
+from .codec import register_event
 from .consts import EventNames
 
 
+@register_event(EventNames.SB_USER_CREATED)
 class SupaBaseUserCreate(BaseEvent):
     """
     Событие создания пользователя в SupaBase
@@ -19,7 +22,15 @@ class SupaBaseUserCreate(BaseEvent):
     :type _user_supabase_uuid: UUID
     """
 
-    def __init__(self, supabase_id: UUID, user_data: dict[str, Any]):
+    __slots__ = ("_data", "_user_supabase_uuid")
+
+    def __init__(
+        self,
+        supabase_id: UUID,
+        user_data: dict[str, Any],
+        event_id: UUID | None = None,
+        created_at: datetime | None = None,
+    ) -> None:
         """
         Инициализация события создания пользователя в SupaBase
 
@@ -27,7 +38,12 @@ class SupaBaseUserCreate(BaseEvent):
         :type supabase_id: UUID
         :param user_data: данные о пользователе из регистрации
         :type user_data: dict[str, Any]
+        :param event_id: идентификатор события. Задается при восстановлении события из очереди
+        :type event_id: UUID | None
+        :param created_at: время создания события. Задается при восстановлении события из очереди
+        :type created_at: datetime | None
         """
+        super().__init__(event_id, created_at)
         self._data = user_data
         self._user_supabase_uuid = supabase_id
 
@@ -40,3 +56,7 @@ class SupaBaseUserCreate(BaseEvent):
             "UserData": self._data,
             "SupaBaseUuid": self._user_supabase_uuid,
         }
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any], version: int, event_id: UUID, created_at: datetime) -> Self:
+        return cls(data["SupaBaseUuid"], data["UserData"], event_id, created_at)
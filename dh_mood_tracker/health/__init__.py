@@ -0,0 +1,6 @@
+"""Пакет проверки состояния приложения"""
+
+__author__: str = "Digital Horizons"
+
+from .routes import health_routes
+from .monitor import CheckResult, HealthCheck, HealthMonitor, get_health_monitor
@@ -0,0 +1,35 @@
+"""Модуль проверок доступности зависимостей приложения"""
+
+__author__: str = "Digital Horizons"
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dh_mood_tracker.db import get_shard_router, get_redis_manager
+from dh_mood_tracker.core import settings
+
+
+async def check_postgres() -> None:
+    """Запрос к PostgreSQL через соединение пула. При нескольких шардах проверяются БД всех шардов"""
+
+    async def ping(session: AsyncSession, _: int) -> None:
+        await session.execute(text("SELECT 1"))
+
+    await get_shard_router().scatter_gather(ping)
+
+
+async def check_redis() -> None:
+    """PING Redis. Ошибки не подавляются, в отличие от методов RedisManager"""
+    await get_redis_manager().get_client().ping()
+
+
+async def check_supabase() -> None:
+    """
+    Запрос к проверке состояния GoTrue в SupaBase
+
+    :exception httpx.HTTPError: SupaBase недоступен или ответил ошибкой
+    """
+    async with httpx.AsyncClient(base_url=settings.SUPABASE_URL, headers={"apikey": settings.SUPABASE_TOKEN}) as client:
+        response: httpx.Response = await client.get("/auth/v1/health")
+        response.raise_for_status()
@@ -0,0 +1,189 @@
+"""Модуль фоновой проверки зависимостей приложения"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import asyncio
+from typing import Any, Callable, Awaitable
+from dataclasses import field, dataclass
+
+from dh_mood_tracker.core import settings
+
+from .checks import check_redis, check_postgres, check_supabase
+
+
+@dataclass(frozen=True)
+class HealthCheck:
+    """
+    Проверка зависимости
+
+    :cvar name: название зависимости
+    :type name: str
+    :cvar check: проверка. Исключение - зависимость недоступна
+    :type check: Callable[[], Awaitable[None]]
+    :cvar critical: без зависимости приложение не готово принимать трафик
+    :type critical: bool
+    """
+
+    name: str
+    check: Callable[[], Awaitable[None]]
+    critical: bool = True
+
+
+@dataclass
+class CheckResult:
+    """
+    Результат последней проверки зависимости
+
+    :ivar healthy: зависимость доступна
+    :type healthy: bool
+    :ivar latency_ms: длительность проверки в миллисекундах
+    :type latency_ms: float
+    :ivar checked_at: момент проверки по time.time
+    :type checked_at: float
+    :ivar error: текст ошибки проверки
+    :type error: str | None
+    """
+
+    healthy: bool
+    latency_ms: float
+    checked_at: float = field(default_factory=time.time)
+    error: str | None = None
+
+
+class HealthMonitor:
+    """
+    Проверка зависимостей в фоне с интервалом. Роуты готовности читают только сохраненные результаты,
+    поэтому частые запросы оркестратора не открывают соединений и не обращаются к внешним сервисам.
+    Приложение готово, если все критичные зависимости доступны и результаты не устарели
+
+    !!! Важно - использовать через зависимость get_health_monitor
+
+    :ivar _checks: проверки зависимостей
+    :type _checks: list[HealthCheck]
+    :ivar _interval: интервал проверок в секундах
+    :type _interval: float
+    :ivar _timeout: таймаут одной проверки в секундах
+    :type _timeout: float
+    :ivar _results: последние результаты по названию зависимости
+    :type _results: dict[str, CheckResult]
+    """
+
+    def __init__(self, checks: list[HealthCheck], interval: float, timeout: float) -> None:
+        """
+        Инициализация
+
+        :param checks: проверки зависимостей
+        :type checks: list[HealthCheck]
+        :param interval: интервал проверок в секундах
+        :type interval: float
+        :param timeout: таймаут одной проверки в секундах
+        :type timeout: float
+        """
+        self._checks: list[HealthCheck] = checks
+        self._interval: float = interval
+        self._timeout: float = timeout
+        self._results: dict[str, CheckResult] = {}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Первая проверка всех зависимостей и запуск фоновых проверок. Вызывается в lifespan приложения"""
+        if self._task is None:
+            await self.run_checks()
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Остановка фоновых проверок. Вызывается в lifespan приложения"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_checks(self) -> None:
+        """Параллельная проверка всех зависимостей"""
+        results: list[CheckResult] = await asyncio.gather(*(self._run(check) for check in self._checks))
+        self._results = {check.name: result for check, result in zip(self._checks, results)}
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Готовность приложения по сохраненным результатам проверок
+
+        :return: признак готовности и результаты по зависимостям
+        :rtype: dict[str, Any]
+        """
+        stale_before: float = time.time() - self._interval * 3
+        checks: dict[str, dict[str, Any]] = {}
+        ready: bool = bool(self._results)
+
+        for check in self._checks:
+            result: CheckResult | None = self._results.get(check.name)
+            healthy: bool = result is not None and result.healthy and result.checked_at >= stale_before
+            if check.critical and not healthy:
+                ready = False
+
+            checks[check.name] = {
+                "healthy": healthy,
+                "critical": check.critical,
+                "latency_ms": result.latency_ms if result else None,
+                "checked_at": result.checked_at if result else None,
+                "error": result.error if result else "Проверка еще не выполнялась",
+            }
+
+        return {"ready": ready, "checks": checks}
+
+    async def _loop(self) -> None:
+        """Проверки с интервалом"""
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.run_checks()
+
+    async def _run(self, check: HealthCheck) -> CheckResult:
+        """
+        Проверка одной зависимости с таймаутом
+
+        :param check: проверка зависимости
+        :type check: HealthCheck
+        :return: результат проверки
+        :rtype: CheckResult
+        """
+        started: float = time.perf_counter()
+        error: str | None = None
+
+        try:
+            await asyncio.wait_for(check.check(), self._timeout)
+        except asyncio.TimeoutError:
+            error = f"Превышен таймаут проверки {self._timeout} с"
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            error = f"{type(e).__name__}: {e}"
+
+        latency_ms: float = round((time.perf_counter() - started) * 1000, 2)
+        if error is not None:
+            print(f"Ошибка проверки зависимости {check.name}: {error}")
+
+        return CheckResult(healthy=error is None, latency_ms=latency_ms, error=error)
+
+
+# Глобальный экземпляр проверки зависимостей.
+# SupaBase не критичен: его недоступность ограничивает аутентификацию, но не должна выводить из работы все реплики
+health_monitor: HealthMonitor = HealthMonitor(
+    [
+        HealthCheck("postgres", check_postgres),
+        HealthCheck("redis", check_redis),
+        HealthCheck("supabase", check_supabase, critical=False),
+    ],
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+)
+
+
+def get_health_monitor() -> HealthMonitor:
+    """
+    Метод для зависимости получения проверки зависимостей
+
+    :return: проверка зависимостей
+    :rtype: HealthMonitor
+    """
+    return health_monitor
@@ -0,0 +1,100 @@
+"""Модуль роутинга состояния приложения"""
+
+__author__: str = "Digital Horizons"
+
+from typing import Any
+
+from fastapi import Depends, APIRouter, status
+from fastapi.responses import ORJSONResponse
+
+from dh_mood_tracker.db import RedisManager, get_redis_manager
+from dh_mood_tracker.moods import MoodIngestBuffer, get_mood_buffer
+from dh_mood_tracker.utils import get_supabase_resilience
+from dh_mood_tracker.scheduler import Scheduler, get_scheduler
+
+from .monitor import HealthMonitor, get_health_monitor
+
+# Роутинг состояния приложения
+health_routes: APIRouter = APIRouter(tags=["health"])
+
+
+@health_routes.get("/health", description="Проверка состояния системы")
+def health_check() -> bool:
+    """
+    Роут для проверки состояния приложения
+
+    :return: готовность приложения
+    :rtype: bool
+    """
+    return True
+
+
+@health_routes.get("/ready", description="Готовность приложения принимать трафик")
+def readiness(monitor: HealthMonitor = Depends(get_health_monitor)) -> ORJSONResponse:
+    """
+    Роут для проверки готовности по результатам фоновых проверок PostgreSQL, Redis и SupaBase.
+    Не обращается к зависимостям: отвечает из сохраненных результатов
+
+    :return: признак готовности и состояние зависимостей с задержкой проверки. 503 - приложение не готово
+    :rtype: ORJSONResponse
+    """
+    snapshot: dict[str, Any] = monitor.snapshot()
+    status_code: int = status.HTTP_200_OK if snapshot["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ORJSONResponse(snapshot, status_code=status_code)
+
+
+@health_routes.get("/health/supabase", description="Состояние вызовов SupaBase")
+def supabase_health() -> dict[str, Any]:
+    """
+    Роут для мониторинга предохранителя и загрузки операций SupaBase
+
+    :return: состояние предохранителя и загрузка операций
+    :rtype: dict[str, Any]
+    """
+    return get_supabase_resilience().snapshot()
+
+
+@health_routes.get("/health/redis_tracking", description="Состояние кеша отслеживаемых ключей Redis")
+def redis_tracking_health(redis_manager: RedisManager = Depends(get_redis_manager)) -> dict[str, Any] | None:
+    """
+    Роут для мониторинга кеша отслеживаемых ключей Redis в памяти процесса
+
+    :return: состояние кеша или None - если отслеживание не включено
+    :rtype: dict[str, Any] | None
+    """
+    return redis_manager.tracking_snapshot()
+
+
+@health_routes.get("/health/cache", description="Метрики кеша JSON данных в Redis")
+def cache_health(redis_manager: RedisManager = Depends(get_redis_manager)) -> dict[str, Any]:
+    """
+    Роут для мониторинга попаданий в кеш JSON данных и степени их сжатия в Redis
+
+    :return: метрики кеша
+    :rtype: dict[str, Any]
+    """
+    return redis_manager.cache_snapshot()
+
+
+@health_routes.get("/health/moods_ingest", description="Метрики буфера приема записей настроения")
+async def moods_ingest_health(buffer: MoodIngestBuffer = Depends(get_mood_buffer)) -> dict[str, Any]:
+    """
+    Роут для мониторинга записи пакетов записей настроения: размер и длительность пакетов,
+    ошибки, количество записей в буфере и задержка самой старой незаписанной записи
+
+    :return: метрики буфера приема
+    :rtype: dict[str, Any]
+    """
+    return await buffer.snapshot()
+
+
+@health_routes.get("/health/scheduler", description="Состояние периодических задач")
+def scheduler_health(scheduler: Scheduler = Depends(get_scheduler)) -> dict[str, Any]:
+    """
+    Роут для мониторинга периодических задач: лидерство реплики, запуски, ошибки и следующий запуск задач
+
+    :return: состояние планировщика
+    :rtype: dict[str, Any]
+    """
+    return scheduler.snapshot()
@@ -5,34 +5,68 @@ __author__: str = "Digital Horizons"
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from .db import get_shard_router, get_redis_manager, prewarm_connections
+from .moods import mood_routes, get_mood_buffer
 from .users import auth_routes, user_routes, users_events_subscribe
-from .utils import get_event_bus
-from .db.session import AsyncSessionLocal
+from .utils import get_event_bus, get_cache_invalidator
+from .health import health_routes, get_health_monitor
+from .outbox import OutboxRelay
+from .scheduler import get_scheduler
+from .db.session import AsyncSessionLocal, engine
 from .core.settings import settings
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    """Жизненный цикл приложения"""
-    async with AsyncSessionLocal() as session:
-        await users_events_subscribe(get_event_bus(session))
-    yield
-
+    """Жизненный цикл приложения. Внешние подключения создаются здесь, а не при импорте"""
+    redis_manager = get_redis_manager()
+    await redis_manager.connect()
+    await prewarm_connections(redis_manager, settings.DB_PREWARM_CONNECTIONS, settings.REDIS_PREWARM_CONNECTIONS)
+    await redis_manager.start_tracking(settings.REDIS_TRACKING_PREFIXES, settings.REDIS_TRACKING_MAX_KEYS)
+    await get_cache_invalidator().start()
+    await get_health_monitor().start()
 
-app: FastAPI = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
+    async with AsyncSessionLocal() as session:
+        event_bus = get_event_bus(session)
+        await users_events_subscribe(event_bus)
 
+    outbox_relay = OutboxRelay(
+        AsyncSessionLocal,
+        event_bus.dispatch,
+        settings.OUTBOX_BATCH_SIZE,
+        settings.OUTBOX_POLL_INTERVAL,
+        settings.OUTBOX_LEASE,
+        settings.OUTBOX_MAX_ATTEMPTS,
+        settings.OUTBOX_RETRY_DELAY,
+    )
+    if settings.OUTBOX_RELAY_ENABLED:
+        await outbox_relay.start()
+    if settings.MOOD_INGEST_ENABLED:
+        await get_mood_buffer().start()
+    if settings.SCHEDULER_ENABLED:
+        await get_scheduler().start()
+    yield
 
-@app.get("/health", description="Проверка состояния системы")
-def health_check() -> bool:
-    """
-    Роут для проверки состояния приложения
+    await get_scheduler().stop()
+    await get_mood_buffer().stop()
+    await outbox_relay.stop()
+    await get_health_monitor().stop()
+    await get_cache_invalidator().stop()
+    await redis_manager.close()
+    await get_shard_router().dispose()
+    await engine.dispose()
 
-    :return: готовность приложения
-    :rtype: bool
-    """
-    return True
 
+app: FastAPI = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.APP_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
+app.include_router(health_routes)
 app.include_router(auth_routes)
 app.include_router(user_routes)
+app.include_router(mood_routes)
@@ -3,4 +3,6 @@
 
 __author__: str = "Digital Horizons"
 
+from .moods.model import MoodEntry
 from .users.model import User
+from .outbox.model import OutboxMessage
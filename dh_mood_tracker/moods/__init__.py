@@ -0,0 +1,9 @@
+"""Пакет записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+from .buffer import IngestMetrics, MoodIngestBuffer, get_mood_buffer
+from .consts import MoodBucket
+from .routes import mood_routes
+from .service import MoodService, get_mood_service
+from .rebalance import MoodRebalancer, RebalanceReport
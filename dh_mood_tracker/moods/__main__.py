@@ -0,0 +1,68 @@
+"""Точка входа переноса записей настроения в шарды пользователей: python -m dh_mood_tracker.moods"""
+
+__author__: str = "Digital Horizons"
+
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+from dataclasses import asdict
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dh_mood_tracker.db import get_shard_router
+from dh_mood_tracker.core import settings
+from dh_mood_tracker.db.session import AsyncSessionLocal, engine
+
+from .rebalance import MoodRebalancer, RebalanceReport
+
+
+def _parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Перенос записей настроения в шарды пользователей")
+    parser.add_argument("--batch-size", type=int, default=1000, help="размер пакета пользователей и записей")
+    parser.add_argument("--dry-run", action="store_true", help="только подсчет записей для переноса")
+    parser.add_argument("--json", type=Path, default=None, help="файл для сохранения отчета")
+    return parser.parse_args()
+
+
+async def _run(args: argparse.Namespace) -> RebalanceReport:
+    """Перенос записей с закрытием подключений"""
+    # Основная БД вне шардов - источник записей, принятых до включения шардов
+    legacy: async_sessionmaker[AsyncSession] | None = None
+    if settings.DB_SHARD_URLS and settings.DATABASE_URL not in settings.DB_SHARD_URLS:
+        legacy = AsyncSessionLocal
+
+    try:
+        return await MoodRebalancer(get_shard_router(), AsyncSessionLocal, legacy, args.batch_size).rebalance(
+            args.dry_run
+        )
+    finally:
+        await get_shard_router().dispose()
+        await engine.dispose()
+
+
+def main() -> int:
+    """
+    Перенос с выводом и сохранением отчета
+
+    :return: код выхода
+    :rtype: int
+    """
+    args: argparse.Namespace = _parse_args()
+    report: RebalanceReport = asyncio.run(_run(args))
+
+    print(f"Длительность: {report.duration_s} с")
+    print(f"Пользователей: {report.users}, перенесено пользователей: {report.moved_users}")
+    action: str = "Для переноса" if args.dry_run else "Перенесено"
+    print(f"{action} записей: {report.moved_entries} {report.by_source}")
+
+    if args.json:
+        args.json.write_text(json.dumps(asdict(report), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
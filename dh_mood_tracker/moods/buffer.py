@@ -0,0 +1,378 @@
+"""Модуль буфера приема записей настроения с отложенной записью в БД"""
+
+__author__: str = "Digital Horizons"
+
+import os
+import time
+import socket
+import asyncio
+from uuid import UUID
+from typing import Any
+from datetime import datetime
+from dataclasses import asdict, dataclass
+
+from redis import RedisError, ResponseError
+from sqlalchemy.exc import SQLAlchemyError
+
+from dh_mood_tracker.db import ShardRouter, RedisManager, get_shard_router, get_redis_manager
+from dh_mood_tracker.core import loads, settings, dumps_str
+
+from .service import MoodService
+
+
+@dataclass
+class IngestMetrics:
+    """
+    Метрики буфера приема
+
+    :cvar accepted: принятых записей
+    :type accepted: int
+    :cvar direct_writes: записей, записанных в БД сразу из-за недоступности Redis
+    :type direct_writes: int
+    :cvar flushes: успешных записей пакетов
+    :type flushes: int
+    :cvar flushed: записей в записанных пакетах
+    :type flushed: int
+    :cvar duplicates: повторно доставленных записей, уже бывших в БД
+    :type duplicates: int
+    :cvar dead_letters: нечитаемых записей, перенесенных в поток недоставленных записей
+    :type dead_letters: int
+    :cvar last_flush_size: размер последнего пакета
+    :type last_flush_size: int
+    :cvar max_flush_size: максимальный размер пакета
+    :type max_flush_size: int
+    :cvar last_flush_ms: длительность записи последнего пакета в миллисекундах
+    :type last_flush_ms: float
+    :cvar failures: неудачных записей пакетов и ошибок цикла записи
+    :type failures: int
+    :cvar last_error: текст последней ошибки
+    :type last_error: str | None
+    """
+
+    accepted: int = 0
+    direct_writes: int = 0
+    flushes: int = 0
+    flushed: int = 0
+    duplicates: int = 0
+    dead_letters: int = 0
+    last_flush_size: int = 0
+    max_flush_size: int = 0
+    last_flush_ms: float = 0.0
+    failures: int = 0
+    last_error: str | None = None
+
+
+class MoodIngestBuffer:
+    """
+    Буфер приема записей настроения. Запись принимается добавлением в поток Redis (XADD) и
+    записывается в БД пакетами: одна вставка на интервал записи или на каждые batch_size записей при пиках.
+    Записи удаляются из потока только после фиксации транзакции, поэтому падение процесса или БД не теряет
+    принятые записи: необработанные записи остаются в группе читателей и забираются другим процессом (XAUTOCLAIM)
+    после claim_idle секунд. Сохранность в самом Redis определяется его настройками appendonly.
+    Если Redis недоступен, запись сразу вставляется в БД.
+    Нечитаемые записи переносятся в поток недоставленных записей с текстом ошибки, чтобы не читать их бесконечно.
+    Пакет делится по шардам пользователей и вставляется во все шарды параллельно
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar _router: маршрутизатор шардов
+    :type _router: ShardRouter
+    :ivar _stream: ключ потока Redis
+    :type _stream: str
+    :ivar _group: группа читателей потока
+    :type _group: str
+    :ivar _dead_letter_stream: ключ потока недоставленных записей
+    :type _dead_letter_stream: str
+    :ivar _batch_size: максимальный размер пакета
+    :type _batch_size: int
+    :ivar _flush_interval: интервал записи пакетов в секундах
+    :type _flush_interval: float
+    :ivar _claim_idle: через сколько секунд необработанные записи другого процесса забираются в работу
+    :type _claim_idle: float
+    :ivar metrics: метрики буфера
+    :type metrics: IngestMetrics
+    """
+
+    def __init__(
+        self,
+        redis_manager: RedisManager,
+        router: ShardRouter,
+        stream: str,
+        group: str,
+        batch_size: int,
+        flush_interval: float,
+        claim_idle: float,
+        dead_letter_stream: str,
+    ) -> None:
+        """
+        Инициализация
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        :param router: маршрутизатор шардов
+        :type router: ShardRouter
+        :param stream: ключ потока Redis
+        :type stream: str
+        :param group: группа читателей потока
+        :type group: str
+        :param batch_size: максимальный размер пакета
+        :type batch_size: int
+        :param flush_interval: интервал записи пакетов в секундах
+        :type flush_interval: float
+        :param claim_idle: через сколько секунд необработанные записи другого процесса забираются в работу
+        :type claim_idle: float
+        :param dead_letter_stream: ключ потока недоставленных записей
+        :type dead_letter_stream: str
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self._router: ShardRouter = router
+        self._stream: str = stream
+        self._group: str = group
+        self._batch_size: int = batch_size
+        self._flush_interval: float = flush_interval
+        self._claim_idle: float = claim_idle
+        self._dead_letter_stream: str = dead_letter_stream
+        self._consumer: str = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: asyncio.Task | None = None
+        self.metrics: IngestMetrics = IngestMetrics()
+
+    async def append(self, entry: dict[str, Any]) -> None:
+        """
+        Прием записи
+
+        :param entry: запись: entry_id, user_id, shard_key - supabase_id пользователя, score, note,
+            recorded_at в ISO формате
+        :type entry: dict[str, Any]
+
+        .. code-block:: python
+            from dh_mood_tracker.moods import MoodIngestBuffer, get_mood_buffer
+
+            @mood_routes.post("", status_code=202)
+            async def mood_create(data: MoodEntryIn, buffer: MoodIngestBuffer = Depends(get_mood_buffer)) -> ...:
+                await buffer.append(entry)
+        """
+        try:
+            await self._redis_manager.get_client().xadd(self._stream, {"d": dumps_str(entry)})
+        except RedisError as e:
+            print(f"Ошибка записи в буфер приема, запись в БД напрямую: {e}")
+            await self._insert([entry])
+            self.metrics.direct_writes += 1
+
+        self.metrics.accepted += 1
+
+    async def start(self) -> None:
+        """Создание группы читателей и запуск записи пакетов. Вызывается в lifespan приложения"""
+        try:
+            await self._redis_manager.get_client().xgroup_create(self._stream, self._group, id="0", mkstream=True)
+        except ResponseError as e:
+            # Группа уже создана другим процессом
+            if "BUSYGROUP" not in str(e):
+                raise
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Остановка с записью накопленных пакетов"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        try:
+            while await self.flush() >= self._batch_size:
+                pass
+        except RedisError as e:
+            print(f"Ошибка записи буфера приема при остановке: {e}")
+
+    async def flush(self) -> int:
+        """
+        Запись одного пакета: сначала своих неподтвержденных записей после сбоя, затем новых
+
+        :return: количество записей в пакете
+        :rtype: int
+        """
+        client = self._redis_manager.get_client()
+        messages: list = await self._read(client, "0") or await self._read(client, ">")
+        if not messages:
+            return 0
+
+        entries: list[dict[str, Any]] = []
+        dead: list[dict[str, Any]] = []
+        for message_id, fields in messages:
+            # Записи, удаленные из потока, но оставшиеся неподтвержденными, приходят без полей
+            if not fields:
+                continue
+            try:
+                entries.append(self._parse(fields))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Нечитаемая запись буфера приема {message_id}: {e}")
+                dead.append({**fields, "id": message_id, "error": f"{type(e).__name__}: {e}"[:1000]})
+
+        started: float = time.perf_counter()
+        inserted: int = 0
+
+        try:
+            if entries:
+                inserted = await self._insert(entries)
+        except (SQLAlchemyError, OSError) as e:
+            # Записи остаются неподтвержденными и записываются следующей попыткой
+            self._fail(e)
+            print(f"Ошибка записи пакета записей настроения: {e}")
+            return 0
+
+        message_ids: list[str] = [message_id for message_id, _ in messages]
+        async with self._redis_manager.pipeline(transaction=True) as pipe:
+            for fields in dead:
+                pipe.xadd(self._dead_letter_stream, fields)
+            pipe.xack(self._stream, self._group, *message_ids)
+            pipe.xdel(self._stream, *message_ids)
+            await pipe.execute()
+
+        self.metrics.dead_letters += len(dead)
+        if not entries:
+            return len(messages)
+
+        self.metrics.flushes += 1
+        self.metrics.flushed += len(entries)
+        self.metrics.duplicates += len(entries) - inserted
+        self.metrics.last_flush_size = len(entries)
+        self.metrics.max_flush_size = max(self.metrics.max_flush_size, len(entries))
+        self.metrics.last_flush_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        return len(messages)
+
+    async def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: метрики, количество записей в потоке и задержка самой старой незаписанной записи
+        :rtype: dict[str, Any]
+        """
+        running: bool = self._task is not None and not self._task.done()
+        result: dict[str, Any] = {"running": running, **asdict(self.metrics)}
+
+        try:
+            client = self._redis_manager.get_client()
+            result["backlog"] = await client.xlen(self._stream)
+            oldest: list = await client.xrange(self._stream, count=1)
+            # Идентификатор записи потока начинается со времени добавления в миллисекундах
+            result["lag_ms"] = int(time.time() * 1000) - int(oldest[0][0].split("-")[0]) if oldest else 0
+        except RedisError as e:
+            result["backlog"] = result["lag_ms"] = None
+            print(f"Ошибка чтения состояния буфера приема: {e}")
+
+        return result
+
+    async def _insert(self, entries: list[dict[str, Any]]) -> int:
+        """
+        Вставка записей в шарды пользователей. При ошибке в любом шарде пакет записывается повторно целиком,
+        уже вставленные записи пропускаются по entry_id
+
+        :param entries: записи
+        :type entries: list[dict[str, Any]]
+        :return: количество вставленных записей без уже существующих
+        :rtype: int
+        """
+        shards: dict[int, list[dict[str, Any]]] = {}
+        for entry in entries:
+            # Записи, принятые до распределения по шардам, - без ключа шарда
+            shard: int = self._router.shard_of(UUID(entry["shard_key"])) if entry.get("shard_key") else 0
+            shards.setdefault(shard, []).append(entry)
+
+        async def insert(shard: int, batch: list[dict[str, Any]]) -> int:
+            async with self._router.session(shard) as session:
+                return await MoodService(session, shard).insert_batch(batch)
+
+        return sum(await asyncio.gather(*(insert(shard, batch) for shard, batch in shards.items())))
+
+    @staticmethod
+    def _parse(fields: dict[str, Any]) -> dict[str, Any]:
+        """
+        Разбор записи потока с проверкой полей, без которых пакет нельзя вставить
+
+        :param fields: поля записи потока
+        :type fields: dict[str, Any]
+        :return: запись
+        :rtype: dict[str, Any]
+
+        :exception ValueError: запись нечитаема
+        """
+        entry: dict[str, Any] = loads(fields["d"])
+        if not isinstance(entry, dict):
+            raise ValueError("Запись не является объектом")
+        missing: set[str] = {"entry_id", "user_id", "score", "note", "recorded_at"} - entry.keys()
+        if missing:
+            raise ValueError(f"Нет полей {', '.join(sorted(missing))}")
+
+        UUID(entry["entry_id"])
+        if entry.get("shard_key"):
+            UUID(entry["shard_key"])
+        datetime.fromisoformat(entry["recorded_at"])
+
+        return entry
+
+    def _fail(self, e: Exception) -> None:
+        """Учет ошибки записи в метриках"""
+        self.metrics.failures += 1
+        self.metrics.last_error = f"{type(e).__name__}: {e}"[:1000]
+
+    async def _read(self, client: Any, message_id: str) -> list:
+        """Чтение записей группы: "0" - свои неподтвержденные, ">" - новые"""
+        response = await client.xreadgroup(self._group, self._consumer, {self._stream: message_id}, self._batch_size)
+        return response[0][1] if response else []
+
+    async def _claim(self) -> None:
+        """Перехват записей, зависших у остановленных процессов"""
+        await self._redis_manager.get_client().xautoclaim(
+            self._stream, self._group, self._consumer, int(self._claim_idle * 1000), count=self._batch_size
+        )
+
+    async def _loop(self) -> None:
+        """Запись пакетов подряд при пиках и раз в интервал записи при обычной нагрузке"""
+        claimed_at: float = 0.0
+
+        while True:
+            flushed: int = 0
+            try:
+                if time.monotonic() - claimed_at >= self._claim_idle:
+                    await self._claim()
+                    claimed_at = time.monotonic()
+                flushed = await self.flush()
+            except RedisError as e:
+                print(f"Ошибка чтения буфера приема: {e}")
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Цикл записи не должен останавливаться: записи остаются в потоке до следующей попытки
+                self._fail(e)
+                print(f"Ошибка цикла записи буфера приема: {e}")
+
+            if flushed < self._batch_size:
+                await asyncio.sleep(self._flush_interval)
+
+
+# Буфер приема записей настроения процесса
+mood_buffer: MoodIngestBuffer = MoodIngestBuffer(
+    get_redis_manager(),
+    get_shard_router(),
+    settings.MOOD_INGEST_STREAM,
+    settings.MOOD_INGEST_GROUP,
+    settings.MOOD_INGEST_BATCH_SIZE,
+    settings.MOOD_INGEST_FLUSH_INTERVAL,
+    settings.MOOD_INGEST_CLAIM_IDLE,
+    settings.MOOD_INGEST_DEAD_LETTER_STREAM,
+)
+
+
+def get_mood_buffer() -> MoodIngestBuffer:
+    """
+    Метод для зависимости получения буфера приема записей настроения
+
+    :return: буфер приема записей настроения
+    :rtype: MoodIngestBuffer
+    """
+    return mood_buffer
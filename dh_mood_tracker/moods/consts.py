@@ -0,0 +1,37 @@
+"""Константы пакета записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+from enum import StrEnum
+from datetime import timedelta
+
+
+class MoodBucket(StrEnum):
+    """
+    Интервал агрегации ряда настроения
+
+    :cvar HOUR: час
+    :cvar DAY: день
+    :cvar WEEK: неделя с понедельника
+    :cvar MONTH: календарный месяц
+    """
+
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+# Длительность интервалов для оценки количества интервалов в ряду. Месяц берется самым коротким,
+# чтобы оценка была не меньше фактического количества
+BUCKET_DURATION: dict[MoodBucket, timedelta] = {
+    MoodBucket.HOUR: timedelta(hours=1),
+    MoodBucket.DAY: timedelta(days=1),
+    MoodBucket.WEEK: timedelta(weeks=1),
+    MoodBucket.MONTH: timedelta(days=28),
+}
+
+# Период ряда по умолчанию
+DEFAULT_SERIES_PERIOD: timedelta = timedelta(days=30)
+# Версия представления MoodSeries в ETag. Увеличивается при изменении схемы, чтобы сбросить кеш клиентов
+MOOD_SERIES_VERSION: str = "mood_series:1"
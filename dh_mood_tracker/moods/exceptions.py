@@ -0,0 +1,31 @@
+"""Модуль исключений при работе с записями настроения"""
+
+__author__: str = "Digital Horizons"
+
+from dh_mood_tracker.core import BaseBadRequestAppException
+
+
+class TooManyBuckets(BaseBadRequestAppException):
+    """Исключение при запросе ряда с слишком большим количеством интервалов"""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Ряд содержит больше {limit} интервалов: увеличьте интервал или сократите период")
+
+
+class InvalidSeriesPeriod(BaseBadRequestAppException):
+    """Исключение при начале периода ряда не раньше его конца"""
+
+    _DETAIL: str = "Начало периода должно быть раньше конца"
+
+
+class InvalidBucketStep(BaseBadRequestAppException):
+    """Исключение при ширине месячного интервала больше одного месяца"""
+
+    _DETAIL: str = "Месячные интервалы строятся только по одному месяцу"
+
+
+class UnknownTimeZone(BaseBadRequestAppException):
+    """Исключение при неизвестном часовом поясе"""
+
+    def __init__(self, time_zone: str) -> None:
+        super().__init__(f'Неизвестный часовой пояс "{time_zone}"')
@@ -0,0 +1,42 @@
+"""Модуль модели записи настроения"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import UUID, Text, Index, Integer, DateTime, Identity, BigInteger, SmallInteger, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dh_mood_tracker.db import BaseModel
+
+
+class MoodEntry(BaseModel):
+    """
+    Модель записи настроения. Таблица секционирована по месяцам recorded_at (moods.partitions),
+    поэтому ключи уникальности включают recorded_at
+
+    :cvar entry_id: идентификатор записи, выданный при приеме. Повторная запись при доставке буфера пропускается
+    :cvar user_id: идентификатор пользователя
+    :cvar score: оценка настроения
+    :cvar note: заметка
+    :cvar recorded_at: время отметки настроения
+    :cvar created_at: время записи в БД
+    """
+
+    __tablename__: str = "mood_entries"
+    __table_args__ = (
+        UniqueConstraint("entry_id", "recorded_at", name="uq_mood_entries_entry_id"),
+        # Покрывающий индекс: ряд настроения (MoodService.series) агрегируется и версионируется по id
+        # без чтения строк таблицы
+        Index("ix_mood_entries_user_recorded_score_id", "user_id", "recorded_at", postgresql_include=["score", "id"]),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    entry_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    score: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    note: Mapped[str | None] = mapped_column(Text, nullable=True)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
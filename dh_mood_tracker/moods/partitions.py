@@ -0,0 +1,86 @@
+"""Модуль месячных секций таблицы записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+import re
+from datetime import UTC, date, datetime
+
+# Секция для записей вне созданных месячных секций, чтобы прием записей не падал
+DEFAULT_PARTITION: str = "mood_entries_default"
+# Названия секций: таблицы создаются вне моделей и не должны попадать в автогенерацию миграций
+PARTITION_PATTERN: re.Pattern = re.compile(r"^mood_entries_(\d{4}_\d{2}|default)$")
+
+
+def month_start(day: date) -> date:
+    """
+    Первый день месяца
+
+    :param day: день
+    :type day: date
+    :return: первый день месяца дня
+    :rtype: date
+    """
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    """
+    Сдвиг первого дня месяца на количество месяцев
+
+    :param month: первый день месяца
+    :type month: date
+    :param count: количество месяцев
+    :type count: int
+    :return: первый день месяца со сдвигом
+    :rtype: date
+    """
+    index: int = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upcoming_months(count: int, today: date | None = None) -> list[date]:
+    """
+    Первые дни текущего и следующих месяцев
+
+    :param count: количество месяцев, включая текущий
+    :type count: int
+    :param today: текущий день. По умолчанию - сегодня по UTC
+    :type today: date | None
+    :return: первые дни месяцев
+    :rtype: list[date]
+    """
+    current: date = month_start(today or datetime.now(UTC).date())
+    return [add_months(current, offset) for offset in range(count)]
+
+
+def partition_name(month: date) -> str:
+    """
+    Название секции месяца
+
+    :param month: первый день месяца
+    :type month: date
+    :return: название секции
+    :rtype: str
+    """
+    return f"mood_entries_{month:%Y_%m}"
+
+
+def create_partition_sql(month: date) -> str:
+    """
+    DDL создания секции месяца. Границы - полночь по UTC первых дней месяцев
+
+    :param month: первый день месяца
+    :type month: date
+    :return: SQL запрос
+    :rtype: str
+
+    .. code-block:: python
+        from dh_mood_tracker.moods.partitions import create_partition_sql, upcoming_months
+
+        for month in upcoming_months(3):
+            op.execute(create_partition_sql(month))
+    """
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF mood_entries "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
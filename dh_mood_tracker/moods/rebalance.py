@@ -0,0 +1,167 @@
+"""Модуль переноса записей настроения в шарды пользователей после изменения DB_SHARD_URLS"""
+
+__author__: str = "Digital Horizons"
+
+import time
+from typing import Any, Sequence
+from dataclasses import field, dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dh_mood_tracker.db import ShardRouter
+from dh_mood_tracker.users.model import User as UserModel
+
+from .service import MoodService
+
+
+@dataclass
+class RebalanceReport:
+    """
+    Отчет переноса записей
+
+    :cvar users: просмотренных пользователей
+    :type users: int
+    :cvar moved_users: пользователей, чьи записи найдены не в их шарде
+    :type moved_users: int
+    :cvar moved_entries: перенесенных записей, при dry_run - записей для переноса
+    :type moved_entries: int
+    :cvar by_source: перенесенных записей по источнику
+    :type by_source: dict[str, int]
+    :cvar duration_s: длительность переноса в секундах
+    :type duration_s: float
+    """
+
+    users: int = 0
+    moved_users: int = 0
+    moved_entries: int = 0
+    by_source: dict[str, int] = field(default_factory=dict)
+    duration_s: float = 0.0
+
+
+class MoodRebalancer:
+    """
+    Перенос записей настроения в шарды пользователей. Шард пользователя зависит от количества шардов,
+    поэтому после добавления шарда в DB_SHARD_URLS часть записей остается в прежних шардах и не видна
+    в рядах настроения, пока не перенесена. Если DATABASE_URL не входит в DB_SHARD_URLS, записи,
+    накопленные в ней до включения шардов, тоже переносятся.
+    Пакет вставляется в шард пользователя с пропуском уже перенесенных записей по entry_id и только затем
+    удаляется из источника, поэтому прерванный перенос безопасно запускать повторно.
+    Новые записи сразу пишутся в новый шард, перенос можно выполнять без остановки приложения
+
+    :ivar _router: маршрутизатор шардов
+    :type _router: ShardRouter
+    :ivar _users_session_factory: фабрика сессий основной БД с пользователями
+    :type _users_session_factory: async_sessionmaker[AsyncSession]
+    :ivar _legacy_session_factory: фабрика сессий основной БД, если она не входит в шарды
+    :type _legacy_session_factory: async_sessionmaker[AsyncSession] | None
+    :ivar _batch_size: размер пакета пользователей и записей
+    :type _batch_size: int
+
+    .. code-block:: python
+        from dh_mood_tracker.db import get_shard_router
+        from dh_mood_tracker.moods.rebalance import MoodRebalancer
+        from dh_mood_tracker.db.session import AsyncSessionLocal
+
+        report: RebalanceReport = await MoodRebalancer(get_shard_router(), AsyncSessionLocal).rebalance()
+    """
+
+    def __init__(
+        self,
+        router: ShardRouter,
+        users_session_factory: async_sessionmaker[AsyncSession],
+        legacy_session_factory: async_sessionmaker[AsyncSession] | None = None,
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        Инициализация
+
+        :param router: маршрутизатор шардов
+        :type router: ShardRouter
+        :param users_session_factory: фабрика сессий основной БД с пользователями
+        :type users_session_factory: async_sessionmaker[AsyncSession]
+        :param legacy_session_factory: фабрика сессий основной БД, если она не входит в шарды
+        :type legacy_session_factory: async_sessionmaker[AsyncSession] | None
+        :param batch_size: размер пакета пользователей и записей
+        :type batch_size: int
+        """
+        self._router: ShardRouter = router
+        self._users_session_factory: async_sessionmaker[AsyncSession] = users_session_factory
+        self._legacy_session_factory: async_sessionmaker[AsyncSession] | None = legacy_session_factory
+        self._batch_size: int = batch_size
+
+    async def rebalance(self, dry_run: bool = False) -> RebalanceReport:
+        """
+        Перенос записей всех пользователей
+
+        :param dry_run: только подсчет записей для переноса, без изменений в БД
+        :type dry_run: bool
+        :return: отчет переноса
+        :rtype: RebalanceReport
+        """
+        started: float = time.perf_counter()
+        report: RebalanceReport = RebalanceReport()
+        sources: list[tuple[str, int | None, async_sessionmaker[AsyncSession]]] = [
+            (f"shard:{shard}", shard, self._router.session_factory(shard)) for shard in range(len(self._router))
+        ]
+        if self._legacy_session_factory is not None:
+            sources.append(("database", None, self._legacy_session_factory))
+
+        last_id: int = 0
+        while page := await self._users_page(last_id):
+            report.users += len(page)
+            last_id = page[-1][0]
+            targets: dict[int, int] = {user_id: self._router.shard_of(supabase_id) for user_id, supabase_id in page}
+            moved: set[int] = set()
+
+            for name, shard, session_factory in sources:
+                user_ids: list[int] = [user_id for user_id, target in targets.items() if target != shard]
+                if user_ids:
+                    count: int = await self._move(session_factory, user_ids, targets, moved, dry_run)
+                    report.moved_entries += count
+                    report.by_source[name] = report.by_source.get(name, 0) + count
+
+            report.moved_users += len(moved)
+
+        report.duration_s = round(time.perf_counter() - started, 3)
+        return report
+
+    async def _users_page(self, last_id: int) -> Sequence[Any]:
+        """Страница пользователей (id, supabase_id) по возрастанию id после last_id"""
+        async with self._users_session_factory() as session:
+            query = (
+                select(UserModel.id, UserModel.supabase_id)
+                .where(UserModel.id > last_id)
+                .order_by(UserModel.id)
+                .limit(self._batch_size)
+            )
+            return (await session.execute(query)).all()
+
+    async def _move(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        user_ids: list[int],
+        targets: dict[int, int],
+        moved: set[int],
+        dry_run: bool,
+    ) -> int:
+        """Перенос записей пользователей из источника в их шарды пакетами"""
+        async with session_factory() as session:
+            source: MoodService = MoodService(session)
+            if dry_run:
+                return await source.count_users_entries(user_ids)
+
+            count: int = 0
+            while entries := await source.read_users_entries(user_ids, self._batch_size):
+                batches: dict[int, list[dict[str, Any]]] = {}
+                for entry in entries:
+                    batches.setdefault(targets[entry["user_id"]], []).append(entry)
+                    moved.add(entry["user_id"])
+
+                for target, batch in batches.items():
+                    async with self._router.session(target) as target_session:
+                        await MoodService(target_session, target).insert_batch(batch)
+
+                count += await source.delete_entries([entry["id"] for entry in entries])
+
+            return count
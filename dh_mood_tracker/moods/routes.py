@@ -0,0 +1,91 @@
+"""Модуль роутинга записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+from typing import Any
+from datetime import UTC, datetime
+
+from fastapi import Query, Depends, Request, Response, APIRouter, status
+from pydantic import AwareDatetime
+from fastapi.responses import ORJSONResponse
+
+from dh_mood_tracker.core import make_etag, conditional_response
+from dh_mood_tracker.users import get_user_data
+from dh_mood_tracker.utils import IdempotentRequest, idempotent
+from dh_mood_tracker.users.model import User as UserModel
+
+from .buffer import MoodIngestBuffer, get_mood_buffer
+from .consts import MOOD_SERIES_VERSION, MoodBucket
+from .schemas import MoodSeries, MoodEntryIn, MoodEntryAccepted
+from .service import MoodService, get_mood_service
+
+# Роутинг записей настроения
+mood_routes: APIRouter = APIRouter(prefix="/moods", tags=["moods"])
+
+
+@mood_routes.post(
+    "",
+    description="Отметка настроения",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=MoodEntryAccepted,
+)
+async def mood_create(
+    mood_data: MoodEntryIn,
+    user: UserModel = Depends(get_user_data),
+    buffer: MoodIngestBuffer = Depends(get_mood_buffer),
+    request: IdempotentRequest = Depends(idempotent("moods")),
+) -> Response:
+    """
+    Отметка настроения. Запись принимается в буфер и записывается в БД пакетом в течение интервала записи.
+    Повтор с тем же заголовком Idempotency-Key получает сохраненный ответ и не создает вторую запись
+    """
+
+    async def create() -> dict[str, str]:
+        entry: dict[str, Any] = {
+            "entry_id": str(uuid.uuid4()),
+            "user_id": user.id,
+            "shard_key": str(user.supabase_id),
+            "score": mood_data.score,
+            "note": mood_data.note,
+            "recorded_at": (mood_data.recorded_at or datetime.now(UTC)).isoformat(),
+        }
+        await buffer.append(entry)
+
+        return {"entry_id": entry["entry_id"]}
+
+    result: Any = await request.run(
+        mood_data.model_dump(mode="json"), create, status_code=status.HTTP_202_ACCEPTED, owner=user.id
+    )
+
+    return result if isinstance(result, Response) else ORJSONResponse(result, status_code=status.HTTP_202_ACCEPTED)
+
+
+@mood_routes.get("/series", description="Ряд настроения, агрегированный по интервалам", response_model=MoodSeries)
+async def mood_series(
+    request: Request,
+    bucket: MoodBucket = Query(MoodBucket.DAY, description="единица интервала"),
+    step: int = Query(1, ge=1, le=1000, description="ширина интервала в единицах"),
+    start: AwareDatetime | None = Query(None, description="начало периода. По умолчанию - 30 дней до конца"),
+    end: AwareDatetime | None = Query(None, description="конец периода. По умолчанию - конец текущего интервала"),
+    tz: str = Query("UTC", max_length=64, description="часовой пояс IANA интервалов"),
+    user: UserModel = Depends(get_user_data),
+    mood_service: MoodService = Depends(get_mood_service),
+) -> Response:
+    """
+    Ряд настроения для графиков: сырые записи не выгружаются, агрегация выполняется в БД.
+    При неизменном ряде по If-None-Match возвращается 304 без тела
+    """
+    series: dict[str, Any] = await mood_service.series(user.id, start, end, bucket, step, tz)
+    etag: str = make_etag(
+        MOOD_SERIES_VERSION,
+        user.id,
+        series["bucket"],
+        series["step"],
+        series["time_zone"],
+        series["start"].isoformat(),
+        series["end"].isoformat(),
+        series["version"],
+    )
+
+    return conditional_response(request, etag, lambda: ORJSONResponse(series))
@@ -0,0 +1,91 @@
+"""Модуль схем данных записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+from uuid import UUID
+
+from pydantic import Field
+from pydantic import BaseModel as BaseSchema
+from pydantic import AwareDatetime
+
+from .consts import MoodBucket
+
+
+class MoodEntryIn(BaseSchema):
+    """
+    Данные отметки настроения
+
+    :cvar score: оценка настроения от 1 до 10
+    :type score: int
+    :cvar note: заметка
+    :type note: str | None
+    :cvar recorded_at: время отметки с часовым поясом. По умолчанию - время приема
+    :type recorded_at: AwareDatetime | None
+    """
+
+    score: int = Field(..., ge=1, le=10)
+    note: str | None = Field(None, max_length=500)
+    recorded_at: AwareDatetime | None = None
+
+
+class MoodEntryAccepted(BaseSchema):
+    """
+    Ответ о приеме отметки настроения
+
+    :cvar entry_id: идентификатор принятой записи
+    :type entry_id: UUID
+    """
+
+    entry_id: UUID
+
+
+class MoodSeriesPoint(BaseSchema):
+    """
+    Интервал ряда настроения
+
+    :cvar bucket_start: начало интервала по местному времени часового пояса ряда
+    :type bucket_start: AwareDatetime
+    :cvar avg: средняя оценка
+    :type avg: float
+    :cvar min: минимальная оценка
+    :type min: int
+    :cvar max: максимальная оценка
+    :type max: int
+    :cvar count: количество записей
+    :type count: int
+    """
+
+    bucket_start: AwareDatetime
+    avg: float
+    min: int
+    max: int
+    count: int
+
+
+class MoodSeries(BaseSchema):
+    """
+    Ряд настроения, агрегированный по интервалам
+
+    :cvar bucket: единица интервала
+    :type bucket: MoodBucket
+    :cvar step: ширина интервала в единицах
+    :type step: int
+    :cvar time_zone: часовой пояс интервалов
+    :type time_zone: str
+    :cvar start: начало периода включительно
+    :type start: AwareDatetime
+    :cvar end: конец периода не включительно
+    :type end: AwareDatetime
+    :cvar version: версия данных ряда
+    :type version: str
+    :cvar points: интервалы с записями по возрастанию начала
+    :type points: list[MoodSeriesPoint]
+    """
+
+    bucket: MoodBucket
+    step: int
+    time_zone: str
+    start: AwareDatetime
+    end: AwareDatetime
+    version: str
+    points: list[MoodSeriesPoint]
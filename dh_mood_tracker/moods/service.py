@@ -0,0 +1,336 @@
+"""Модуль сервиса записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+import math
+from uuid import UUID
+from typing import Any, AsyncIterator
+from datetime import UTC, date, time, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import Depends
+from sqlalchemy import Float, func, text, delete, select, literal_column
+
+from dh_mood_tracker.db import ShardRouter, get_shard_router
+from dh_mood_tracker.core import ShardedService, settings
+from dh_mood_tracker.users import get_user_data
+from dh_mood_tracker.users.model import User as UserModel
+
+from .model import MoodEntry
+from .consts import BUCKET_DURATION, DEFAULT_SERIES_PERIOD, MoodBucket
+from .schemas import MoodEntryIn
+from .exceptions import TooManyBuckets, UnknownTimeZone, InvalidBucketStep, InvalidSeriesPeriod
+from .partitions import DEFAULT_PARTITION, add_months, month_start, partition_name, create_partition_sql
+
+# Пакетная вставка одним запросом: столбцы передаются массивами, поэтому текст запроса и подготовленный
+# оператор не зависят от размера пакета. Повторно доставленные записи пропускаются по entry_id
+INSERT_BATCH_SQL = text(
+    """
+    INSERT INTO mood_entries (entry_id, user_id, score, note, recorded_at)
+    SELECT * FROM unnest(
+        CAST(:entry_ids AS uuid[]),
+        CAST(:user_ids AS integer[]),
+        CAST(:scores AS smallint[]),
+        CAST(:notes AS text[]),
+        CAST(:recorded_at AS timestamptz[])
+    )
+    ON CONFLICT (entry_id, recorded_at) DO NOTHING
+    """
+)
+# Начало отсчета интервалов date_bin - понедельник, поэтому недели начинаются с понедельника, как в date_trunc
+BUCKET_ORIGIN = literal_column("TIMESTAMP '2000-01-03 00:00:00'")
+LOCAL_BUCKET_ORIGIN: datetime = datetime(2000, 1, 3)
+
+
+def current_bucket_end(bucket: MoodBucket, step: int, zone: ZoneInfo, now: datetime | None = None) -> datetime:
+    """
+    Конец текущего интервала ряда по местному времени. Конец ряда по умолчанию выравнивается по нему,
+    поэтому период и ETag ряда не меняются при повторных запросах в пределах интервала
+
+    :param bucket: единица интервала
+    :type bucket: MoodBucket
+    :param step: ширина интервала в единицах
+    :type step: int
+    :param zone: часовой пояс интервалов
+    :type zone: ZoneInfo
+    :param now: текущее время. По умолчанию - текущее время по UTC
+    :type now: datetime | None
+    :return: конец текущего интервала с часовым поясом
+    :rtype: datetime
+    """
+    local_now: datetime = (now or datetime.now(UTC)).astimezone(zone).replace(tzinfo=None)
+
+    if bucket is MoodBucket.MONTH:
+        local_end: datetime = datetime.combine(add_months(month_start(local_now.date()), 1), datetime.min.time())
+    else:
+        width = BUCKET_DURATION[bucket] * step
+        local_end = LOCAL_BUCKET_ORIGIN + ((local_now - LOCAL_BUCKET_ORIGIN) // width + 1) * width
+
+    return local_end.replace(tzinfo=zone)
+
+
+class MoodService(ShardedService[MoodEntry, MoodEntryIn]):
+    """Сервис записей настроения. Записи хранятся в шарде пользователя по его supabase_id"""
+
+    _MODEL = MoodEntry
+
+    async def insert_batch(self, entries: list[dict[str, Any]]) -> int:
+        """
+        Вставка пакета записей одним запросом с фиксацией транзакции
+
+        :param entries: записи в формате MoodIngestBuffer: entry_id, user_id, score, note, recorded_at
+        :type entries: list[dict[str, Any]]
+        :return: количество вставленных записей без уже существующих
+        :rtype: int
+
+        .. code-block:: python
+            from dh_mood_tracker.moods import MoodService
+
+            inserted: int = await MoodService(session).insert_batch(entries)
+        """
+        result = await self.session_db.execute(
+            INSERT_BATCH_SQL,
+            {
+                "entry_ids": [UUID(entry["entry_id"]) for entry in entries],
+                "user_ids": [entry["user_id"] for entry in entries],
+                "scores": [entry["score"] for entry in entries],
+                "notes": [entry["note"] for entry in entries],
+                "recorded_at": [datetime.fromisoformat(entry["recorded_at"]) for entry in entries],
+            },
+        )
+        await self.session_db.commit()
+
+        return result.rowcount
+
+    async def read_users_entries(self, user_ids: list[int], limit: int) -> list[dict[str, Any]]:
+        """
+        Чтение пакета записей пользователей в формате insert_batch с идентификаторами строк, по возрастанию id
+
+        :param user_ids: идентификаторы пользователей
+        :type user_ids: list[int]
+        :param limit: размер пакета
+        :type limit: int
+        :return: записи с id строки
+        :rtype: list[dict[str, Any]]
+        """
+        rows = await self.session_db.execute(
+            select(
+                MoodEntry.id,
+                MoodEntry.entry_id,
+                MoodEntry.user_id,
+                MoodEntry.score,
+                MoodEntry.note,
+                MoodEntry.recorded_at,
+            )
+            .where(MoodEntry.user_id.in_(user_ids))
+            .order_by(MoodEntry.id)
+            .limit(limit)
+        )
+
+        return [
+            {
+                "id": row.id,
+                "entry_id": str(row.entry_id),
+                "user_id": row.user_id,
+                "score": row.score,
+                "note": row.note,
+                "recorded_at": row.recorded_at.isoformat(),
+            }
+            for row in rows
+        ]
+
+    async def count_users_entries(self, user_ids: list[int]) -> int:
+        """
+        Количество записей пользователей
+
+        :param user_ids: идентификаторы пользователей
+        :type user_ids: list[int]
+        :return: количество записей
+        :rtype: int
+        """
+        return await self.session_db.scalar(
+            select(func.count()).select_from(MoodEntry).where(MoodEntry.user_id.in_(user_ids))
+        )
+
+    async def delete_entries(self, ids: list[int]) -> int:
+        """
+        Удаление записей по идентификаторам строк с фиксацией транзакции
+
+        :param ids: идентификаторы строк
+        :type ids: list[int]
+        :return: количество удаленных записей
+        :rtype: int
+        """
+        result = await self.session_db.execute(delete(MoodEntry).where(MoodEntry.id.in_(ids)))
+        await self.session_db.commit()
+
+        return result.rowcount
+
+    async def series(
+        self,
+        user_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        bucket: MoodBucket = MoodBucket.DAY,
+        step: int = 1,
+        time_zone: str = "UTC",
+    ) -> dict[str, Any]:
+        """
+        Ряд настроения пользователя, агрегированный по интервалам в БД: средняя, минимальная и максимальная
+        оценки и количество записей. Интервалы строятся по местному времени time_zone: date_trunc для одного
+        интервала и date_bin для нескольких. Запрос читает только покрывающий индекс
+        ix_mood_entries_user_recorded_score_id и секции периода, а количество интервалов ограничено
+        MOOD_SERIES_MAX_BUCKETS, поэтому размер ответа не зависит от длины истории.
+        Интервалы без записей в ряд не попадают.
+        Версия ряда - количество и последний идентификатор записей периода: записи только добавляются,
+        поэтому при неизменных параметрах любая новая запись периода меняет версию
+
+        :param user_id: идентификатор пользователя
+        :type user_id: int
+        :param start: начало периода включительно. По умолчанию - за DEFAULT_SERIES_PERIOD до конца
+        :type start: datetime | None
+        :param end: конец периода не включительно. По умолчанию - конец текущего интервала
+        :type end: datetime | None
+        :param bucket: единица интервала
+        :type bucket: MoodBucket
+        :param step: ширина интервала в единицах. Для месяцев - только 1
+        :type step: int
+        :param time_zone: часовой пояс IANA, по местному времени которого строятся интервалы
+        :type time_zone: str
+        :return: ряд в формате MoodSeries
+        :rtype: dict[str, Any]
+        :exception InvalidSeriesPeriod: начало периода не раньше конца
+        :exception InvalidBucketStep: ширина месячного интервала больше одного месяца
+        :exception TooManyBuckets: интервалов больше MOOD_SERIES_MAX_BUCKETS
+        :exception UnknownTimeZone: неизвестный часовой пояс
+
+        .. code-block:: python
+            from dh_mood_tracker.moods import MoodBucket, MoodService
+
+            series: dict[str, Any] = await MoodService(session).series(
+                user.id, bucket=MoodBucket.HOUR, step=6, time_zone="Europe/Moscow"
+            )
+        """
+        if bucket is MoodBucket.MONTH and step != 1:
+            raise InvalidBucketStep()
+        try:
+            zone: ZoneInfo = ZoneInfo(time_zone)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise UnknownTimeZone(time_zone) from e
+
+        end = end or current_bucket_end(bucket, step, zone)
+        start = start or end - DEFAULT_SERIES_PERIOD
+        if start >= end:
+            raise InvalidSeriesPeriod()
+        if math.ceil((end - start) / (BUCKET_DURATION[bucket] * step)) + 1 > settings.MOOD_SERIES_MAX_BUCKETS:
+            raise TooManyBuckets(settings.MOOD_SERIES_MAX_BUCKETS)
+
+        local_time = func.timezone(time_zone, MoodEntry.recorded_at)
+        if step == 1:
+            bucket_start = func.date_trunc(bucket.value, local_time)
+        else:
+            bucket_start = func.date_bin(BUCKET_DURATION[bucket] * step, local_time, BUCKET_ORIGIN)
+        bucket_start = bucket_start.label("bucket_start")
+
+        statement = (
+            select(
+                bucket_start,
+                func.avg(MoodEntry.score).cast(Float).label("avg"),
+                func.min(MoodEntry.score).label("min"),
+                func.max(MoodEntry.score).label("max"),
+                func.count().label("count"),
+                func.max(MoodEntry.id).label("last_id"),
+            )
+            .where(MoodEntry.user_id == user_id, MoodEntry.recorded_at >= start, MoodEntry.recorded_at < end)
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        )
+        rows = (await self.session_db.execute(statement)).all()
+
+        return {
+            "bucket": bucket.value,
+            "step": step,
+            "time_zone": time_zone,
+            "start": start,
+            "end": end,
+            "version": f"{sum(row.count for row in rows)}.{max((row.last_id for row in rows), default=0)}",
+            # Начало интервала возвращается из БД по местному времени без часового пояса
+            "points": [
+                {
+                    "bucket_start": row.bucket_start.replace(tzinfo=zone),
+                    "avg": round(row.avg, 2),
+                    "min": row.min,
+                    "max": row.max,
+                    "count": row.count,
+                }
+                for row in rows
+            ],
+        }
+
+    async def create_partition(self, month: date) -> bool:
+        """
+        Создание секции месяца. Записи месяца, уже попавшие в секцию по умолчанию, переносятся в новую секцию
+        в той же транзакции: иначе создание секции отклоняется проверкой секции по умолчанию.
+        Ожидание блокировки таблицы ограничено, чтобы не задерживать прием записей
+
+        :param month: первый день месяца
+        :type month: date
+        :return: секция создана. False - секция уже существует
+        :rtype: bool
+
+        .. code-block:: python
+            from dh_mood_tracker.moods import MoodService
+            from dh_mood_tracker.moods.partitions import upcoming_months
+
+            for month in upcoming_months(3):
+                await MoodService(session).create_partition(month)
+        """
+        name: str = partition_name(month)
+        if await self.session_db.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+            return False
+
+        bounds: dict[str, datetime] = {
+            "start": datetime.combine(month, time(), UTC),
+            "end": datetime.combine(add_months(month, 1), time(), UTC),
+        }
+        await self.session_db.execute(text("SET LOCAL lock_timeout = '5s'"))
+        await self.session_db.execute(
+            text(f"CREATE TEMPORARY TABLE moved_mood_entries ON COMMIT DROP AS TABLE {DEFAULT_PARTITION} WITH NO DATA")
+        )
+        await self.session_db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE recorded_at >= :start AND recorded_at < :end "
+                "RETURNING *) INSERT INTO moved_mood_entries SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        await self.session_db.execute(text(create_partition_sql(month)))
+        await self.session_db.execute(text("INSERT INTO mood_entries SELECT * FROM moved_mood_entries"))
+        await self.session_db.commit()
+
+        return True
+
+    async def refresh_statistics(self) -> None:
+        """
+        Обновление статистики планировщика секционированной таблицы. Автоочистка собирает статистику
+        только по секциям, а оценки запросов к родительской таблице строятся по ее собственной статистике
+        """
+        await self.session_db.execute(text("ANALYZE mood_entries"))
+        await self.session_db.commit()
+
+
+async def get_mood_service(
+    user: UserModel = Depends(get_user_data), router: ShardRouter = Depends(get_shard_router)
+) -> AsyncIterator[MoodService]:
+    """
+    Метод для зависимости работы с сервисом записей настроения в шарде текущего пользователя
+
+    :param user: текущий пользователь
+    :type user: UserModel
+    :param router: маршрутизатор шардов
+    :type router: ShardRouter
+    :return: экземпляр сервиса записей настроения
+    :rtype: AsyncIterator[MoodService]
+    """
+    async with MoodService.for_key(router, user.supabase_id) as service:
+        yield service
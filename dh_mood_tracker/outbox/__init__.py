@@ -0,0 +1,7 @@
+"""Пакет исходящих событий (transactional outbox)"""
+
+__author__: str = "Digital Horizons"
+
+from .model import OutboxMessage
+from .relay import OutboxRelay
+from .service import OutboxService
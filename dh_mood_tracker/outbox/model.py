@@ -0,0 +1,55 @@
+"""Модуль модели исходящего события"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import UUID, Text, Index, String, Integer, DateTime, LargeBinary, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dh_mood_tracker.db import BaseModel
+from dh_mood_tracker.events import BaseEvent, encode_event
+
+
+class OutboxMessage(BaseModel):
+    """
+    Модель исходящего события (transactional outbox). Событие записывается в той же транзакции,
+    что и данные, и доставляется обработчикам OutboxRelay после фиксации транзакции
+
+    :cvar event_id: идентификатор события
+    :cvar event_type: название события
+    :cvar payload: событие в msgpack (encode_event)
+    :cvar created_at: время записи события
+    :cvar available_at: время, с которого событие можно взять в обработку: аренда или пауза перед повтором
+    :cvar attempts: количество попыток обработки
+    :cvar processed_at: время успешной обработки. None - событие не обработано
+    :cvar last_error: текст ошибки последней попытки
+    """
+
+    __tablename__: str = "outbox"
+    __table_args__ = (
+        # Частичный индекс необработанных событий: выборка пакета не читает обработанные
+        Index("ix_outbox_pending", "available_at", postgresql_where=text("processed_at IS NULL")),
+    )
+
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID, unique=True, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    @classmethod
+    def from_event(cls, event: BaseEvent) -> "OutboxMessage":
+        """
+        Создание записи из события
+
+        :param event: событие
+        :type event: BaseEvent
+        :return: запись исходящего события
+        :rtype: OutboxMessage
+        """
+        return cls(event_id=event.event_id, event_type=str(event.event_type), payload=encode_event(event))
@@ -0,0 +1,151 @@
+"""Модуль доставки исходящих событий обработчикам"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from typing import Any, Callable, Sequence, Awaitable
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dh_mood_tracker.events import BaseEvent, decode_event
+
+from .service import OutboxService, outbox_wakeup
+
+# Тип доставки события: обработчики получают событие и сессию транзакции отметки об обработке
+DispatchType = Callable[[BaseEvent, AsyncSession], Awaitable[None]]
+
+
+class OutboxRelay:
+    """
+    Доставка исходящих событий пакетами. Несколько воркеров и реплик работают параллельно:
+    пакеты выбираются с FOR UPDATE SKIP LOCKED и не пересекаются.
+    Каждое событие обрабатывается в своей транзакции, и отметка об обработке фиксируется вместе
+    с изменениями обработчика, поэтому событие не теряется при падении процесса.
+    Доставка - как минимум один раз: обработчики должны быть идемпотентны
+
+    :ivar _session_factory: фабрика сессий БД
+    :type _session_factory: async_sessionmaker[AsyncSession]
+    :ivar _dispatch: доставка события обработчикам
+    :type _dispatch: DispatchType
+    :ivar _batch_size: максимальный размер пакета
+    :type _batch_size: int
+    :ivar _poll_interval: пауза между опросами при пустой очереди в секундах
+    :type _poll_interval: float
+    :ivar _lease: время аренды пакета в секундах
+    :type _lease: float
+    :ivar _max_attempts: максимальное количество попыток обработки события
+    :type _max_attempts: int
+    :ivar _retry_delay: базовая пауза перед повтором после ошибки в секундах, удваивается с каждой попыткой
+    :type _retry_delay: float
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        dispatch: DispatchType,
+        batch_size: int,
+        poll_interval: float,
+        lease: float,
+        max_attempts: int,
+        retry_delay: float,
+    ) -> None:
+        """
+        Инициализация
+
+        :param session_factory: фабрика сессий БД
+        :type session_factory: async_sessionmaker[AsyncSession]
+        :param dispatch: доставка события обработчикам
+        :type dispatch: DispatchType
+        :param batch_size: максимальный размер пакета
+        :type batch_size: int
+        :param poll_interval: пауза между опросами при пустой очереди в секундах
+        :type poll_interval: float
+        :param lease: время аренды пакета в секундах
+        :type lease: float
+        :param max_attempts: максимальное количество попыток обработки события
+        :type max_attempts: int
+        :param retry_delay: базовая пауза перед повтором после ошибки в секундах
+        :type retry_delay: float
+        """
+        self._session_factory: async_sessionmaker[AsyncSession] = session_factory
+        self._dispatch: DispatchType = dispatch
+        self._batch_size: int = batch_size
+        self._poll_interval: float = poll_interval
+        self._lease: float = lease
+        self._max_attempts: int = max_attempts
+        self._retry_delay: float = retry_delay
+        self._task: asyncio.Task | None = None
+        self.processed: int = 0
+        self.failed: int = 0
+
+    async def start(self) -> None:
+        """Запуск доставки. Вызывается в lifespan приложения"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Остановка доставки. Арендованные, но не обработанные события станут доступны после аренды"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def process_batch(self) -> int:
+        """
+        Выборка и обработка одного пакета
+
+        :return: количество выбранных событий
+        :rtype: int
+        """
+        async with self._session_factory() as session:
+            rows: Sequence[Any] = await OutboxService(session).claim(self._batch_size, self._lease, self._max_attempts)
+
+            for row in rows:
+                await self._process(session, row)
+
+        return len(rows)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: признак работы, количество обработанных и неудачных попыток
+        :rtype: dict[str, Any]
+        """
+        return {"running": self._task is not None, "processed": self.processed, "failed": self.failed}
+
+    async def _process(self, session: AsyncSession, row: Any) -> None:
+        """Обработка события в отдельной транзакции вместе с отметкой об обработке"""
+        service: OutboxService = OutboxService(session)
+
+        try:
+            event: BaseEvent = decode_event(row.payload)
+            await service.complete(row.id)
+            await self._dispatch(event, session)
+            await session.commit()
+            self.processed += 1
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            await session.rollback()
+            self.failed += 1
+            print(f"Ошибка обработки исходящего события {row.id} (попытка {row.attempts}): {e}")
+            await service.fail(row.id, f"{type(e).__name__}: {e}", self._retry_delay * 2 ** (row.attempts - 1))
+
+    async def _loop(self) -> None:
+        """Обработка пакетов подряд, пока они полные, и ожидание новых событий при пустой очереди"""
+        while True:
+            # Сигнал сбрасывается до выборки: события, записанные во время обработки пакета, не ждут опроса
+            outbox_wakeup.clear()
+            try:
+                if await self.process_batch() >= self._batch_size:
+                    continue
+            except SQLAlchemyError as e:
+                print(f"Ошибка выборки исходящих событий: {e}")
+
+            try:
+                await asyncio.wait_for(outbox_wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
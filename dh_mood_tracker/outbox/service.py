@@ -0,0 +1,139 @@
+"""Модуль сервиса исходящих событий"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from typing import Any, Sequence
+from datetime import timedelta
+
+from sqlalchemy import func, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dh_mood_tracker.events import BaseEvent
+
+from .model import OutboxMessage
+
+# Сигнал OutboxRelay текущего процесса о новых событиях, чтобы не ждать следующего опроса
+outbox_wakeup: asyncio.Event = asyncio.Event()
+
+
+class OutboxService:
+    """
+    Сервис исходящих событий: запись событий и выборка пакетов для доставки
+
+    :ivar session_db: сессия подключения к БД
+    :type session_db: AsyncSession
+    """
+
+    def __init__(self, session_db: AsyncSession) -> None:
+        """
+        Инициализация сервиса
+
+        :param session_db: сессия подключения к БД
+        :type session_db: AsyncSession
+        """
+        self.session_db: AsyncSession = session_db
+
+    async def publish(self, *events: BaseEvent) -> None:
+        """
+        Запись событий с фиксацией транзакции вместе с остальными изменениями сессии
+
+        :param events: события
+        :type events: BaseEvent
+
+        .. code-block:: python
+            from dh_mood_tracker.outbox import OutboxService
+            from dh_mood_tracker.events import SupaBaseUserCreate
+
+            await OutboxService(session_db).publish(SupaBaseUserCreate(supabase_id, user_data))
+        """
+        self.session_db.add_all([OutboxMessage.from_event(event) for event in events])
+        await self.session_db.commit()
+        outbox_wakeup.set()
+
+    async def claim(self, batch_size: int, lease_seconds: float, max_attempts: int) -> Sequence[Any]:
+        """
+        Выборка пакета необработанных событий одним запросом. Строки, заблокированные другими
+        обработчиками, пропускаются (FOR UPDATE SKIP LOCKED), а выбранные арендуются на lease_seconds:
+        если обработчик упадет, события станут доступны снова после окончания аренды
+
+        :param batch_size: максимальный размер пакета
+        :type batch_size: int
+        :param lease_seconds: время аренды событий в секундах
+        :type lease_seconds: float
+        :param max_attempts: события с этим количеством попыток больше не выбираются
+        :type max_attempts: int
+        :return: строки (id, payload, attempts) в порядке записи
+        :rtype: Sequence[Any]
+        """
+        pending = (
+            select(OutboxMessage.id)
+            .where(
+                OutboxMessage.processed_at.is_(None),
+                OutboxMessage.available_at <= func.now(),
+                OutboxMessage.attempts < max_attempts,
+            )
+            .order_by(OutboxMessage.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session_db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(pending))
+            .values(
+                available_at=func.now() + timedelta(seconds=lease_seconds),
+                attempts=OutboxMessage.attempts + 1,
+            )
+            .returning(OutboxMessage.id, OutboxMessage.payload, OutboxMessage.attempts)
+        )
+        rows: Sequence[Any] = sorted(result.all(), key=lambda row: row.id)
+        await self.session_db.commit()
+
+        return rows
+
+    async def complete(self, message_id: int) -> None:
+        """
+        Отметка об обработке события без фиксации транзакции:
+        фиксируется вместе с изменениями обработчика события
+
+        :param message_id: идентификатор записи события
+        :type message_id: int
+        """
+        await self.session_db.execute(
+            update(OutboxMessage).where(OutboxMessage.id == message_id).values(processed_at=func.now(), last_error=None)
+        )
+
+    async def fail(self, message_id: int, error: str, retry_delay: float) -> None:
+        """
+        Отметка об ошибке обработки с паузой перед повтором
+
+        :param message_id: идентификатор записи события
+        :type message_id: int
+        :param error: текст ошибки
+        :type error: str
+        :param retry_delay: пауза перед повтором в секундах
+        :type retry_delay: float
+        """
+        await self.session_db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id == message_id)
+            .values(available_at=func.now() + timedelta(seconds=retry_delay), last_error=error[:1000])
+        )
+        await self.session_db.commit()
+
+    async def prune(self, retention_seconds: float) -> int:
+        """
+        Удаление обработанных событий старше срока хранения
+
+        :param retention_seconds: срок хранения обработанных событий в секундах
+        :type retention_seconds: float
+        :return: количество удаленных событий
+        :rtype: int
+        """
+        result = await self.session_db.execute(
+            delete(OutboxMessage).where(OutboxMessage.processed_at < func.now() - timedelta(seconds=retention_seconds))
+        )
+        await self.session_db.commit()
+
+        return result.rowcount
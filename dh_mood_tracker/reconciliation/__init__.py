@@ -0,0 +1,7 @@
+"""Пакет сверки локальных пользователей с SupaBase"""
+
+__author__: str = "Digital Horizons"
+
+from .diff import Difference, merge_diff
+from .source import RemoteUser, load_fixture, fetch_remote_users
+from .service import UserReconciler, ReconcileReport
@@ -0,0 +1,80 @@
+"""Точка входа сверки пользователей: python -m dh_mood_tracker.reconciliation"""
+
+__author__: str = "Digital Horizons"
+
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+from dataclasses import asdict
+
+from dh_mood_tracker.db import get_redis_manager
+from dh_mood_tracker.utils import SupaBase, get_cache_invalidator
+from dh_mood_tracker.db.session import AsyncSessionLocal, engine
+from dh_mood_tracker.users.token_cache import get_token_cache
+
+from .source import RemoteUser, load_fixture, fetch_remote_users
+from .service import UserReconciler, ReconcileReport
+
+
+def _parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Сверка локальных пользователей с пользователями SupaBase")
+    parser.add_argument("--fixture", type=Path, default=None, help="JSON файл с пользователями вместо SupaBase")
+    parser.add_argument("--per-page", type=int, default=1000, help="размер страницы списка пользователей SupaBase")
+    parser.add_argument("--concurrency", type=int, default=8, help="одновременных запросов страниц SupaBase")
+    parser.add_argument("--batch-size", type=int, default=1000, help="размер пакета чтения и записи БД")
+    parser.add_argument("--min-age", type=float, default=300.0, help="пропускать пользователей моложе, секунд")
+    parser.add_argument("--dry-run", action="store_true", help="только отчет, без изменений в БД")
+    parser.add_argument("--deactivate-orphans", action="store_true", help="деактивировать пользователей без SupaBase")
+    parser.add_argument("--json", type=Path, default=None, help="файл для сохранения отчета с отмеченными UUID")
+    return parser.parse_args()
+
+
+async def _run(args: argparse.Namespace) -> ReconcileReport:
+    """Чтение пользователей SupaBase и сверка"""
+    try:
+        if args.fixture:
+            remote: list[RemoteUser] = load_fixture(args.fixture)
+        else:
+            async with AsyncSessionLocal() as session:
+                remote = await fetch_remote_users(SupaBase(session).list_users, args.per_page, args.concurrency)
+        print(f"✅ Прочитано пользователей SupaBase: {len(remote)}")
+
+        return await UserReconciler(AsyncSessionLocal, args.batch_size, get_token_cache()).reconcile(
+            remote, args.dry_run, args.deactivate_orphans, args.min_age
+        )
+    finally:
+        # Удаление токенов деактивированных пользователей из кеша в памяти воркеров приложения
+        await get_cache_invalidator().stop()
+        await get_redis_manager().close()
+        await engine.dispose()
+
+
+def main() -> int:
+    """
+    Сверка с выводом и сохранением отчета
+
+    :return: код выхода. 1 - остались пользователи для ручного разбора
+    :rtype: int
+    """
+    args: argparse.Namespace = _parse_args()
+    report: ReconcileReport = asyncio.run(_run(args))
+
+    print(f"Длительность: {report.duration_s} с")
+    print(f"SupaBase: {report.remote}, локально: {report.local}, нет локально: {report.missing}")
+    print(
+        f"Создано: {report.inserted}, недавние: {report.recent}, неполный профиль: {report.incomplete}, "
+        f"конфликты: {report.conflicts}"
+    )
+    print(f"Нет в SupaBase: {report.orphans}, деактивировано: {report.deactivated}")
+
+    if args.json:
+        args.json.write_text(json.dumps(asdict(report), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    return 1 if report.flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Модуль сравнения отсортированных потоков идентификаторов"""
+
+__author__: str = "Digital Horizons"
+
+from enum import StrEnum
+from uuid import UUID
+from typing import Iterable, AsyncIterable, AsyncIterator
+
+
+class Difference(StrEnum):
+    """
+    Вид расхождения
+
+    :cvar MISSING: пользователь есть в SupaBase, но нет в локальной БД
+    :cvar ORPHAN: пользователь есть в локальной БД, но нет в SupaBase
+    """
+
+    MISSING = "missing"
+    ORPHAN = "orphan"
+
+
+async def merge_diff(remote: Iterable[UUID], local: AsyncIterable[UUID]) -> AsyncIterator[tuple[Difference, UUID]]:
+    """
+    Разность множеств слиянием двух отсортированных по возрастанию потоков за один проход.
+    Локальный поток читается по мере сравнения и не хранится в памяти.
+    Порядок UUID в Python совпадает с порядком uuid в PostgreSQL
+
+    :param remote: отсортированные UUID пользователей SupaBase
+    :type remote: Iterable[UUID]
+    :param local: отсортированные UUID SupaBase локальных пользователей
+    :type local: AsyncIterable[UUID]
+    :return: расхождения в порядке возрастания UUID
+    :rtype: AsyncIterator[tuple[Difference, UUID]]
+
+    .. code-block:: python
+        from dh_mood_tracker.reconciliation import Difference, merge_diff
+
+        async for difference, supabase_id in merge_diff(sorted(remote_ids), reconciler.local_ids()):
+            if difference is Difference.MISSING:
+                ...
+    """
+    remote_iter = iter(remote)
+    remote_id: UUID | None = next(remote_iter, None)
+
+    async for local_id in local:
+        while remote_id is not None and remote_id < local_id:
+            yield Difference.MISSING, remote_id
+            remote_id = next(remote_iter, None)
+
+        if remote_id == local_id:
+            remote_id = next(remote_iter, None)
+        else:
+            yield Difference.ORPHAN, local_id
+
+    while remote_id is not None:
+        yield Difference.MISSING, remote_id
+        remote_id = next(remote_iter, None)
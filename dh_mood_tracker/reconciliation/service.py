@@ -0,0 +1,255 @@
+"""Модуль сверки локальных пользователей с SupaBase"""
+
+__author__: str = "Digital Horizons"
+
+import time
+from uuid import UUID
+from typing import Any, Sequence, AsyncIterator
+from datetime import UTC, datetime, timedelta
+from dataclasses import field, dataclass
+
+from pydantic import Field, ValidationError
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.dialects.postgresql import insert
+
+from dh_mood_tracker.users.model import User as UserModel
+from dh_mood_tracker.users.schemas import PublicUserData
+from dh_mood_tracker.users.token_cache import TokenCache
+
+from .diff import Difference, merge_diff
+from .source import RemoteUser
+
+
+class ReconcileUserSchema(PublicUserData):
+    """
+    Данные локального пользователя, восстановленные из профиля SupaBase
+
+    :cvar login: логин пользователя
+    :type login: str
+    :cvar supabase_id: UUID пользователя в SupaBase
+    :type supabase_id: UUID
+    """
+
+    login: str = Field(..., max_length=50, min_length=4)
+    supabase_id: UUID
+
+
+@dataclass
+class ReconcileReport:
+    """
+    Отчет сверки
+
+    :cvar remote: пользователей в SupaBase
+    :type remote: int
+    :cvar local: пользователей в локальной БД
+    :type local: int
+    :cvar missing: пользователей SupaBase без локальной записи
+    :type missing: int
+    :cvar inserted: созданных локальных пользователей
+    :type inserted: int
+    :cvar recent: пропущенных недавно зарегистрированных: их событие создания может быть еще в outbox
+    :type recent: int
+    :cvar incomplete: пропущенных из-за неполного профиля в SupaBase
+    :type incomplete: int
+    :cvar conflicts: пропущенных из-за конфликта уникальности с другой локальной записью
+    :type conflicts: int
+    :cvar orphans: локальных пользователей без пользователя SupaBase
+    :type orphans: int
+    :cvar deactivated: деактивированных локальных пользователей без пользователя SupaBase
+    :type deactivated: int
+    :cvar duration_s: длительность сверки в секундах
+    :type duration_s: float
+    :cvar flagged: UUID SupaBase, требующие ручного разбора, по виду проблемы
+    :type flagged: dict[str, list[str]]
+    """
+
+    remote: int = 0
+    local: int = 0
+    missing: int = 0
+    inserted: int = 0
+    recent: int = 0
+    incomplete: int = 0
+    conflicts: int = 0
+    orphans: int = 0
+    deactivated: int = 0
+    duration_s: float = 0.0
+    flagged: dict[str, list[str]] = field(default_factory=dict)
+
+    def flag(self, reason: str, supabase_id: UUID) -> None:
+        """Отметка пользователя для ручного разбора"""
+        self.flagged.setdefault(reason, []).append(str(supabase_id))
+
+
+class UserReconciler:
+    """
+    Сверка локальных пользователей с пользователями SupaBase: восстанавливает пользователей,
+    чье событие создания не было обработано, и находит локальных пользователей без пользователя SupaBase.
+    Локальные UUID читаются постранично по индексу supabase_id и не загружаются в память целиком.
+    Вставка пакетами с ON CONFLICT DO NOTHING безопасна при параллельной работе OutboxRelay.
+    Токены деактивированных пользователей удаляются из кеша, иначе они продолжают проходить авторизацию
+
+    :ivar _session_factory: фабрика сессий БД
+    :type _session_factory: async_sessionmaker[AsyncSession]
+    :ivar _batch_size: размер пакета чтения и записи
+    :type _batch_size: int
+    :ivar _token_cache: кеш пользователей по токену доступа
+    :type _token_cache: TokenCache | None
+
+    .. code-block:: python
+        from dh_mood_tracker.db.session import AsyncSessionLocal
+        from dh_mood_tracker.reconciliation import UserReconciler, load_fixture
+
+        report: ReconcileReport = await UserReconciler(AsyncSessionLocal).reconcile(load_fixture(path))
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 1000,
+        token_cache: TokenCache | None = None,
+    ) -> None:
+        """
+        Инициализация
+
+        :param session_factory: фабрика сессий БД
+        :type session_factory: async_sessionmaker[AsyncSession]
+        :param batch_size: размер пакета чтения и записи
+        :type batch_size: int
+        :param token_cache: кеш пользователей по токену доступа для удаления токенов деактивированных пользователей
+        :type token_cache: TokenCache | None
+        """
+        self._session_factory: async_sessionmaker[AsyncSession] = session_factory
+        self._batch_size: int = batch_size
+        self._token_cache: TokenCache | None = token_cache
+
+    async def local_ids(self, session: AsyncSession) -> AsyncIterator[UUID]:
+        """
+        UUID SupaBase локальных пользователей по возрастанию. Читается страницами по ключу,
+        без смещения, поэтому каждая страница - короткий проход по индексу
+
+        :param session: сессия БД
+        :type session: AsyncSession
+        :return: поток UUID без повторов
+        :rtype: AsyncIterator[UUID]
+        """
+        last_id: UUID | None = None
+
+        while True:
+            query = select(UserModel.supabase_id).distinct().order_by(UserModel.supabase_id).limit(self._batch_size)
+            if last_id is not None:
+                query = query.where(UserModel.supabase_id > last_id)
+
+            page: Sequence[UUID] = (await session.scalars(query)).all()
+            for supabase_id in page:
+                yield supabase_id
+
+            if len(page) < self._batch_size:
+                return
+            last_id = page[-1]
+
+    async def reconcile(
+        self,
+        remote: Sequence[RemoteUser],
+        dry_run: bool = False,
+        deactivate_orphans: bool = False,
+        min_age: float = 300.0,
+    ) -> ReconcileReport:
+        """
+        Сверка и восстановление пользователей
+
+        :param remote: пользователи SupaBase, отсортированные по UUID
+        :type remote: Sequence[RemoteUser]
+        :param dry_run: только отчет, без изменений в БД
+        :type dry_run: bool
+        :param deactivate_orphans: деактивировать локальных пользователей без пользователя SupaBase
+        :type deactivate_orphans: bool
+        :param min_age: пропускать пользователей SupaBase моложе этого количества секунд
+        :type min_age: float
+        :return: отчет сверки
+        :rtype: ReconcileReport
+        """
+        started: float = time.perf_counter()
+        report: ReconcileReport = ReconcileReport(remote=len(remote))
+        by_id: dict[UUID, RemoteUser] = {user.supabase_id: user for user in remote}
+        created_before: datetime = datetime.now(UTC) - timedelta(seconds=min_age)
+        rows: list[dict[str, Any]] = []
+        orphans: list[UUID] = []
+
+        async with self._session_factory() as session:
+            async for difference, supabase_id in merge_diff(by_id, self._count_local(session, report)):
+                if difference is Difference.ORPHAN:
+                    report.orphans += 1
+                    report.flag("orphan", supabase_id)
+                    orphans.append(supabase_id)
+                    continue
+
+                report.missing += 1
+                if (row := self._build_row(by_id[supabase_id], created_before, report)) is not None:
+                    rows.append(row)
+
+            if not dry_run:
+                for start in range(0, len(rows), self._batch_size):
+                    await self._insert(session, rows[start : start + self._batch_size], report)
+                if deactivate_orphans:
+                    for start in range(0, len(orphans), self._batch_size):
+                        report.deactivated += await self._deactivate(session, orphans[start : start + self._batch_size])
+
+        report.duration_s = round(time.perf_counter() - started, 3)
+        return report
+
+    async def _count_local(self, session: AsyncSession, report: ReconcileReport) -> AsyncIterator[UUID]:
+        """Поток локальных UUID с подсчетом в отчете"""
+        async for supabase_id in self.local_ids(session):
+            report.local += 1
+            yield supabase_id
+
+    @staticmethod
+    def _build_row(user: RemoteUser, created_before: datetime, report: ReconcileReport) -> dict[str, Any] | None:
+        """Строка локального пользователя из профиля SupaBase или None - если пользователя нельзя восстановить"""
+        if user.created_at > created_before:
+            report.recent += 1
+            return None
+
+        try:
+            data: ReconcileUserSchema = ReconcileUserSchema(
+                **{**user.user_metadata, "email": user.email, "supabase_id": user.supabase_id}
+            )
+        except ValidationError:
+            report.incomplete += 1
+            report.flag("incomplete", user.supabase_id)
+            return None
+
+        return data.model_dump()
+
+    @staticmethod
+    async def _insert(session: AsyncSession, rows: list[dict[str, Any]], report: ReconcileReport) -> None:
+        """Вставка пакета пользователей. Строки, нарушившие уникальность, отмечаются в отчете"""
+        result = await session.execute(
+            insert(UserModel).values(rows).on_conflict_do_nothing().returning(UserModel.supabase_id)
+        )
+        inserted: set[UUID] = set(result.scalars().all())
+        await session.commit()
+
+        report.inserted += len(inserted)
+        for row in rows:
+            if row["supabase_id"] not in inserted:
+                report.conflicts += 1
+                report.flag("conflict", row["supabase_id"])
+
+    async def _deactivate(self, session: AsyncSession, supabase_ids: list[UUID]) -> int:
+        """Деактивация пакета локальных пользователей без пользователя SupaBase с удалением их токенов из кеша"""
+        result = await session.execute(
+            update(UserModel)
+            .where(UserModel.supabase_id.in_(supabase_ids), UserModel.is_active.is_(True))
+            .values(is_active=False)
+            .returning(UserModel.id)
+        )
+        user_ids: Sequence[int] = result.scalars().all()
+        await session.commit()
+
+        if self._token_cache is not None:
+            for user_id in user_ids:
+                await self._token_cache.evict_user(user_id)
+
+        return len(user_ids)
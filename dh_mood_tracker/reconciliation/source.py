@@ -0,0 +1,113 @@
+"""Модуль чтения пользователей SupaBase для сверки"""
+
+__author__: str = "Digital Horizons"
+
+import json
+import asyncio
+from uuid import UUID
+from typing import Any, Callable, Awaitable
+from pathlib import Path
+from datetime import datetime
+from dataclasses import field, dataclass
+
+from supabase_auth import User
+
+# Тип чтения страницы пользователей: номер страницы с 1 и размер страницы
+ListPageType = Callable[[int, int], Awaitable[list[User]]]
+
+
+@dataclass(frozen=True, slots=True)
+class RemoteUser:
+    """
+    Пользователь SupaBase в объеме, нужном для сверки
+
+    :cvar supabase_id: UUID пользователя в SupaBase
+    :type supabase_id: UUID
+    :cvar email: адрес электронной почты
+    :type email: str | None
+    :cvar created_at: время регистрации
+    :type created_at: datetime
+    :cvar user_metadata: данные профиля, переданные при регистрации
+    :type user_metadata: dict[str, Any]
+    """
+
+    supabase_id: UUID
+    email: str | None
+    created_at: datetime
+    user_metadata: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_auth_user(cls, user: User) -> "RemoteUser":
+        """
+        Создание из пользователя клиента SupaBase
+
+        :param user: пользователь SupaBase
+        :type user: User
+        :return: пользователь для сверки
+        :rtype: RemoteUser
+        """
+        return cls(UUID(user.id), user.email, user.created_at, user.user_metadata or {})
+
+
+async def fetch_remote_users(list_page: ListPageType, per_page: int, concurrency: int) -> list[RemoteUser]:
+    """
+    Чтение всех пользователей SupaBase постранично с ограниченной параллельностью.
+    Каждый из concurrency обработчиков берет следующий номер страницы, пока не встретится неполная страница.
+    Страницы могут сдвинуться из-за регистраций во время чтения, поэтому пользователи собираются по UUID
+
+    :param list_page: чтение страницы пользователей
+    :type list_page: ListPageType
+    :param per_page: размер страницы
+    :type per_page: int
+    :param concurrency: максимум одновременных запросов страниц
+    :type concurrency: int
+    :return: пользователи, отсортированные по UUID
+    :rtype: list[RemoteUser]
+
+    .. code-block:: python
+        from dh_mood_tracker.utils import SupaBase
+        from dh_mood_tracker.reconciliation import fetch_remote_users
+
+        remote: list[RemoteUser] = await fetch_remote_users(SupaBase(session_db).list_users, 1000, 8)
+    """
+    users: dict[UUID, RemoteUser] = {}
+    next_page: int = 1
+    last_page: int | None = None
+
+    async def worker() -> None:
+        nonlocal next_page, last_page
+
+        while last_page is None or next_page <= last_page:
+            page: int = next_page
+            next_page += 1
+            batch: list[User] = await list_page(page, per_page)
+
+            for user in batch:
+                remote_user: RemoteUser = RemoteUser.from_auth_user(user)
+                users[remote_user.supabase_id] = remote_user
+
+            if len(batch) < per_page and (last_page is None or page < last_page):
+                last_page = page
+
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+
+    return sorted(users.values(), key=lambda user: user.supabase_id)
+
+
+def load_fixture(path: Path) -> list[RemoteUser]:
+    """
+    Чтение пользователей из JSON файла: список пользователей в формате GoTrue
+    или ответ API администратора с ключом users
+
+    :param path: путь к файлу
+    :type path: Path
+    :return: пользователи, отсортированные по UUID
+    :rtype: list[RemoteUser]
+    """
+    data: Any = json.loads(path.read_text(encoding="utf-8"))
+    items: list[dict[str, Any]] = data["users"] if isinstance(data, dict) else data
+
+    return sorted(
+        (RemoteUser.from_auth_user(User.model_validate(item)) for item in items),
+        key=lambda user: user.supabase_id,
+    )
@@ -0,0 +1,8 @@
+"""Пакет планировщика периодических задач"""
+
+__author__: str = "Digital Horizons"
+
+from .cron import CronSchedule
+from .jobs import get_scheduler
+from .lease import RedisLease, LeaderElection
+from .scheduler import Job, JobStats, Scheduler
@@ -0,0 +1,121 @@
+"""Модуль расписаний в формате cron"""
+
+__author__: str = "Digital Horizons"
+
+from datetime import UTC, datetime, timedelta
+
+# Допустимые значения полей: минута, час, день месяца, месяц, день недели (0 и 7 - воскресенье)
+FIELD_RANGES: tuple[tuple[int, int], ...] = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# Горизонт поиска следующего запуска: расписание вроде "0 0 30 2 *" не срабатывает никогда
+SEARCH_LIMIT: timedelta = timedelta(days=5 * 366)
+
+
+def _parse_field(field: str, minimum: int, maximum: int) -> frozenset[int]:
+    """
+    Разбор поля расписания: *, числа, диапазоны a-b, списки через запятую и шаг /n
+
+    :param field: поле расписания
+    :type field: str
+    :param minimum: минимальное значение поля
+    :type minimum: int
+    :param maximum: максимальное значение поля
+    :type maximum: int
+    :return: значения поля
+    :rtype: frozenset[int]
+
+    :exception ValueError: некорректное поле
+    """
+    values: set[int] = set()
+
+    for part in field.split(","):
+        base, _, step_text = part.partition("/")
+        step: int = int(step_text) if step_text else 1
+
+        if base == "*":
+            start, end = minimum, maximum
+        elif "-" in base:
+            start, end = map(int, base.split("-", 1))
+        else:
+            start = int(base)
+            end = maximum if step_text else start
+
+        if step < 1 or not minimum <= start <= end <= maximum:
+            raise ValueError(f'Некорректное поле расписания "{field}"')
+        values.update(range(start, end + 1, step))
+
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    Расписание cron из пяти полей: минута, час, день месяца, месяц, день недели. Время - UTC.
+    Если заданы и день месяца, и день недели, достаточно совпадения любого из них, как в cron
+
+    :ivar expression: исходное выражение
+    :type expression: str
+    """
+
+    def __init__(self, expression: str) -> None:
+        """
+        Инициализация
+
+        :param expression: выражение расписания
+        :type expression: str
+
+        :exception ValueError: некорректное выражение
+
+        .. code-block:: python
+            from dh_mood_tracker.scheduler import CronSchedule
+
+            # Каждый день в 03:15 по UTC
+            CronSchedule("15 3 * * *").next_after(datetime.now(UTC))
+        """
+        fields: list[str] = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f'Расписание "{expression}" должно состоять из пяти полей')
+
+        self.expression: str = expression
+        self._minutes, self._hours, self._days, self._months, weekdays = (
+            _parse_field(field, *limits) for field, limits in zip(fields, FIELD_RANGES)
+        )
+        self._weekdays: frozenset[int] = frozenset(weekday % 7 for weekday in weekdays)
+        self._any_day: bool = fields[2] == "*"
+        self._any_weekday: bool = fields[4] == "*"
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Ближайший запуск строго после момента
+
+        :param moment: момент с часовым поясом
+        :type moment: datetime
+        :return: момент запуска по UTC
+        :rtype: datetime
+
+        :exception ValueError: расписание не срабатывает в пределах SEARCH_LIMIT
+        """
+        current: datetime = moment.astimezone(UTC).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit: datetime = current + SEARCH_LIMIT
+
+        while current < limit:
+            if current.month not in self._months:
+                current = (current.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            elif current.hour not in self._hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+            elif current.minute not in self._minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current
+
+        raise ValueError(f'Расписание "{self.expression}" не срабатывает')
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """Совпадение дня месяца и дня недели"""
+        day: bool = moment.day in self._days
+        # В cron воскресенье - 0, в datetime.weekday - 6
+        weekday: bool = (moment.weekday() + 1) % 7 in self._weekdays
+
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
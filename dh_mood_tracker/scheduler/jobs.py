@@ -0,0 +1,105 @@
+"""Модуль периодических задач приложения"""
+
+__author__: str = "Digital Horizons"
+
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dh_mood_tracker.db import get_shard_router, get_redis_manager
+from dh_mood_tracker.core import settings
+from dh_mood_tracker.moods import MoodService
+from dh_mood_tracker.utils import get_idempotency
+from dh_mood_tracker.outbox import OutboxService
+from dh_mood_tracker.db.session import AsyncSessionLocal
+from dh_mood_tracker.moods.partitions import upcoming_months
+from dh_mood_tracker.users.token_cache import token_cache
+
+from .lease import LeaderElection
+from .scheduler import Job, Scheduler
+
+# Ключ лидера среди реплик в Redis
+LEADER_KEY: str = "scheduler:leader"
+
+
+async def warm_token_cache() -> int:
+    """
+    Прогрев кеша токенов в памяти процесса токенами недавно активных пользователей
+
+    :return: количество загруженных токенов
+    :rtype: int
+    """
+    return await token_cache.warm(settings.TOKEN_CACHE_WARM_LIMIT)
+
+
+async def create_mood_partitions() -> dict[int, list[str]]:
+    """
+    Создание секций записей настроения на MOOD_PARTITIONS_AHEAD месяцев вперед во всех шардах
+
+    :return: первые дни месяцев созданных секций по номеру шарда
+    :rtype: dict[int, list[str]]
+    """
+
+    async def create(session: AsyncSession, shard: int) -> list[str]:
+        created: list[date] = []
+        for month in upcoming_months(settings.MOOD_PARTITIONS_AHEAD):
+            if await MoodService(session, shard).create_partition(month):
+                created.append(month)
+        return [month.isoformat() for month in created]
+
+    return dict(enumerate(await get_shard_router().scatter_gather(create)))
+
+
+async def refresh_mood_statistics() -> None:
+    """Обновление статистики планировщика по записям настроения во всех шардах"""
+
+    async def refresh(session: AsyncSession, shard: int) -> None:
+        await MoodService(session, shard).refresh_statistics()
+
+    await get_shard_router().scatter_gather(refresh)
+
+
+async def prune_idempotency_keys() -> int:
+    """
+    Удаление истекших ключей идемпотентности
+
+    :return: количество удаленных ключей
+    :rtype: int
+    """
+    return await get_idempotency().prune()
+
+
+async def prune_outbox() -> int:
+    """
+    Удаление обработанных исходящих событий старше OUTBOX_RETENTION
+
+    :return: количество удаленных событий
+    :rtype: int
+    """
+    async with AsyncSessionLocal() as session:
+        return await OutboxService(session).prune(settings.OUTBOX_RETENTION)
+
+
+# Планировщик задач процесса. Прогрев кеша токенов выполняется каждым процессом, остальные задачи - лидером.
+# Секции создаются и при старте: после простоя записи новых месяцев не должны копиться в секции по умолчанию
+scheduler: Scheduler = Scheduler(
+    get_redis_manager(),
+    [
+        Job("warm_token_cache", warm_token_cache, interval=60.0, jitter=5.0, singleton=False, run_at_start=True),
+        Job("create_mood_partitions", create_mood_partitions, cron="15 3 * * *", jitter=60.0, run_at_start=True),
+        Job("refresh_mood_statistics", refresh_mood_statistics, cron="45 3 * * *", jitter=60.0),
+        Job("prune_idempotency_keys", prune_idempotency_keys, interval=600.0, jitter=60.0),
+        Job("prune_outbox", prune_outbox, cron="30 4 * * *", jitter=60.0),
+    ],
+    LeaderElection(get_redis_manager(), LEADER_KEY, settings.SCHEDULER_LEADER_TTL),
+)
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Метод для зависимости получения планировщика задач
+
+    :return: планировщик задач
+    :rtype: Scheduler
+    """
+    return scheduler
@@ -0,0 +1,183 @@
+"""Модуль аренды ключа Redis для блокировок и выбора лидера"""
+
+__author__: str = "Digital Horizons"
+
+import os
+import time
+import uuid
+import socket
+import asyncio
+
+from redis import RedisError
+
+from dh_mood_tracker.db import RedisManager
+
+# Продление аренды, если ключ еще принадлежит владельцу. KEYS[1] - ключ, ARGV - владелец и время аренды в мс
+RENEW_SCRIPT: str = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Освобождение ключа, если он еще принадлежит владельцу. KEYS[1] - ключ, ARGV[1] - владелец
+RELEASE_SCRIPT: str = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    """
+    Аренда ключа Redis на время ttl: ключ захватывается SET NX PX и продлевается или освобождается
+    только владельцем. Процесс считает аренду своей не дольше ttl с последнего подтверждения Redis,
+    поэтому после потери связи или долгой паузы цикла событий аренда не считается действующей.
+    Ошибки Redis не пробрасываются: аренда считается потерянной
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar key: ключ аренды
+    :type key: str
+    :ivar _ttl: время аренды в секундах
+    :type _ttl: float
+    :ivar _owner: владелец: хост, процесс и случайная часть
+    :type _owner: str
+    :ivar _expires_at: момент окончания подтвержденной аренды по time.monotonic
+    :type _expires_at: float
+    """
+
+    def __init__(self, redis_manager: RedisManager, key: str, ttl: float) -> None:
+        """
+        Инициализация
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        :param key: ключ аренды
+        :type key: str
+        :param ttl: время аренды в секундах
+        :type ttl: float
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self.key: str = key
+        self._ttl: float = ttl
+        self._owner: str = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._expires_at: float = 0.0
+
+    @property
+    def held(self) -> bool:
+        """
+        Аренда действует
+
+        :return: аренда подтверждена Redis не раньше ttl назад
+        :rtype: bool
+        """
+        return time.monotonic() < self._expires_at
+
+    async def acquire(self) -> bool:
+        """
+        Захват или продление аренды
+
+        :return: аренда принадлежит процессу
+        :rtype: bool
+
+        .. code-block:: python
+            from dh_mood_tracker.scheduler import RedisLease
+
+            lease: RedisLease = RedisLease(get_redis_manager(), "scheduler:job:prune", ttl=300)
+            if await lease.acquire():
+                try:
+                    ...
+                finally:
+                    await lease.release()
+        """
+        started: float = time.monotonic()
+        milliseconds: int = int(self._ttl * 1000)
+
+        try:
+            client = self._redis_manager.get_client()
+            if self.held:
+                owned: bool = bool(await client.eval(RENEW_SCRIPT, 1, self.key, self._owner, milliseconds))
+            else:
+                owned = False
+            if not owned:
+                owned = bool(await client.set(self.key, self._owner, nx=True, px=milliseconds))
+        except RedisError as e:
+            print(f"Ошибка аренды ключа {self.key} в Redis: {e}")
+            owned = False
+
+        self._expires_at = started + self._ttl if owned else 0.0
+
+        return owned
+
+    async def release(self) -> None:
+        """Освобождение аренды, если она еще принадлежит процессу"""
+        self._expires_at = 0.0
+
+        try:
+            await self._redis_manager.get_client().eval(RELEASE_SCRIPT, 1, self.key, self._owner)
+        except RedisError as e:
+            print(f"Ошибка освобождения ключа {self.key} в Redis: {e}")
+
+
+class LeaderElection:
+    """
+    Выбор лидера среди реплик: лидер - владелец аренды ключа, продлеваемой каждую треть ttl.
+    После остановки или падения лидера его место занимает другая реплика не позже чем через ttl
+
+    :ivar lease: аренда ключа лидера
+    :type lease: RedisLease
+    """
+
+    def __init__(self, redis_manager: RedisManager, key: str, ttl: float) -> None:
+        """
+        Инициализация
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        :param key: ключ лидера
+        :type key: str
+        :param ttl: время аренды лидерства в секундах
+        :type ttl: float
+        """
+        self.lease: RedisLease = RedisLease(redis_manager, key, ttl)
+        self._interval: float = ttl / 3
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        """
+        Реплика - лидер
+
+        :return: аренда лидерства действует
+        :rtype: bool
+        """
+        return self.lease.held
+
+    async def start(self) -> None:
+        """Первая попытка стать лидером и запуск продления"""
+        if self._task is None:
+            await self.lease.acquire()
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Остановка продления и освобождение лидерства для других реплик"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self.is_leader:
+            await self.lease.release()
+
+    async def _loop(self) -> None:
+        """Продление или захват лидерства"""
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.lease.acquire()
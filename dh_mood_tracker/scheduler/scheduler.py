@@ -0,0 +1,234 @@
+"""Модуль планировщика периодических задач"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import random
+import asyncio
+from typing import Any, Callable, Awaitable
+from datetime import UTC, datetime
+from dataclasses import field, asdict, dataclass
+
+from dh_mood_tracker.db import RedisManager
+
+from .cron import CronSchedule
+from .lease import RedisLease, LeaderElection
+
+# Префикс ключей блокировок единственных задач в Redis
+LOCK_PREFIX: str = "scheduler:job"
+
+
+@dataclass(frozen=True)
+class Job:
+    """
+    Периодическая задача. Задается интервалом или расписанием cron
+
+    :cvar name: название задачи
+    :type name: str
+    :cvar func: задача
+    :type func: Callable[[], Awaitable[Any]]
+    :cvar interval: интервал между окончанием запуска и началом следующего в секундах
+    :type interval: float | None
+    :cvar cron: расписание cron по UTC
+    :type cron: str | None
+    :cvar jitter: максимальная случайная задержка запуска в секундах, чтобы реплики не запускали задачи одновременно
+    :type jitter: float
+    :cvar singleton: задача выполняется только лидером среди реплик. Иначе - каждым процессом
+    :type singleton: bool
+    :cvar run_at_start: первый запуск сразу после старта планировщика
+    :type run_at_start: bool
+    :cvar timeout: таймаут запуска в секундах. Для единственной задачи - и время ее блокировки
+    :type timeout: float
+    :cvar schedule: разобранное расписание cron
+    :type schedule: CronSchedule | None
+    """
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval: float | None = None
+    cron: str | None = None
+    jitter: float = 0.0
+    singleton: bool = True
+    run_at_start: bool = False
+    timeout: float = 300.0
+    schedule: CronSchedule | None = field(init=False, default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if (self.interval is None) == (self.cron is None):
+            raise ValueError(f"Для задачи {self.name} должен быть задан интервал или расписание cron")
+        if self.cron is not None:
+            object.__setattr__(self, "schedule", CronSchedule(self.cron))
+
+    def next_run(self, after: float) -> float:
+        """
+        Момент следующего запуска
+
+        :param after: момент окончания предыдущего запуска или старта планировщика по time.time
+        :type after: float
+        :return: момент запуска без задержки jitter по time.time
+        :rtype: float
+        """
+        if self.schedule is None:
+            return after + self.interval
+        return self.schedule.next_after(datetime.fromtimestamp(after, UTC)).timestamp()
+
+
+@dataclass
+class JobStats:
+    """
+    Метрики задачи
+
+    :cvar runs: успешных запусков
+    :type runs: int
+    :cvar failures: запусков с ошибкой или по таймауту
+    :type failures: int
+    :cvar skipped: пропущенных запусков: реплика не лидер или задача уже выполняется другой репликой
+    :type skipped: int
+    :cvar last_run_at: момент начала последнего запуска по time.time
+    :type last_run_at: float | None
+    :cvar last_duration_ms: длительность последнего запуска в миллисекундах
+    :type last_duration_ms: float | None
+    :cvar last_result: результат последнего успешного запуска
+    :type last_result: Any
+    :cvar last_error: текст последней ошибки
+    :type last_error: str | None
+    :cvar next_run_at: момент следующего запуска по time.time
+    :type next_run_at: float | None
+    """
+
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_run_at: float | None = None
+    last_duration_ms: float | None = None
+    last_result: Any = None
+    last_error: str | None = None
+    next_run_at: float | None = None
+
+
+class Scheduler:
+    """
+    Планировщик периодических задач в процессе приложения. Каждая задача выполняется в своем цикле,
+    поэтому запуски одной задачи в процессе не пересекаются: следующий запуск планируется после окончания
+    текущего, а пропущенные за время долгого запуска моменты расписания не накапливаются.
+    Единственные задачи выполняет только реплика-лидер и только под блокировкой задачи в Redis,
+    поэтому запуски не пересекаются и при смене лидера во время выполнения
+
+    !!! Важно - использовать через зависимость get_scheduler
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar _jobs: задачи
+    :type _jobs: list[Job]
+    :ivar leader: выбор лидера среди реплик
+    :type leader: LeaderElection
+    :ivar stats: метрики по названию задачи
+    :type stats: dict[str, JobStats]
+    """
+
+    def __init__(self, redis_manager: RedisManager, jobs: list[Job], leader: LeaderElection) -> None:
+        """
+        Инициализация
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        :param jobs: задачи
+        :type jobs: list[Job]
+        :param leader: выбор лидера среди реплик
+        :type leader: LeaderElection
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self._jobs: list[Job] = jobs
+        self.leader: LeaderElection = leader
+        self.stats: dict[str, JobStats] = {job.name: JobStats() for job in jobs}
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Выбор лидера, если есть единственные задачи, и запуск циклов задач. Вызывается в lifespan приложения"""
+        if self._tasks:
+            return
+
+        if any(job.singleton for job in self._jobs):
+            await self.leader.start()
+        self._tasks = [asyncio.create_task(self._loop(job)) for job in self._jobs]
+
+    async def stop(self) -> None:
+        """Отмена задач и освобождение лидерства. Вызывается в lifespan приложения"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        await self.leader.stop()
+
+    async def run(self, job: Job) -> bool:
+        """
+        Однократный запуск задачи с учетом лидерства и блокировки
+
+        :param job: задача
+        :type job: Job
+        :return: задача выполнена без ошибок. False - ошибка или запуск пропущен
+        :rtype: bool
+        """
+        stats: JobStats = self.stats[job.name]
+        lock: RedisLease | None = None
+
+        if job.singleton:
+            lock = RedisLease(self._redis_manager, f"{LOCK_PREFIX}:{job.name}", job.timeout)
+            if not self.leader.is_leader or not await lock.acquire():
+                stats.skipped += 1
+                return False
+
+        stats.last_run_at = time.time()
+        started: float = time.perf_counter()
+        error: str | None = None
+
+        try:
+            stats.last_result = await asyncio.wait_for(job.func(), job.timeout)
+        except asyncio.TimeoutError:
+            error = f"Превышен таймаут задачи {job.timeout} с"
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            error = f"{type(e).__name__}: {e}"[:1000]
+        finally:
+            stats.last_duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            if lock is not None:
+                await lock.release()
+
+        if error is None:
+            stats.runs += 1
+            return True
+
+        stats.failures += 1
+        stats.last_error = error
+        print(f"Ошибка задачи {job.name}: {error}")
+
+        return False
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: признак работы, лидерство реплики и метрики задач
+        :rtype: dict[str, Any]
+        """
+        return {
+            "running": bool(self._tasks),
+            "leader": self.leader.is_leader,
+            "jobs": {name: asdict(stats) for name, stats in self.stats.items()},
+        }
+
+    async def _loop(self, job: Job) -> None:
+        """
+        Запуски задачи по интервалу или расписанию
+
+        :param job: задача
+        :type job: Job
+        """
+        stats: JobStats = self.stats[job.name]
+        next_run: float = time.time() if job.run_at_start else job.next_run(time.time())
+
+        while True:
+            stats.next_run_at = next_run
+            await asyncio.sleep(max(0.0, next_run - time.time()) + random.uniform(0, job.jitter))
+            await self.run(job)
+            next_run = job.next_run(time.time())
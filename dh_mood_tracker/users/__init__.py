@@ -4,5 +4,5 @@ __author__: str = "Digital Horizons"
 
 from .routes import auth_routes, user_routes
 from .service import UserService, get_user_service
-from .dependency import get_user_data
+from .dependency import get_user_data, get_access_token, get_refresh_token
 from .subscribes import users_events_subscribe
@@ -0,0 +1,24 @@
+"""Константы пакета пользователей"""
+
+__author__: str = "Digital Horizons"
+
+from dh_mood_tracker.utils import RateLimit
+
+# Попытки входа с одного IP адреса
+LOGIN_BY_IP: RateLimit = RateLimit("login:ip", limit=20, period=60)
+# Попытки входа в один аккаунт
+LOGIN_BY_LOGIN: RateLimit = RateLimit("login:login", limit=5, period=60)
+# Регистрации с одного IP адреса
+REGISTER_BY_IP: RateLimit = RateLimit("register:ip", limit=5, period=600)
+# Регистрации на один адрес электронной почты
+REGISTER_BY_EMAIL: RateLimit = RateLimit("register:email", limit=3, period=600)
+# Подтверждения адреса электронной почты с одного IP адреса
+EMAIL_CONFIRM_BY_IP: RateLimit = RateLimit("email_confirm:ip", limit=10, period=60)
+# Обновления токенов с одного IP адреса
+REFRESH_BY_IP: RateLimit = RateLimit("refresh:ip", limit=30, period=60)
+
+# Ключ кеша первой страницы поиска пользователей: режим, размер страницы и строка поиска в нижнем регистре
+USER_SEARCH_CACHE_KEY: str = "users:search:{}:{}:{}"
+
+# Версия представления PublicUserData в ETag. Увеличивается при изменении схемы, чтобы сбросить кеш клиентов
+PUBLIC_USER_VERSION: str = "public_user:1"
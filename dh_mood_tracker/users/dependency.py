@@ -12,9 +12,10 @@ from dh_mood_tracker.utils import SupaBase, get_supabase
 from .model import User as UserModel
 from .service import UserService, get_user_service
 from .exceptions import NotValidUserData, NotValidAccessToken
+from .token_cache import TokenCache, get_token_cache
 
 
-def _get_access_token(request: Request) -> str | None:
+def get_access_token(request: Request) -> str | None:
     """
     Получение токена доступа из запроса
 
@@ -26,7 +27,7 @@ def _get_access_token(request: Request) -> str | None:
     return request.cookies.get("AccessToken")
 
 
-def _get_refresh_token(request: Request) -> str | None:
+def get_refresh_token(request: Request) -> str | None:
     """
     Получение токена обновления из запроса
 
@@ -39,13 +40,15 @@ def _get_refresh_token(request: Request) -> str | None:
 
 
 async def get_user_data(
-    access_token: str = Depends(_get_access_token),
-    refresh_token: str = Depends(_get_refresh_token),
+    access_token: str = Depends(get_access_token),
+    refresh_token: str = Depends(get_refresh_token),
     supabase: SupaBase = Depends(get_supabase),
     user_service: UserService = Depends(get_user_service),
+    token_cache: TokenCache = Depends(get_token_cache),
 ) -> UserModel:
     """
-    Получение данных пользователя по токену доступа
+    Получение данных пользователя по токену доступа.
+    Повторные запросы с тем же токеном обслуживаются из кеша без обращения к SupaBase и БД
 
     !!! Важно - использовать только через зависимость
 
@@ -53,7 +56,8 @@ async def get_user_data(
     :param refresh_token:
     :param supabase:
     :param user_service:
-    :return: данные пользователя
+    :param token_cache:
+    :return: данные пользователя. При попадании в кеш - не привязанные к сессии БД
     :rtype: UserModel
 
     .. code-block:: python
@@ -73,8 +77,11 @@ async def get_user_data(
     if not access_token or not refresh_token:
         raise NotValidAccessToken()
 
-    supabase.set_access_token(access_token, refresh_token)
-    supabase_data: Session | None = supabase.get_session_data()
+    if cached_user := await token_cache.get(access_token):
+        return cached_user
+
+    await supabase.set_access_token(access_token, refresh_token)
+    supabase_data: Session | None = await supabase.get_session_data()
 
     if not supabase_data:
         raise NotValidAccessToken()
@@ -86,4 +93,6 @@ async def get_user_data(
     if not user_data:
         raise NotValidUserData()
 
+    await token_cache.set(access_token, user_data)
+
     return user_data
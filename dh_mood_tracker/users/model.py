@@ -3,12 +3,16 @@
 __author__: str = "Digital Horizons"
 
 import uuid
+from datetime import datetime
 
-from sqlalchemy import UUID, String, Boolean
+from sqlalchemy import UUID, Index, String, Boolean, DateTime, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from dh_mood_tracker.db import BaseModel
 
+# Текст поиска пользователя. Выражение запроса должно совпадать с выражением индекса ix_users_search_trgm
+SEARCH_TEXT: str = "login || ' ' || name || ' ' || surname"
+
 
 class User(BaseModel):
     """
@@ -21,17 +25,35 @@ class User(BaseModel):
     :cvar patronymic: отчество
     :cvar is_active: признак активной записи
     :cvar supabase_id: UUID пользователя из SupaBase
+    :cvar updated_at: время последнего изменения. Версия данных для ETag и Last-Modified
     """
 
     __tablename__: str = "users"
-
-    email: Mapped[str] = mapped_column(String(50), unique=True, index=True)
-    login: Mapped[str] = mapped_column(String(50), unique=True, index=True)
-    name: Mapped[str] = mapped_column(String(50), unique=True, index=True)
-    surname: Mapped[str] = mapped_column(String(50), unique=True, index=True)
-    patronymic: Mapped[str | None] = mapped_column(String(50), unique=True, index=True, nullable=True)
+    __table_args__ = (
+        # Уникальность логина и email без учета регистра.
+        # Индекс логина - покрывающий индекс входа: email по логину читается из индекса без обращения к таблице.
+        # login включен в индекс, иначе PostgreSQL не выбирает сканирование только индекса по выражению
+        Index(
+            "ux_users_login_lower_email",
+            func.lower(text("login")),
+            unique=True,
+            postgresql_include=["login", "email"],
+        ),
+        Index("ux_users_email_lower", func.lower(text("email")), unique=True),
+        # Триграммный индекс поиска по подстроке и нечеткого поиска (расширение pg_trgm)
+        Index("ix_users_search_trgm", text(f"({SEARCH_TEXT}) gin_trgm_ops"), postgresql_using="gin"),
+    )
+
+    email: Mapped[str] = mapped_column(String(50))
+    login: Mapped[str] = mapped_column(String(50))
+    name: Mapped[str] = mapped_column(String(50))
+    surname: Mapped[str] = mapped_column(String(50))
+    patronymic: Mapped[str | None] = mapped_column(String(50), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     supabase_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False, index=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
 
     @property
     def full_name(self) -> str:
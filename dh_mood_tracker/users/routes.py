@@ -2,15 +2,23 @@
 
 __author__: str = "Digital Horizons"
 
-from fastapi import Depends, Response, APIRouter
+from typing import Any
 
-from dh_mood_tracker.utils import SupaBase, get_supabase, email_validator
+from fastapi import Query, Depends, Request, Response, APIRouter
+from fastapi.responses import ORJSONResponse
 
+from dh_mood_tracker.db import RedisManager, get_redis_manager
+from dh_mood_tracker.core import settings, make_etag, schema_response, conditional_response
+from dh_mood_tracker.utils import SupaBase, RateLimiter, IdempotentRequest, idempotent, get_supabase, email_validator
+from dh_mood_tracker.utils.rate_limit import get_client_ip, get_rate_limiter, rate_limit_by_ip
+
+from . import consts
 from .model import User as UserModel
-from .schemas import UserLogin, PublicUserData, CreateInUserSchema
+from .schemas import UserLogin, PublicUserData, UserSearchPage, CreateInUserSchema
 from .service import UserService, get_user_service
-from .dependency import get_user_data
-from .exceptions import IncorrectEmail, UserExistByEmail, UserExistByLogin, UserNotFoundByLogin
+from .dependency import get_user_data, get_access_token, get_refresh_token
+from .exceptions import IncorrectEmail, UserExistByEmail, UserExistByLogin, NotValidAccessToken, UserNotFoundByLogin
+from .token_cache import TokenCache, get_token_cache
 
 # Роутинг работы с пользователями
 user_routes: APIRouter = APIRouter(prefix="/users", tags=["users"])
@@ -24,50 +32,150 @@ async def user_login(
     login_data: UserLogin,
     user_service: UserService = Depends(get_user_service),
     supabase: SupaBase = Depends(get_supabase),
+    client_ip: str = Depends(get_client_ip),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
 ) -> bool:
     """Аутентификация пользователя"""
+    # Отсекаем подбор пароля до обращения к БД и SupaBase
+    await rate_limiter.hit((consts.LOGIN_BY_IP, client_ip), (consts.LOGIN_BY_LOGIN, login_data.login))
+
     # Так как SupaBase принимает на вход email пользователя -
     # сначала найдем его по логину, а уже потом сходим в SupaBase
-    if not (user_data_db := await user_service.read_by_login(login_data.login)):
+    if not (email := await user_service.read_email_by_login(login_data.login)):
         raise UserNotFoundByLogin(login_data.login)
 
-    return supabase.login(user_data_db.email, login_data.password, response)
+    return await supabase.login(email, login_data.password, response)
 
 
-@auth_routes.post("/register", description="Регистрация нового пользователя")
+@auth_routes.post("/register", description="Регистрация нового пользователя", response_model=bool)
 async def user_register(
     user_data_in: CreateInUserSchema,
     user_service: UserService = Depends(get_user_service),
     supabase: SupaBase = Depends(get_supabase),
+    client_ip: str = Depends(get_client_ip),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+    request: IdempotentRequest = Depends(idempotent("register")),
+) -> Response:
+    """Регистрация нового пользователя. Повтор с тем же заголовком Idempotency-Key получает сохраненный ответ"""
+
+    async def register() -> bool:
+        # Повторы с ключом идемпотентности не доходят сюда и не расходуют лимит
+        await rate_limiter.hit((consts.REGISTER_BY_IP, client_ip), (consts.REGISTER_BY_EMAIL, user_data_in.email))
+
+        # Проверим, что email похож на него
+        if not email_validator(user_data_in.email):
+            raise IncorrectEmail()
+
+        # Посмотрим, что у нас уже не используется данный email
+        if await user_service.read_by_email(user_data_in.email):
+            raise UserExistByEmail()
+
+        # Что нет такого же логина
+        if await user_service.read_by_login(user_data_in.login):
+            raise UserExistByLogin()
+
+        # Создадим пользователя в SupaBase и по событию создадим локального пользователя
+        await supabase.create_user(user_data_in.email, user_data_in.password, user_data_in.model_dump())
+
+        return True
+
+    return await request.run(user_data_in.model_dump(), register)
+
+
+@auth_routes.post("/logout", description="Выход пользователя")
+async def user_logout(
+    response: Response,
+    access_token: str | None = Depends(get_access_token),
+    supabase: SupaBase = Depends(get_supabase),
+    token_cache: TokenCache = Depends(get_token_cache),
 ) -> bool:
-    """Регистрация нового пользователя"""
-    # Проверим, что email похож на него
-    if not email_validator(user_data_in.email):
-        raise IncorrectEmail()
+    """Выход пользователя"""
+    if not access_token:
+        raise NotValidAccessToken()
 
-    # Посмотрим, что у нас уже не используется данный email
-    if await user_service.read_by_email(user_data_in.email):
-        raise UserExistByEmail()
+    await token_cache.evict(access_token)
 
-    # Что нет такого же логина
-    if await user_service.read_by_login(user_data_in.login):
-        raise UserExistByLogin()
+    return await supabase.logout(access_token, response)
 
-    # Создадим пользователя в SupaBase и по событию создадим локального пользователя
-    await supabase.create_user(user_data_in.email, user_data_in.password, user_data_in.model_dump())
 
-    return True
+@auth_routes.post("/refresh", description="Обновление токенов доступа")
+async def user_refresh(
+    response: Response,
+    access_token: str | None = Depends(get_access_token),
+    refresh_token: str | None = Depends(get_refresh_token),
+    supabase: SupaBase = Depends(get_supabase),
+    client_ip: str = Depends(get_client_ip),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+    token_cache: TokenCache = Depends(get_token_cache),
+) -> bool:
+    """Обновление токенов доступа"""
+    await rate_limiter.hit((consts.REFRESH_BY_IP, client_ip))
 
+    if not refresh_token:
+        raise NotValidAccessToken()
 
-@auth_routes.post("/me", description="Получение информации о текущем пользователе", response_model=PublicUserData)
-def user_data(user: UserModel = Depends(get_user_data)):
-    """Получение информации о текущем пользователе"""
-    return user
+    # Старый токен доступа заменяется новым, запись по нему больше не нужна
+    if access_token:
+        await token_cache.evict(access_token)
 
+    return bool(await supabase.refresh(refresh_token, response))
 
-@user_routes.get("/email_confirm", description="Подтверждения адрес электронной почты")
-def email_confirm(access_token: str, supabase: SupaBase = Depends(get_supabase)) -> bool:
+
+@auth_routes.post("/me", description="Получение информации о текущем пользователе", response_model=PublicUserData)
+def user_data(user: UserModel = Depends(get_user_data)) -> Response:
+    """Получение информации о текущем пользователе"""
+    return schema_response(user, PublicUserData)
+
+
+@auth_routes.get("/me", description="Получение информации о текущем пользователе", response_model=PublicUserData)
+def user_data_get(request: Request, user: UserModel = Depends(get_user_data)) -> Response:
+    """
+    Получение информации о текущем пользователе с условным запросом: при неизменном пользователе
+    по If-None-Match или If-Modified-Since возвращается 304 без тела
+    """
+    if user.updated_at is None:
+        return schema_response(user, PublicUserData)
+
+    return conditional_response(
+        request,
+        make_etag(consts.PUBLIC_USER_VERSION, user.id, user.updated_at.isoformat()),
+        lambda: schema_response(user, PublicUserData),
+        last_modified=user.updated_at,
+    )
+
+
+@user_routes.get(
+    "/email_confirm",
+    description="Подтверждения адрес электронной почты",
+    dependencies=[Depends(rate_limit_by_ip(consts.EMAIL_CONFIRM_BY_IP))],
+)
+async def email_confirm(access_token: str, supabase: SupaBase = Depends(get_supabase)) -> bool:
     """Подтверждения адрес электронной почты"""
-    supabase.confirm_email(access_token)
+    await supabase.confirm_email(access_token)
 
     return True
+
+
+@user_routes.get("/search", description="Поиск пользователей по логину, имени и фамилии", response_model=UserSearchPage)
+async def user_search(
+    q: str = Query(..., min_length=3, max_length=50, description="строка поиска"),
+    fuzzy: bool = Query(False, description="нечеткий поиск с опечатками"),
+    after: int | None = Query(None, description="next_after предыдущей страницы"),
+    limit: int = Query(20, ge=1, le=100, description="размер страницы"),
+    user_service: UserService = Depends(get_user_service),
+    redis_manager: RedisManager = Depends(get_redis_manager),
+    _: UserModel = Depends(get_user_data),
+) -> Response:
+    """Поиск пользователей. Первые страницы коротких запросов, набираемых чаще всего, берутся из кеша"""
+    cache_key: str | None = None
+    if after is None and len(q) <= settings.USER_SEARCH_CACHE_PREFIX_LENGTH:
+        cache_key = consts.USER_SEARCH_CACHE_KEY.format("fuzzy" if fuzzy else "substring", limit, q.lower())
+        if (cached := await redis_manager.get_json(cache_key)) is not None:
+            return ORJSONResponse(cached)
+
+    page: dict[str, Any] = await user_service.search(q, fuzzy, after, limit)
+
+    if cache_key:
+        await redis_manager.set_json(cache_key, page, settings.USER_SEARCH_CACHE_TTL)
+
+    return ORJSONResponse(page)
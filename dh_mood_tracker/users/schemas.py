@@ -49,12 +49,49 @@ class CreateInUserSchema(UserLogin, PublicUserData):
     ...
 
 
-class CreateItemSchema(CreateInUserSchema):
+class CreateItemSchema(PublicUserData):
     """
-    Схема данных для записи пользователя в БД
+    Схема данных для записи пользователя в БД. Пароль хранится только в SupaBase
 
+    :cvar login: логин пользователя
+    :type login: str
     :cvar supabase_id: UUID записи пользователя в SupaBase
     :type supabase_id: UUID
     """
 
+    login: str = Field(..., max_length=50, min_length=4)
     supabase_id: UUID
+
+
+class UserSearchItem(BaseSchema):
+    """
+    Пользователь в результатах поиска
+
+    :cvar id: идентификатор пользователя
+    :type id: int
+    :cvar login: логин пользователя
+    :type login: str
+    :cvar name: имя пользователя
+    :type name: str
+    :cvar surname: фамилия пользователя
+    :type surname: str
+    """
+
+    id: int
+    login: str
+    name: str
+    surname: str
+
+
+class UserSearchPage(BaseSchema):
+    """
+    Страница результатов поиска пользователей
+
+    :cvar items: пользователи страницы по возрастанию идентификатора
+    :type items: list[UserSearchItem]
+    :cvar next_after: значение after для следующей страницы или None - если страница последняя
+    :type next_after: int | None
+    """
+
+    items: list[UserSearchItem]
+    next_after: int | None = None
@@ -4,18 +4,26 @@ __author__: str = "Digital Horizons"
 
 import uuid
 from uuid import UUID
+from typing import Any
 
 from fastapi import Depends
+from sqlalchemy import func, select, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dh_mood_tracker.db import get_db_session
 from dh_mood_tracker.core import BaseService
 from dh_mood_tracker.events.supabase import SupaBaseUserCreate
 
+from .model import SEARCH_TEXT
 from .model import User as UserModel
 from .schemas import CreateItemSchema
 
 
+def _escape_like(value: str) -> str:
+    """Экранирование спецсимволов шаблона LIKE"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class UserService(BaseService[UserModel, CreateItemSchema]):
     """Модуль сервиса пользователя"""
 
@@ -23,7 +31,7 @@ class UserService(BaseService[UserModel, CreateItemSchema]):
 
     async def read_by_login(self, login: str) -> UserModel | None:
         """
-        Чтение пользователя по логину
+        Чтение пользователя по логину без учета регистра, как в уникальном индексе ux_users_login_lower_email
 
         :param login: логин пользователя
         :type login: str
@@ -33,23 +41,43 @@ class UserService(BaseService[UserModel, CreateItemSchema]):
             from dh_mood_tracker.utils import SupaBase, get_supabase
             from dh_mood_tracker.users import UserService, get_user_service
 
-            @auth_routes.post("/login", description="Аутентификация пользователя")
-            async def user_login(
-                response: Response,
-                login_data: UserLogin,
+            @auth_routes.post("/register", description="Регистрация нового пользователя")
+            async def user_register(
+                user_data: CreateInUserSchema,
                 user_service: UserService = Depends(get_user_service),
                 supabase: SupaBase = Depends(get_supabase),
             ) -> bool:
-                if not (user_data := await user_service.read_by_login(login_data.login)):
-                    raise UserNotFoundByLogin(login_data.login)
+                if await user_service.read_by_login(user_data.login):
+                    raise UserExistByLogin()
+
+                return True
+        """
+        return await self.session_db.scalar(select(UserModel).where(func.lower(UserModel.login) == login.lower()))
+
+    async def read_email_by_login(self, login: str) -> str | None:
+        """
+        Чтение только адреса электронной почты по логину без учета регистра для входа через SupaBase.
+        Выполняется сканированием только индекса ux_users_login_lower_email без чтения строки таблицы
+
+        :param login: логин пользователя
+        :type login: str
+        :return: адрес электронной почты или None - если пользователь не найден
+        :rtype: str | None
+
+        .. code-block:: python
+            from dh_mood_tracker.users import UserService, get_user_service
 
-                return supabase.login(user_data.email, login_data.password, response)
+            if not (email := await user_service.read_email_by_login(login_data.login)):
+                raise UserNotFoundByLogin(login_data.login)
+
+            return await supabase.login(email, login_data.password, response)
         """
-        return await self.scalar_or_none(login=login)
+        return await self.session_db.scalar(select(UserModel.email).where(func.lower(UserModel.login) == login.lower()))
 
     async def read_by_email(self, email: str) -> UserModel | None:
         """
-        Чтение пользователя по адресу электронной почты
+        Чтение пользователя по адресу электронной почты без учета регистра,
+        как в уникальном индексе ux_users_email_lower
 
         :param email: адрес электронной почты
         :type email: str
@@ -73,7 +101,7 @@ class UserService(BaseService[UserModel, CreateItemSchema]):
 
                 return True
         """
-        return await self.scalar_or_none(email=email)
+        return await self.session_db.scalar(select(UserModel).where(func.lower(UserModel.email) == email.lower()))
 
     async def read_by_supabase_id(self, supabase_id: UUID) -> UserModel | None:
         """
@@ -100,15 +128,59 @@ class UserService(BaseService[UserModel, CreateItemSchema]):
         """
         return await self.scalar_or_none(supabase_id=supabase_id)
 
+    async def search(
+        self, query: str, fuzzy: bool = False, after: int | None = None, limit: int = 20
+    ) -> dict[str, Any]:
+        """
+        Поиск активных пользователей по логину, имени и фамилии с постраничным выводом по ключу.
+        Поиск по подстроке (ILIKE) и нечеткий поиск по сходству слов (оператор %> pg_trgm) используют
+        триграммный индекс ix_users_search_trgm. Страницы выбираются по условию id > after без OFFSET,
+        поэтому глубокие страницы не дороже первой
+
+        :param query: строка поиска, не короче 3 символов: по более коротким строкам триграммы не строятся
+        :type query: str
+        :param fuzzy: нечеткий поиск с опечатками вместо поиска по подстроке
+        :type fuzzy: bool
+        :param after: идентификатор последнего пользователя предыдущей страницы
+        :type after: int | None
+        :param limit: размер страницы
+        :type limit: int
+        :return: страница в формате UserSearchPage
+        :rtype: dict[str, Any]
+
+        .. code-block:: python
+            from dh_mood_tracker.users import UserService, get_user_service
+
+            page: dict[str, Any] = await user_service.search("ivan", after=page["next_after"])
+        """
+        search_text = literal_column(f"({SEARCH_TEXT})")
+        condition = search_text.op("%>")(query) if fuzzy else search_text.ilike(f"%{_escape_like(query)}%", escape="\\")
+        statement = (
+            select(UserModel.id, UserModel.login, UserModel.name, UserModel.surname)
+            .where(condition, UserModel.is_active.is_(True))
+            .order_by(UserModel.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            statement = statement.where(UserModel.id > after)
+
+        rows: list[dict[str, Any]] = [dict(row) for row in (await self.session_db.execute(statement)).mappings()]
+
+        return {"items": rows[:limit], "next_after": rows[limit - 1]["id"] if len(rows) > limit else None}
+
     async def create_user_by_supabase(self, event: SupaBaseUserCreate) -> None:
         """
-        Создание пользователя из события создания в SupaBase
+        Создание пользователя из события создания в SupaBase.
+        Идемпотентно: событие из outbox может быть доставлено повторно, существующий пользователь не создается
 
         :param event: событие о создании в SupaBase
         :type event: SupaBaseUserCreate
         """
         event_data: dict = event.to_dict().get("data") or {}
         user_data: dict = event_data.get("UserData") or {}
+
+        if "SupaBaseUuid" in event_data and await self.read_by_supabase_id(event_data["SupaBaseUuid"]):
+            return
         user_db_data: CreateItemSchema = CreateItemSchema(
             supabase_id=event_data.get("SupaBaseUuid", uuid.uuid4()),
             email=user_data.get("email", ""),
@@ -116,7 +188,6 @@ class UserService(BaseService[UserModel, CreateItemSchema]):
             surname=user_data.get("surname", ""),
             patronymic=user_data.get("patronymic", ""),
             login=user_data.get("login", ""),
-            password=user_data.get("password", ""),
         )
         await self.create(user_db_data)
 
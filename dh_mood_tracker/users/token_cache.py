@@ -0,0 +1,250 @@
+"""Модуль кеша пользователей по токену доступа"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import base64
+import hashlib
+from uuid import UUID
+from typing import Any
+from datetime import datetime
+
+from dh_mood_tracker.db import RedisManager, get_redis_manager
+from dh_mood_tracker.core import dumps, loads, settings
+from dh_mood_tracker.utils import LocalCache, CacheInvalidator, get_cache_invalidator
+
+from .model import User as UserModel
+
+# Префикс ключей кеша токенов в Redis
+KEY_PREFIX: str = "auth_token"
+# Хеши недавно закешированных токенов по времени сохранения: по ним прогревается кеш в памяти процессов
+RECENT_KEY: str = f"{KEY_PREFIX}:recent"
+
+
+def _token_hash(access_token: str) -> str:
+    """
+    Хеш токена доступа. Сам токен в кеше не хранится
+
+    :param access_token: токен доступа
+    :type access_token: str
+    :return: хеш токена
+    :rtype: str
+    """
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def _token_expires_at(access_token: str) -> float | None:
+    """
+    Момент истечения токена доступа из поля exp JWT. Подпись не проверяется:
+    токен уже проверен SupaBase, exp нужен только для ограничения времени жизни записи
+
+    :param access_token: токен доступа
+    :type access_token: str
+    :return: момент истечения в секундах Unix или None - если токен не разобран
+    :rtype: float | None
+    """
+    try:
+        payload: str = access_token.split(".")[1]
+        claims: dict[str, Any] = loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _user_tag(user_id: int) -> str:
+    """Тег записей пользователя"""
+    return f"user:{user_id}"
+
+
+def _dump_user(user: UserModel) -> dict[str, Any]:
+    """Колонки пользователя в виде словаря для JSON"""
+    data: dict[str, Any] = {column.key: getattr(user, column.key) for column in UserModel.__table__.columns}
+    data["supabase_id"] = str(data["supabase_id"])
+    return data
+
+
+def _load_user(data: dict[str, Any]) -> UserModel:
+    """Пользователь, не привязанный к сессии БД, из словаря колонок"""
+    user: UserModel = UserModel(**{**data, "supabase_id": UUID(data["supabase_id"])})
+    # Записи, сохраненные до появления updated_at, остаются без версии до истечения
+    if isinstance(user.updated_at, str):
+        user.updated_at = datetime.fromisoformat(user.updated_at)
+    return user
+
+
+class TokenCache:
+    """
+    Кеш пользователя по хешу токена доступа: в памяти процесса и в Redis.
+    Время жизни записи не превышает срок действия токена.
+    Удаление записей в памяти процесса рассылается всем воркерам через CacheInvalidator
+
+    !!! Важно - использовать через зависимость get_token_cache
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar _local: кеш в памяти процесса, зарегистрированный в _invalidator под именем KEY_PREFIX
+    :type _local: LocalCache
+    :ivar _invalidator: удаление записей кеша во всех воркерах
+    :type _invalidator: CacheInvalidator
+    """
+
+    def __init__(self, redis_manager: RedisManager, local: LocalCache, invalidator: CacheInvalidator) -> None:
+        """
+        Инициализация кеша
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        :param local: кеш в памяти процесса
+        :type local: LocalCache
+        :param invalidator: удаление записей кеша во всех воркерах
+        :type invalidator: CacheInvalidator
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self._local: LocalCache = invalidator.register(KEY_PREFIX, local)
+        self._invalidator: CacheInvalidator = invalidator
+
+    async def get(self, access_token: str) -> UserModel | None:
+        """
+        Получение пользователя по токену доступа
+
+        :param access_token: токен доступа
+        :type access_token: str
+        :return: пользователь, не привязанный к сессии БД, или None - если токена нет в кеше
+
+        .. code-block:: python
+            from dh_mood_tracker.users.token_cache import TokenCache, get_token_cache
+
+            async def get_user_data(access_token: str, token_cache: TokenCache = Depends(get_token_cache)):
+                if user := await token_cache.get(access_token):
+                    return user
+        """
+        token_hash: str = _token_hash(access_token)
+
+        if (entry := self._local.get(token_hash)) is None:
+            if (entry := await self._redis_manager.get_json(f"{KEY_PREFIX}:{token_hash}")) is None:
+                return None
+            self._local.set(token_hash, entry, self._local_ttl(entry["expires_at"]), [_user_tag(entry["user_id"])])
+
+        return _load_user(entry["user"])
+
+    async def set(self, access_token: str, user: UserModel) -> None:
+        """
+        Сохранение пользователя по токену доступа. Истекший или неразобранный токен не кешируется
+
+        :param access_token: токен доступа
+        :type access_token: str
+        :param user: пользователь токена
+        :type user: UserModel
+        """
+        if (expires_at := _token_expires_at(access_token)) is None:
+            return
+
+        ttl: int = int(min(settings.TOKEN_CACHE_TTL, expires_at - time.time()))
+        if ttl <= 0:
+            return
+
+        token_hash: str = _token_hash(access_token)
+        entry: dict[str, Any] = {
+            "supabase_id": str(user.supabase_id),
+            "user_id": user.id,
+            "user": _dump_user(user),
+            "expires_at": time.time() + ttl,
+        }
+
+        self._local.set(token_hash, entry, self._local_ttl(entry["expires_at"]), [_user_tag(user.id)])
+
+        # Индекс токенов пользователя нужен для удаления всех его записей при изменении пользователя
+        user_index: str = f"{KEY_PREFIX}:{_user_tag(user.id)}"
+        async with self._redis_manager.pipeline() as pipe:
+            pipe.setex(f"{KEY_PREFIX}:{token_hash}", ttl, dumps(entry))
+            pipe.sadd(user_index, token_hash)
+            pipe.expire(user_index, settings.TOKEN_CACHE_TTL)
+            pipe.zadd(RECENT_KEY, {token_hash: time.time()})
+
+    async def evict(self, access_token: str) -> None:
+        """
+        Удаление токена из кеша при выходе или обновлении токена
+
+        :param access_token: токен доступа
+        :type access_token: str
+        """
+        token_hash: str = _token_hash(access_token)
+
+        self._invalidator.invalidate(KEY_PREFIX, keys=[token_hash])
+        await self._redis_manager.delete_key(f"{KEY_PREFIX}:{token_hash}")
+
+    async def evict_user(self, user_id: int) -> None:
+        """
+        Удаление всех токенов пользователя из кеша при изменении его данных
+
+        :param user_id: идентификатор пользователя
+        :type user_id: int
+
+        .. code-block:: python
+            from dh_mood_tracker.users.token_cache import TokenCache, get_token_cache
+
+            async def update_user(user_id: int, token_cache: TokenCache = Depends(get_token_cache)):
+                ...
+                await token_cache.evict_user(user_id)
+        """
+        user_index: str = f"{KEY_PREFIX}:{_user_tag(user_id)}"
+
+        self._invalidator.invalidate(KEY_PREFIX, tags=[_user_tag(user_id)])
+
+        token_hashes: set = await self._redis_manager.get_set_members(user_index)
+        async with self._redis_manager.pipeline() as pipe:
+            pipe.delete(user_index, *(f"{KEY_PREFIX}:{token_hash}" for token_hash in token_hashes))
+
+    async def warm(self, limit: int) -> int:
+        """
+        Прогрев кеша в памяти процесса токенами недавно активных пользователей из Redis.
+        После запуска процесса первые запросы пользователей не обращаются в Redis за своими токенами
+
+        :param limit: максимальное количество токенов
+        :type limit: int
+        :return: количество загруженных токенов
+        :rtype: int
+        """
+        since: float = time.time() - settings.TOKEN_CACHE_TTL
+        results: list = []
+
+        async with self._redis_manager.pipeline() as pipe:
+            pipe.zremrangebyscore(RECENT_KEY, "-inf", since)
+            pipe.zrevrangebyscore(RECENT_KEY, "+inf", since, start=0, num=limit)
+            results = await pipe.execute()
+        if not results:
+            return 0
+
+        token_hashes: list[str] = [token_hash for token_hash in results[1] if self._local.get(token_hash) is None]
+
+        entries: list[dict | None] = await self._redis_manager.get_many_json(
+            [f"{KEY_PREFIX}:{token_hash}" for token_hash in token_hashes]
+        )
+        warmed: int = 0
+        for token_hash, entry in zip(token_hashes, entries):
+            if entry is not None and self._local_ttl(entry["expires_at"]) > 0:
+                self._local.set(token_hash, entry, self._local_ttl(entry["expires_at"]), [_user_tag(entry["user_id"])])
+                warmed += 1
+
+        return warmed
+
+    @staticmethod
+    def _local_ttl(expires_at: float) -> float:
+        """Время жизни записи в памяти процесса"""
+        return min(settings.TOKEN_CACHE_LOCAL_TTL, expires_at - time.time())
+
+
+# Глобальный экземпляр кеша токенов
+token_cache: TokenCache = TokenCache(
+    get_redis_manager(), LocalCache(settings.TOKEN_CACHE_LOCAL_SIZE), get_cache_invalidator()
+)
+
+
+def get_token_cache() -> TokenCache:
+    """
+    Метод для зависимости получения кеша пользователей по токену доступа
+
+    :return: кеш пользователей по токену доступа
+    :rtype: TokenCache
+    """
+    return token_cache
@@ -3,6 +3,11 @@
 __author__: str = "Digital Horizons"
 
 from .cache import cache_result, invalidate_cache_pattern
-from .supabase import SupaBase, get_supabase
+from .supabase import SupaBase, get_supabase, get_supabase_resilience
 from .event_bus import EventBus, get_event_bus
+from .rate_limit import RateLimit, RateLimiter, get_client_ip, get_rate_limiter, rate_limit_by_ip
+from .resilience import Resilience, CircuitState, CircuitBreaker, ResiliencePolicy
 from .validators import email_validator
+from .idempotency import Idempotency, IdempotentRequest, idempotent, get_idempotency
+from .local_cache import LocalCache
+from .invalidation import CacheInvalidator, get_cache_invalidator
@@ -4,7 +4,7 @@ __author__: str = "Digital Horizons"
 
 from redis import RedisError
 
-from dh_mood_tracker.db import RedisManager
+from dh_mood_tracker.db import get_redis_manager
 
 
 def cache_result(key_pattern: str, expire_seconds: int = 300):
@@ -31,7 +31,7 @@ def cache_result(key_pattern: str, expire_seconds: int = 300):
             cache_key = key_pattern.format(*args, **kwargs)
 
             # Попытка получить из кэша
-            redis_manager = RedisManager()
+            redis_manager = get_redis_manager()
             cached_result = await redis_manager.get_json(cache_key)
             if cached_result is not None:
                 return cached_result
@@ -55,7 +55,7 @@ async def invalidate_cache_pattern(pattern: str) -> None:
     :type pattern: str
     """
     try:
-        redis_manager = RedisManager()
+        redis_manager = get_redis_manager()
         client = redis_manager.get_client()
         keys = await client.keys(pattern)
 
@@ -7,7 +7,8 @@ from typing import Type
 from dh_mood_tracker.core import BaseAppException
 
 from .exceptions import TooManySupaBaseRequest
-from ..users.exceptions import IncorrectEmail, EmailNotConfirmed
+from .resilience import ResiliencePolicy
+from ..users.exceptions import IncorrectEmail, EmailNotConfirmed, NotValidAccessToken
 
 # Паттерн для валидации электронной почты
 EMAIL_PATTERN: str = r"^(?!\.)(?!.*\.\.)([A-Za-z0-9\._%+-]+)@([A-Za-z0-9.-]+\.[A-Za-z]{2,})$"
@@ -17,4 +18,19 @@ EXCEPTION_MESSAGE_MAP: dict[str, Type[BaseAppException]] = {
     r"^Email address \"(.*)\" is invalid": IncorrectEmail,
     r"For security purposes, you can only request this after (.*) seconds.": TooManySupaBaseRequest,
     r"Email not confirmed": EmailNotConfirmed,
+    r"Invalid Refresh Token": NotValidAccessToken,
+}
+
+# Политики устойчивости вызовов SupaBase по операции.
+# Повторяются только идемпотентные операции: повтор sign_up или verify может создать дубль или сжечь токен,
+# повтор set_session или refresh после таймаута - отправить уже замененный refresh-токен и завершить сессию
+SUPABASE_POLICIES: dict[str, ResiliencePolicy] = {
+    "sign_up": ResiliencePolicy(max_concurrency=10, timeout=10.0),
+    "sign_in": ResiliencePolicy(max_concurrency=30, timeout=5.0, retries=1, idempotent=True),
+    "verify": ResiliencePolicy(max_concurrency=10, timeout=5.0),
+    "set_session": ResiliencePolicy(max_concurrency=50, timeout=3.0),
+    "get_session": ResiliencePolicy(max_concurrency=50, timeout=3.0),
+    "sign_out": ResiliencePolicy(max_concurrency=20, timeout=3.0, retries=1, idempotent=True),
+    "refresh": ResiliencePolicy(max_concurrency=30, timeout=5.0),
+    "list_users": ResiliencePolicy(max_concurrency=10, timeout=30.0, retries=3, idempotent=True, acquire_timeout=60.0),
 }
@@ -74,8 +74,20 @@ class EventBus:
             event_bus.publish(SupaBaseUserCreate(UUID(supabase_data.user.id), other_data))
         """
         print(f'✅ Публикация события "{event.event_type}"')
+        await self.dispatch(event, self._db_session)
+
+    async def dispatch(self, event: BaseEvent, db_session: AsyncSession) -> None:
+        """
+        Запуск обработчиков события с переданной сессией БД.
+        Используется OutboxRelay: изменения обработчиков фиксируются в транзакции отметки об обработке события
+
+        :param event: экземпляр события
+        :type event: BaseEvent
+        :param db_session: сессия подключения к БД
+        :type db_session: AsyncSession
+        """
         for handler in self._handlers[event.event_type]:
-            await handler(event, self._db_session)
+            await handler(event, db_session)
 
 
 # Глобальный экземпляр шины событий
@@ -12,3 +12,58 @@ class TooManySupaBaseRequest(BaseAppException):
 
     _CODE: int = status.HTTP_429_TOO_MANY_REQUESTS
     _DETAIL: str = "Превышен лимит запросов к SupaBase"
+
+
+class TooManyRequests(BaseAppException):
+    """Исключение превышения ограничения частоты запросов к приложению"""
+
+    _CODE: int = status.HTTP_429_TOO_MANY_REQUESTS
+    _DETAIL: str = "Слишком много запросов. Повторите попытку позже"
+
+    def __init__(self, retry_after: int) -> None:
+        """
+        Инициализация исключения
+
+        :param retry_after: через сколько секунд можно повторить запрос
+        :type retry_after: int
+        """
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class ServiceUnavailable(BaseAppException):
+    """Исключение недоступности внешнего сервиса: разомкнут предохранитель, превышен таймаут или лимит вызовов"""
+
+    _CODE: int = status.HTTP_503_SERVICE_UNAVAILABLE
+    _DETAIL: str = "Внешний сервис временно недоступен"
+
+
+class IdempotencyKeyInvalid(BaseAppException):
+    """Исключение некорректного ключа идемпотентности"""
+
+    _CODE: int = status.HTTP_400_BAD_REQUEST
+    _DETAIL: str = "Некорректный заголовок Idempotency-Key"
+
+
+class IdempotencyKeyReused(BaseAppException):
+    """Исключение повторного использования ключа идемпотентности с другим запросом"""
+
+    _CODE: int = status.HTTP_422_UNPROCESSABLE_CONTENT
+    _DETAIL: str = "Ключ идемпотентности уже использован с другим запросом"
+
+
+class IdempotentRequestInProgress(BaseAppException):
+    """Исключение незавершенной обработки запроса с тем же ключом идемпотентности"""
+
+    _CODE: int = status.HTTP_409_CONFLICT
+    _DETAIL: str = "Запрос с этим ключом идемпотентности еще обрабатывается"
+
+    def __init__(self, retry_after: int) -> None:
+        """
+        Инициализация исключения
+
+        :param retry_after: через сколько секунд можно повторить запрос
+        :type retry_after: int
+        """
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
@@ -0,0 +1,305 @@
+"""Модуль идемпотентной обработки запросов по заголовку Idempotency-Key на Redis"""
+
+__author__: str = "Digital Horizons"
+
+import hmac
+import time
+import uuid
+import asyncio
+import hashlib
+from typing import Any, Callable, Awaitable, Coroutine
+from dataclasses import dataclass
+
+from redis import RedisError
+from fastapi import Header, Depends, Response
+from redis.commands.core import AsyncScript
+
+from dh_mood_tracker.db import RedisManager, get_redis_manager
+from dh_mood_tracker.core import dumps, loads, settings, dumps_str
+
+from .exceptions import IdempotencyKeyReused, IdempotencyKeyInvalid, IdempotentRequestInProgress
+
+# Захват ключа: возвращает сохраненную запись или, если ее нет, записывает блокировку и возвращает nil.
+# KEYS[1] - ключ запроса, ARGV - запись блокировки и время блокировки в секундах
+BEGIN_SCRIPT: str = """
+local record = redis.call('GET', KEYS[1])
+if record then
+    return record
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return false
+"""
+
+# Завершение обработки: заменяет блокировку ответом или удаляет ее, если блокировка еще наша.
+# KEYS - ключ запроса и индекс ключей, ARGV - запись блокировки, запись ответа ('' - удалить),
+# время хранения ответа в секундах и момент его истечения для индекса
+FINISH_SCRIPT: str = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] == '' then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('ZADD', KEYS[2], ARGV[4], KEYS[1])
+return 1
+"""
+
+# Префикс ключей идемпотентности в Redis
+KEY_PREFIX: str = "idempotency"
+# Индекс ключей с сохраненными ответами по моменту истечения
+INDEX_KEY: str = f"{KEY_PREFIX}:index"
+# Максимальная длина ключа от клиента
+MAX_KEY_LENGTH: int = 255
+# Интервалы опроса ключа повторным запросом в секундах
+POLL_INTERVAL: float = 0.05
+MAX_POLL_INTERVAL: float = 0.5
+# Заголовок ответа, повторенного из сохраненного
+REPLAYED_HEADER: str = "Idempotency-Replayed"
+
+
+class Idempotency:
+    """
+    Идемпотентная обработка запросов: первый запрос с ключом блокирует ключ в Redis и сохраняет ответ,
+    повторы с тем же ключом получают сохраненный ответ одним вызовом скрипта, а одновременные дубли
+    ждут ответа первого запроса вместо повторной работы.
+    Ошибки обработки не сохраняются: блокировка снимается, и повтор выполняется заново.
+    При недоступности Redis запрос выполняется без идемпотентности, как и остальные операции RedisManager
+
+    !!! Важно - использовать через зависимость idempotent
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar _scripts: зарегистрированные скрипты по тексту
+    :type _scripts: dict[str, AsyncScript]
+    """
+
+    def __init__(self, redis_manager: RedisManager) -> None:
+        """
+        Инициализация
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self._scripts: dict[str, AsyncScript] = {}
+
+    async def run(
+        self, scope: str, key: str, fingerprint: str, func: Callable[[], Awaitable[Any]], status_code: int = 200
+    ) -> Response:
+        """
+        Выполнение обработчика один раз на ключ идемпотентности
+
+        :param scope: область ключей, обычно название роута
+        :type scope: str
+        :param key: ключ идемпотентности от клиента
+        :type key: str
+        :param fingerprint: отпечаток тела запроса: повтор ключа с другим телом отклоняется
+        :type fingerprint: str
+        :param func: обработчик. Возвращает JSON сериализуемое значение
+        :type func: Callable[[], Awaitable[Any]]
+        :param status_code: код ответа обработчика
+        :type status_code: int
+        :return: ответ обработчика или сохраненный ответ первого запроса
+        :rtype: Response
+
+        :exception IdempotencyKeyReused: ключ использован с другим телом запроса
+        :exception IdempotentRequestInProgress: первый запрос не завершился за IDEMPOTENCY_WAIT_TIMEOUT секунд
+        """
+        redis_key: str = f"{KEY_PREFIX}:{scope}:{key}"
+        lock: str = dumps_str({"state": "in_progress", "fingerprint": fingerprint, "token": uuid.uuid4().hex})
+        deadline: float = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        interval: float = POLL_INTERVAL
+
+        while True:
+            try:
+                record: str | None = await self._call(BEGIN_SCRIPT, [redis_key], [lock, settings.IDEMPOTENCY_LOCK_TTL])
+            except RedisError as e:
+                print(f"Ошибка захвата ключа идемпотентности в Redis: {e}")
+                return self._response(await func(), status_code)
+
+            if record is None:
+                return await self._execute(redis_key, lock, func, status_code)
+
+            stored: dict[str, Any] = loads(record)
+            if stored["fingerprint"] != fingerprint:
+                raise IdempotencyKeyReused()
+            if stored["state"] == "done":
+                return self._response(stored["body"], stored["status_code"], replayed=True)
+
+            if time.monotonic() + interval > deadline:
+                raise IdempotentRequestInProgress(retry_after=1)
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+    async def prune(self) -> int:
+        """
+        Удаление истекших ключей из индекса и из Redis, если время жизни ключа не было задано
+
+        :return: количество удаленных ключей
+        :rtype: int
+        """
+        try:
+            client = self._redis_manager.get_client()
+            keys: list[str] = await client.zrangebyscore(INDEX_KEY, "-inf", time.time())
+            if not keys:
+                return 0
+
+            async with self._redis_manager.pipeline() as pipe:
+                pipe.delete(*keys)
+                pipe.zrem(INDEX_KEY, *keys)
+
+            return len(keys)
+        except RedisError as e:
+            print(f"Ошибка удаления истекших ключей идемпотентности: {e}")
+            return 0
+
+    async def _execute(
+        self, redis_key: str, lock: str, func: Callable[[], Awaitable[Any]], status_code: int
+    ) -> Response:
+        """
+        Выполнение обработчика под блокировкой и сохранение ответа
+
+        :param redis_key: ключ запроса в Redis
+        :type redis_key: str
+        :param lock: запись блокировки
+        :type lock: str
+        :param func: обработчик
+        :type func: Callable[[], Awaitable[Any]]
+        :param status_code: код ответа обработчика
+        :type status_code: int
+        :return: ответ обработчика
+        :rtype: Response
+        """
+        try:
+            body: str = dumps_str(await func())
+        except BaseException:
+            await self._finish(redis_key, lock, "")
+            raise
+
+        record: str = dumps_str({**loads(lock), "state": "done", "status_code": status_code, "body": body})
+        await self._finish(redis_key, lock, record)
+
+        return self._response(body, status_code)
+
+    async def _finish(self, redis_key: str, lock: str, record: str) -> None:
+        """Замена блокировки ответом или снятие блокировки"""
+        ttl: int = settings.IDEMPOTENCY_TTL
+
+        try:
+            await self._call(FINISH_SCRIPT, [redis_key, INDEX_KEY], [lock, record, ttl, time.time() + ttl])
+        except RedisError as e:
+            print(f"Ошибка сохранения ответа по ключу идемпотентности: {e}")
+
+    async def _call(self, script: str, keys: list[str], args: list[Any]) -> Any:
+        """Вызов скрипта с регистрацией на текущем клиенте Redis"""
+        client = self._redis_manager.get_client()
+        registered: AsyncScript | None = self._scripts.get(script)
+        if registered is None or registered.registered_client is not client:
+            registered = self._scripts[script] = client.register_script(script)
+
+        return await registered(keys=keys, args=args)
+
+    @staticmethod
+    def _response(body: Any, status_code: int = 200, replayed: bool = False) -> Response:
+        """Ответ JSON из значения обработчика или из сохраненного тела"""
+        return Response(
+            content=body if isinstance(body, str) else dumps(body),
+            status_code=status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"} if replayed else None,
+        )
+
+
+@dataclass(frozen=True)
+class IdempotentRequest:
+    """
+    Запрос с необязательным ключом идемпотентности, полученный зависимостью idempotent
+
+    :cvar idempotency: идемпотентная обработка запросов
+    :type idempotency: Idempotency
+    :cvar scope: область ключей
+    :type scope: str
+    :cvar key: ключ идемпотентности или None - если клиент его не передал
+    :type key: str | None
+    """
+
+    idempotency: Idempotency
+    scope: str
+    key: str | None
+
+    async def run(
+        self, payload: Any, func: Callable[[], Awaitable[Any]], status_code: int = 200, owner: Any = None
+    ) -> Any:
+        """
+        Выполнение обработчика. Без ключа идемпотентности обработчик просто вызывается.
+        Отпечаток тела - HMAC с IDEMPOTENCY_SECRET: тело может содержать пароль, а отпечаток хранится в Redis
+
+        :param payload: тело запроса для отпечатка
+        :type payload: Any
+        :param func: обработчик. Возвращает JSON сериализуемое значение.
+            Cookie и заголовки, установленные обработчиком в Response, при повторе не воспроизводятся
+        :type func: Callable[[], Awaitable[Any]]
+        :param status_code: код ответа обработчика
+        :type status_code: int
+        :param owner: владелец ключей, например id пользователя: ключи разных владельцев не пересекаются
+        :type owner: Any
+        :return: значение обработчика или ответ с ним
+        :rtype: Any
+        """
+        if self.key is None:
+            return await func()
+
+        scope: str = self.scope if owner is None else f"{self.scope}:{owner}"
+        fingerprint: str = hmac.new(settings.IDEMPOTENCY_SECRET.encode(), dumps(payload), hashlib.sha256).hexdigest()
+        return await self.idempotency.run(scope, self.key, fingerprint, func, status_code)
+
+
+# Глобальный экземпляр идемпотентной обработки запросов
+idempotency: Idempotency = Idempotency(get_redis_manager())
+
+
+def get_idempotency() -> Idempotency:
+    """
+    Метод для зависимости получения идемпотентной обработки запросов
+
+    :return: идемпотентная обработка запросов
+    :rtype: Idempotency
+    """
+    return idempotency
+
+
+def idempotent(scope: str) -> Callable[..., Coroutine]:
+    """
+    Фабрика зависимости запроса с заголовком Idempotency-Key
+
+    :param scope: область ключей, обычно название роута
+    :type scope: str
+    :return: зависимость, возвращающая IdempotentRequest
+    :rtype: Callable[..., Coroutine]
+
+    .. code-block:: python
+        from dh_mood_tracker.utils import IdempotentRequest, idempotent
+
+        @auth_routes.post("/register", response_model=bool)
+        async def user_register(
+            user_data_in: CreateInUserSchema, request: IdempotentRequest = Depends(idempotent("register"))
+        ) -> Response:
+            async def register() -> bool:
+                ...
+                return True
+
+            return await request.run(user_data_in.model_dump(), register)
+    """
+
+    async def dependency(
+        idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+        store: Idempotency = Depends(get_idempotency),
+    ) -> IdempotentRequest:
+        if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            raise IdempotencyKeyInvalid()
+
+        return IdempotentRequest(store, scope, idempotency_key)
+
+    return dependency
@@ -0,0 +1,236 @@
+"""Модуль удаления записей кеша в памяти процесса во всех воркерах через Redis pub/sub"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+import asyncio
+from typing import Any, Iterable
+
+import orjson
+from redis import RedisError
+from redis.asyncio.client import PubSub
+
+from dh_mood_tracker.db import RedisManager, get_redis_manager
+from dh_mood_tracker.core import dumps, loads, settings
+
+from .local_cache import LocalCache
+
+# Пауза перед переподключением подписчика в секундах
+RECONNECT_DELAY: float = 1.0
+
+
+class CacheInvalidator:
+    """
+    Удаление записей кешей в памяти процесса во всех воркерах.
+    Удаление применяется в текущем воркере сразу, а остальным воркерам отправляется
+    пакетом: все удаления за INVALIDATION_BATCH_DELAY секунд уходят одним сообщением.
+    Если подписчик терял соединение, после переподключения все кеши очищаются, так как сообщения могли быть пропущены
+
+    !!! Важно - использовать через зависимость get_cache_invalidator
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar _channel: канал сообщений об удалении
+    :type _channel: str
+    :ivar _origin: идентификатор воркера, чтобы не применять свои сообщения повторно
+    :type _origin: str
+    :ivar _caches: кеши по названию
+    :type _caches: dict[str, LocalCache]
+    :ivar _pending: удаления, ожидающие отправки: название кеша -> (ключи, теги)
+    :type _pending: dict[str, tuple[set[str], set[str]]]
+    """
+
+    def __init__(self, redis_manager: RedisManager, channel: str) -> None:
+        """
+        Инициализация
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        :param channel: канал сообщений об удалении
+        :type channel: str
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self._channel: str = channel
+        self._origin: str = uuid.uuid4().hex
+        self._caches: dict[str, LocalCache] = {}
+        self._pending: dict[str, tuple[set[str], set[str]]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._listener_task: asyncio.Task | None = None
+
+    def register(self, name: str, cache: LocalCache) -> LocalCache:
+        """
+        Регистрация кеша для удаления записей по сообщениям других воркеров
+
+        :param name: название кеша, одинаковое во всех воркерах
+        :type name: str
+        :param cache: кеш в памяти процесса
+        :type cache: LocalCache
+        :return: зарегистрированный кеш
+        :rtype: LocalCache
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import LocalCache, get_cache_invalidator
+
+            local: LocalCache = get_cache_invalidator().register("auth_token", LocalCache(10000))
+        """
+        self._caches[name] = cache
+        return cache
+
+    def invalidate(self, name: str, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        """
+        Удаление записей кеша по ключам и тегам во всех воркерах
+
+        :param name: название зарегистрированного кеша
+        :type name: str
+        :param keys: ключи записей
+        :type keys: Iterable[str]
+        :param tags: теги записей
+        :type tags: Iterable[str]
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import CacheInvalidator, get_cache_invalidator
+
+            async def update_user(user_id: int, invalidator: CacheInvalidator = Depends(get_cache_invalidator)):
+                ...
+                invalidator.invalidate("auth_token", tags=[f"user:{user_id}"])
+        """
+        keys, tags = set(keys), set(tags)
+        if not keys and not tags:
+            return
+
+        self._apply(name, keys, tags)
+
+        pending_keys, pending_tags = self._pending.setdefault(name, (set(), set()))
+        pending_keys.update(keys)
+        pending_tags.update(tags)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def start(self) -> None:
+        """Запуск подписчика. Вызывается в lifespan приложения"""
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Остановка подписчика с отправкой накопленных удалений. Вызывается в lifespan приложения"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    async def flush(self) -> None:
+        """Отправка накопленных удалений одним сообщением"""
+        if not self._pending:
+            return
+
+        operations: list[dict[str, Any]] = [
+            {"cache": name, "keys": list(keys), "tags": list(tags)} for name, (keys, tags) in self._pending.items()
+        ]
+        self._pending = {}
+
+        await self._redis_manager.publish_message(
+            self._channel,
+            dumps({"origin": self._origin, "operations": operations}),  # type: ignore[arg-type]
+        )
+
+    async def _flush_later(self) -> None:
+        """Отправка удалений после паузы накопления пакета"""
+        await asyncio.sleep(settings.INVALIDATION_BATCH_DELAY)
+        await self.flush()
+
+    async def _listen(self) -> None:
+        """Прием сообщений об удалении с переподключением при потере соединения"""
+        connected_before: bool = False
+
+        while True:
+            pubsub: PubSub = self._redis_manager.get_client().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._channel)
+                if connected_before:
+                    self._clear_all()
+                connected_before = True
+                print(f'✅ Подписка на удаление записей кеша в канале "{self._channel}"')
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    # Ошибка в одном сообщении не должна останавливать подписчика до конца работы процесса
+                    try:
+                        self._handle(message["data"])
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        print(f"Ошибка применения сообщения об удалении записей кеша: {e}")
+            except RedisError as e:
+                print(f"Ошибка подписки на удаление записей кеша: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                await pubsub.aclose()
+
+    def _handle(self, data: str | bytes) -> None:
+        """Применение сообщения другого воркера"""
+        try:
+            message: Any = loads(data)
+        except orjson.JSONDecodeError as e:
+            print(f"Ошибка разбора сообщения об удалении записей кеша: {e}")
+            return
+
+        if not isinstance(message, dict) or not isinstance(message.get("operations", []), list):
+            print(f"Некорректное сообщение об удалении записей кеша: {message!r:.200}")
+            return
+        if message.get("origin") == self._origin:
+            return
+
+        for operation in message.get("operations", []):
+            if not self._valid_operation(operation):
+                print(f"Некорректная операция удаления записей кеша: {operation!r:.200}")
+                continue
+            self._apply(operation["cache"], operation.get("keys", []), operation.get("tags", []))
+
+    @staticmethod
+    def _valid_operation(operation: Any) -> bool:
+        """Операция вида {"cache": str, "keys": list[str], "tags": list[str]}"""
+        return (
+            isinstance(operation, dict)
+            and isinstance(operation.get("cache"), str)
+            and all(
+                isinstance(values, list) and all(isinstance(value, str) for value in values)
+                for values in (operation.get("keys", []), operation.get("tags", []))
+            )
+        )
+
+    def _apply(self, name: str, keys: Iterable[str], tags: Iterable[str]) -> None:
+        """Удаление записей из кеша текущего воркера"""
+        if (cache := self._caches.get(name)) is None:
+            return
+
+        for key in keys:
+            cache.delete(key)
+        for tag in tags:
+            cache.delete_tag(tag)
+
+    def _clear_all(self) -> None:
+        """Очистка всех кешей"""
+        for cache in self._caches.values():
+            cache.clear()
+
+
+# Глобальный экземпляр удаления записей кеша
+cache_invalidator: CacheInvalidator = CacheInvalidator(get_redis_manager(), settings.INVALIDATION_CHANNEL)
+
+
+def get_cache_invalidator() -> CacheInvalidator:
+    """
+    Метод для зависимости получения удаления записей кеша во всех воркерах
+
+    :return: удаление записей кеша
+    :rtype: CacheInvalidator
+    """
+    return cache_invalidator
@@ -0,0 +1,131 @@
+"""Модуль кеша в памяти процесса"""
+
+__author__: str = "Digital Horizons"
+
+import time
+from typing import Any, Iterable
+from collections import OrderedDict, defaultdict
+
+
+class LocalCache:
+    """
+    Кеш в памяти процесса с временем жизни записей и вытеснением давно не используемых записей.
+    Записи можно пометить тегами и удалять все записи тега разом.
+    Не разделяется между воркерами: для удаления записей во всех воркерах кеш регистрируется в CacheInvalidator
+
+    :ivar _max_size: максимальное количество записей
+    :type _max_size: int
+    :ivar _items: записи в порядке использования: ключ -> (момент истечения по time.monotonic, значение, теги)
+    :type _items: OrderedDict[str, tuple[float, Any, tuple[str, ...]]]
+    :ivar _tags: ключи записей по тегу
+    :type _tags: defaultdict[str, set[str]]
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Инициализация кеша
+
+        :param max_size: максимальное количество записей
+        :type max_size: int
+        """
+        self._max_size: int = max_size
+        self._items: OrderedDict[str, tuple[float, Any, tuple[str, ...]]] = OrderedDict()
+        self._tags: defaultdict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Any | None:
+        """
+        Получение значения по ключу
+
+        :param key: ключ записи
+        :type key: str
+        :return: значение или None - если записи нет или она истекла
+        :rtype: Any | None
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import LocalCache
+
+            cache: LocalCache = LocalCache(max_size=1000)
+            cache.set("user_name", "JohnDoe", 30)
+            cache.get("user_name") # "JohnDoe"
+        """
+        item: tuple[float, Any, tuple[str, ...]] | None = self._items.get(key)
+
+        if item is None:
+            return None
+
+        expires_at, value, _ = item
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        """
+        Сохранение значения. При переполнении вытесняется давно не используемая запись
+
+        :param key: ключ записи
+        :type key: str
+        :param value: значение
+        :type value: Any
+        :param ttl: время жизни записи в секундах
+        :type ttl: float
+        :param tags: теги записи для удаления группой
+        :type tags: Iterable[str]
+        """
+        if ttl <= 0:
+            return
+
+        item_tags: tuple[str, ...] = tuple(tags)
+
+        self.delete(key)
+        self._items[key] = (time.monotonic() + ttl, value, item_tags)
+        for tag in item_tags:
+            self._tags[tag].add(key)
+
+        while len(self._items) > self._max_size:
+            self.delete(next(iter(self._items)))
+
+    def delete(self, key: str) -> None:
+        """
+        Удаление записи
+
+        :param key: ключ записи
+        :type key: str
+        """
+        if (item := self._items.pop(key, None)) is None:
+            return
+
+        for tag in item[2]:
+            keys: set[str] = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def delete_tag(self, tag: str) -> None:
+        """
+        Удаление всех записей с тегом
+
+        :param tag: тег записей
+        :type tag: str
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import LocalCache
+
+            cache: LocalCache = LocalCache(max_size=1000)
+            cache.set("token:1", {"user_id": 1}, 30, tags=["user:1"])
+            cache.set("token:2", {"user_id": 1}, 30, tags=["user:1"])
+            cache.delete_tag("user:1")
+            cache.get("token:1") # None
+        """
+        for key in list(self._tags.get(tag, ())):
+            self.delete(key)
+
+    def clear(self) -> None:
+        """Удаление всех записей"""
+        self._items.clear()
+        self._tags.clear()
@@ -0,0 +1,186 @@
+"""Модуль ограничения частоты запросов на Redis"""
+
+__author__: str = "Digital Horizons"
+
+from typing import Callable, Coroutine
+from dataclasses import dataclass
+
+from redis import RedisError
+from fastapi import Depends, Request
+from redis.commands.core import AsyncScript
+
+from dh_mood_tracker.db import RedisManager, get_redis_manager
+from dh_mood_tracker.core import settings
+
+from .exceptions import TooManyRequests
+
+# Алгоритм GCRA (token bucket без фоновой пополняющей задачи). Проверяет все ключи разом:
+# запрос пропускается, только если его допускают все ограничения, иначе ни одно состояние не меняется.
+# KEYS - ключи ограничений, ARGV - пары (интервал между запросами в мс, допустимый всплеск в мс) на каждый ключ.
+# Возвращает {1, 0} при пропуске или {0, мс до следующей попытки} при отказе
+GCRA_SCRIPT: str = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local updates = {}
+for index, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[index * 2 - 1])
+    local burst = tonumber(ARGV[index * 2])
+    local tat = math.max(tonumber(redis.call('GET', key)) or now, now)
+    local new_tat = tat + emission
+    local allow_at = new_tat - burst
+    if allow_at > now then
+        return {0, allow_at - now}
+    end
+    updates[index] = new_tat
+end
+for index, key in ipairs(KEYS) do
+    redis.call('SET', key, updates[index], 'PX', updates[index] - now)
+end
+return {1, 0}
+"""
+
+# Префикс ключей ограничений в Redis
+KEY_PREFIX: str = "rate_limit"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Ограничение частоты запросов: не более limit запросов за period секунд с равномерным восстановлением
+
+    :cvar scope: область ограничения, входит в ключ Redis
+    :type scope: str
+    :cvar limit: допустимое количество запросов подряд
+    :type limit: int
+    :cvar period: период полного восстановления лимита в секундах
+    :type period: int
+    """
+
+    scope: str
+    limit: int
+    period: int
+
+    @property
+    def emission_ms(self) -> int:
+        """Интервал восстановления одного запроса в миллисекундах"""
+        return max(self.period * 1000 // self.limit, 1)
+
+    @property
+    def burst_ms(self) -> int:
+        """Допустимый всплеск в миллисекундах"""
+        return self.emission_ms * self.limit
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов. Одна проверка - один атомарный вызов скрипта в Redis.
+    При недоступности Redis запросы пропускаются, как и остальные операции RedisManager
+
+    !!! Важно - использовать через зависимость get_rate_limiter
+
+    :ivar _redis_manager: менеджер Redis
+    :type _redis_manager: RedisManager
+    :ivar _script: зарегистрированный скрипт GCRA
+    :type _script: AsyncScript | None
+    """
+
+    def __init__(self, redis_manager: RedisManager) -> None:
+        """
+        Инициализация ограничителя
+
+        :param redis_manager: менеджер Redis
+        :type redis_manager: RedisManager
+        """
+        self._redis_manager: RedisManager = redis_manager
+        self._script: AsyncScript | None = None
+
+    async def hit(self, *checks: tuple[RateLimit, str]) -> None:
+        """
+        Учет запроса по всем переданным ограничениям
+
+        :param checks: пары (ограничение, идентификатор клиента: IP, логин, email)
+        :type checks: tuple[RateLimit, str]
+
+        :exception TooManyRequests: превышено хотя бы одно ограничение
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import RateLimiter, get_rate_limiter, get_client_ip
+
+            @auth_routes.post("/login", description="Аутентификация пользователя")
+            async def user_login(
+                login_data: UserLogin,
+                client_ip: str = Depends(get_client_ip),
+                rate_limiter: RateLimiter = Depends(get_rate_limiter),
+            ) -> bool:
+                await rate_limiter.hit((LOGIN_BY_IP, client_ip), (LOGIN_BY_LOGIN, login_data.login))
+        """
+        if not settings.RATE_LIMIT_ENABLED or not checks:
+            return
+
+        keys: list[str] = [f"{KEY_PREFIX}:{limit.scope}:{identifier.lower()}" for limit, identifier in checks]
+        args: list[int] = [value for limit, _ in checks for value in (limit.emission_ms, limit.burst_ms)]
+
+        try:
+            client = self._redis_manager.get_client()
+            if self._script is None or self._script.registered_client is not client:
+                self._script = client.register_script(GCRA_SCRIPT)
+            allowed, retry_after_ms = await self._script(keys=keys, args=args)
+        except RedisError as e:
+            print(f"Ошибка проверки ограничения частоты запросов в Redis: {e}")
+            return
+
+        if not allowed:
+            raise TooManyRequests(retry_after=-(-int(retry_after_ms) // 1000))
+
+
+# Глобальный экземпляр ограничителя
+rate_limiter: RateLimiter = RateLimiter(get_redis_manager())
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Метод для зависимости получения ограничителя частоты запросов
+
+    :return: ограничитель частоты запросов
+    :rtype: RateLimiter
+    """
+    return rate_limiter
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Метод для зависимости получения IP адреса клиента.
+    За прокси адрес берется из заголовков средствами uvicorn (--proxy-headers)
+
+    :param request: запрос на сервер
+    :type request: Request
+    :return: IP адрес клиента
+    :rtype: str
+    """
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_by_ip(limit: RateLimit) -> Callable[..., Coroutine]:
+    """
+    Фабрика зависимости ограничения частоты запросов по IP адресу клиента.
+    Подходит для роутов, которым ключ ограничения не нужен из тела запроса
+
+    :param limit: ограничение частоты запросов
+    :type limit: RateLimit
+    :return: зависимость для параметра dependencies роута
+    :rtype: Callable[..., Coroutine]
+
+    .. code-block:: python
+        from dh_mood_tracker.utils import RateLimit, rate_limit_by_ip
+
+        @user_routes.get("/email_confirm", dependencies=[Depends(rate_limit_by_ip(RateLimit("confirm", 10, 60)))])
+        def email_confirm(access_token: str) -> bool:
+            ...
+    """
+
+    async def dependency(
+        client_ip: str = Depends(get_client_ip), limiter: RateLimiter = Depends(get_rate_limiter)
+    ) -> None:
+        await limiter.hit((limit, client_ip))
+
+    return dependency
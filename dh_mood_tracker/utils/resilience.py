@@ -0,0 +1,386 @@
+"""Модуль устойчивости вызовов внешних сервисов: ограничение параллельности, таймауты, повторы и предохранитель"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import random
+import asyncio
+from enum import StrEnum
+from typing import Any, TypeVar, Callable
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .exceptions import ServiceUnavailable
+
+# Тип результата вызова
+ResultType = TypeVar("ResultType")
+
+
+class CircuitState(StrEnum):
+    """
+    Состояние предохранителя
+
+    :cvar CLOSED: вызовы проходят
+    :cvar OPEN: вызовы отклоняются без обращения к сервису
+    :cvar HALF_OPEN: пропускаются пробные вызовы для проверки восстановления
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    """
+    Политика вызова операции внешнего сервиса
+
+    :cvar max_concurrency: максимум одновременных вызовов операции
+    :type max_concurrency: int
+    :cvar timeout: таймаут одного вызова в секундах
+    :type timeout: float
+    :cvar retries: количество повторов. Учитывается только для идемпотентных операций
+    :type retries: int
+    :cvar idempotent: признак безопасного повтора операции
+    :type idempotent: bool
+    :cvar acquire_timeout: сколько секунд ждать свободного места при исчерпании параллельности
+    :type acquire_timeout: float
+    :cvar backoff: базовая задержка перед повтором в секундах, растет экспоненциально
+    :type backoff: float
+    """
+
+    max_concurrency: int = 20
+    timeout: float = 5.0
+    retries: int = 0
+    idempotent: bool = False
+    acquire_timeout: float = 1.0
+    backoff: float = 0.1
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Задержка перед повтором с полным случайным разбросом
+
+        :param attempt: номер выполненной попытки, начиная с 1
+        :type attempt: int
+        :return: задержка в секундах
+        :rtype: float
+        """
+        return random.uniform(0, self.backoff * 2 ** (attempt - 1))
+
+
+class CircuitBreaker:
+    """
+    Предохранитель по доле ошибок в окне последних вызовов
+
+    :ivar _failure_rate: доля ошибок для размыкания
+    :type _failure_rate: float
+    :ivar _min_calls: минимум вызовов в окне для оценки доли ошибок
+    :type _min_calls: int
+    :ivar _reset_timeout: сколько секунд предохранитель разомкнут перед пробными вызовами
+    :type _reset_timeout: float
+    :ivar _outcomes: окно результатов последних вызовов (True - ошибка)
+    :type _outcomes: deque[bool]
+    """
+
+    def __init__(self, failure_rate: float, min_calls: int, window: int, reset_timeout: float) -> None:
+        """
+        Инициализация предохранителя
+
+        :param failure_rate: доля ошибок для размыкания
+        :type failure_rate: float
+        :param min_calls: минимум вызовов в окне для оценки доли ошибок
+        :type min_calls: int
+        :param window: размер окна последних вызовов
+        :type window: int
+        :param reset_timeout: сколько секунд предохранитель разомкнут перед пробными вызовами
+        :type reset_timeout: float
+        """
+        self._failure_rate: float = failure_rate
+        self._min_calls: int = min_calls
+        self._reset_timeout: float = reset_timeout
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state: CircuitState = CircuitState.CLOSED
+        self._opened_at: float = 0.0
+        self._probe_started_at: float | None = None
+        self._rejected: int = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Текущее состояние с учетом истечения времени размыкания
+
+        :return: состояние предохранителя
+        :rtype: CircuitState
+        """
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+
+        return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        """Доля ошибок в окне"""
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def allow(self) -> bool:
+        """
+        Разрешение вызова. В полуоткрытом состоянии пропускается один пробный вызов за раз.
+        Пробный вызов без результата дольше reset_timeout (например, отмененный) считается потерянным
+
+        :return: признак разрешения вызова
+        :rtype: bool
+        """
+        state: CircuitState = self.state
+
+        if state == CircuitState.CLOSED:
+            return True
+
+        now: float = time.monotonic()
+        if state == CircuitState.HALF_OPEN and (
+            self._probe_started_at is None or now - self._probe_started_at >= self._reset_timeout
+        ):
+            self._probe_started_at = now
+            return True
+
+        self.reject()
+        return False
+
+    def reject(self) -> None:
+        """Учет отклоненного без обращения к сервису вызова"""
+        self._rejected += 1
+
+    def record(self, failed: bool) -> None:
+        """
+        Учет результата вызова
+
+        :param failed: признак ошибки сервиса
+        :type failed: bool
+        """
+        if self._state == CircuitState.HALF_OPEN:
+            self._probe_started_at = None
+            if failed:
+                self._open()
+            else:
+                self._state = CircuitState.CLOSED
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append(failed)
+
+        if len(self._outcomes) >= self._min_calls and self.failure_rate >= self._failure_rate:
+            self._open()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: состояние, доля ошибок и количество отклоненных вызовов
+        :rtype: dict[str, Any]
+        """
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 3),
+            "calls_in_window": len(self._outcomes),
+            "rejected": self._rejected,
+        }
+
+    def _open(self) -> None:
+        """Размыкание предохранителя"""
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class Bulkhead:
+    """
+    Ограничение одновременных вызовов операции. Вызовы выполняются в собственном пуле потоков операции
+    размером max_concurrency, а место освобождается только после завершения потока: вызов, прерванный таймаутом,
+    занимает место, пока поток не завершится. Поэтому зависший сервис не занимает общий пул потоков приложения
+
+    :ivar _semaphore: семафор свободных мест
+    :type _semaphore: asyncio.Semaphore
+    :ivar _executor: пул потоков операции
+    :type _executor: ThreadPoolExecutor
+    :ivar max_concurrency: максимум одновременных вызовов
+    :type max_concurrency: int
+    :ivar in_flight: количество выполняющихся вызовов
+    :type in_flight: int
+    :ivar rejected: количество вызовов, не дождавшихся места
+    :type rejected: int
+    """
+
+    def __init__(self, name: str, max_concurrency: int) -> None:
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_concurrency, thread_name_prefix=f"bulkhead-{name}")
+        self.max_concurrency: int = max_concurrency
+        self.in_flight: int = 0
+        self.rejected: int = 0
+
+    async def acquire(self, timeout: float) -> bool:
+        """
+        Ожидание свободного места
+
+        :param timeout: максимальное время ожидания в секундах
+        :type timeout: float
+        :return: признак получения места
+        :rtype: bool
+        """
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Освобождение места"""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def submit(self, func: Callable[..., ResultType], *args: Any) -> "asyncio.Future[ResultType]":
+        """
+        Запуск блокирующей функции в пуле операции на занятом через acquire месте.
+        Место освобождается по завершении потока, даже если ожидание результата прервано
+
+        :param func: блокирующая функция
+        :type func: Callable[..., ResultType]
+        :param args: аргументы функции
+        :type args: Any
+        :return: результат функции
+        :rtype: asyncio.Future[ResultType]
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        try:
+            future: Future = self._executor.submit(func, *args)
+        except RuntimeError:
+            self.release()
+            raise
+        future.add_done_callback(lambda _: self._release_from_thread(loop))
+
+        return asyncio.wrap_future(future, loop=loop)
+
+    def _release_from_thread(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Освобождение места из потока пула. После остановки цикла событий места уже не нужны"""
+        if not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self.release)
+            except RuntimeError:
+                pass
+
+
+class Resilience:
+    """
+    Устойчивый вызов блокирующих операций внешнего сервиса в пуле потоков.
+    Операции изолированы друг от друга ограничением параллельности, предохранитель общий на сервис
+
+    :ivar _service: название сервиса для сообщений
+    :type _service: str
+    :ivar _policies: политики вызова по операции
+    :type _policies: dict[str, ResiliencePolicy]
+    :ivar _is_failure: признак того, что исключение означает сбой сервиса, а не ошибку запроса
+    :type _is_failure: Callable[[BaseException], bool]
+    :ivar breaker: предохранитель сервиса
+    :type breaker: CircuitBreaker
+    """
+
+    def __init__(
+        self,
+        service: str,
+        policies: dict[str, ResiliencePolicy],
+        breaker: CircuitBreaker,
+        is_failure: Callable[[BaseException], bool],
+    ) -> None:
+        self._service: str = service
+        self._policies: dict[str, ResiliencePolicy] = policies
+        self._is_failure: Callable[[BaseException], bool] = is_failure
+        self._bulkheads: dict[str, Bulkhead] = {}
+        self.breaker: CircuitBreaker = breaker
+
+    async def call(self, operation: str, func: Callable[..., ResultType], *args: Any) -> ResultType:
+        """
+        Вызов блокирующей операции с политикой устойчивости
+
+        :param operation: название операции из политик
+        :type operation: str
+        :param func: блокирующая функция клиента сервиса
+        :type func: Callable[..., ResultType]
+        :param args: аргументы функции
+        :type args: Any
+        :return: результат функции
+        :rtype: ResultType
+
+        :exception ServiceUnavailable: предохранитель разомкнут, нет свободного места или сервис не ответил
+        :exception Exception: ошибка запроса от сервиса пробрасывается как есть
+
+        .. code-block:: python
+            auth_data: AuthResponse = await supabase_resilience.call(
+                "sign_in", self._client.auth.sign_in_with_password, {"email": email, "password": password}
+            )
+        """
+        policy: ResiliencePolicy = self._policies.get(operation) or ResiliencePolicy()
+        bulkhead: Bulkhead = self._get_bulkhead(operation, policy)
+        attempts: int = 1 + (policy.retries if policy.idempotent else 0)
+
+        # Разомкнутый предохранитель отклоняет вызов сразу, не занимая очередь операции
+        if self.breaker.state == CircuitState.OPEN:
+            self.breaker.reject()
+            raise ServiceUnavailable(f"{self._service} временно недоступен")
+
+        for attempt in range(1, attempts + 1):
+            # Место занимается на каждую попытку: поток попытки, прерванной таймаутом, держит свое место до конца
+            if not await bulkhead.acquire(policy.acquire_timeout):
+                raise ServiceUnavailable(f"{self._service} перегружен запросами")
+            if attempt == 1 and not self.breaker.allow():
+                bulkhead.release()
+                raise ServiceUnavailable(f"{self._service} временно недоступен")
+
+            try:
+                result: ResultType = await asyncio.wait_for(bulkhead.submit(func, *args), policy.timeout)
+            except asyncio.TimeoutError as ex:
+                error: BaseException = ex
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                if not self._is_failure(ex):
+                    self.breaker.record(failed=False)
+                    raise
+                error = ex
+            else:
+                self.breaker.record(failed=False)
+                return result
+
+            self.breaker.record(failed=True)
+            if attempt == attempts or not self.breaker.allow():
+                raise ServiceUnavailable(f"{self._service} не отвечает") from error
+            await asyncio.sleep(policy.retry_delay(attempt))
+
+        raise ServiceUnavailable(f"{self._service} не отвечает")
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Состояние для мониторинга
+
+        :return: состояние предохранителя и загрузка операций
+        :rtype: dict[str, Any]
+        """
+        return {
+            "service": self._service,
+            "circuit": self.breaker.snapshot(),
+            "operations": {
+                operation: {
+                    "in_flight": bulkhead.in_flight,
+                    "max_concurrency": bulkhead.max_concurrency,
+                    "rejected": bulkhead.rejected,
+                }
+                for operation, bulkhead in self._bulkheads.items()
+            },
+        }
+
+    def _get_bulkhead(self, operation: str, policy: ResiliencePolicy) -> Bulkhead:
+        """Ограничение параллельности операции. Создается при первом вызове"""
+        if operation not in self._bulkheads:
+            self._bulkheads[operation] = Bulkhead(f"{self._service}-{operation}", policy.max_concurrency)
+
+        return self._bulkheads[operation]
@@ -6,30 +6,62 @@ import re
 from uuid import UUID
 from typing import Any, NoReturn
 
+import httpx
 from fastapi import Depends, Response
 from supabase import Client, create_client
-from supabase_auth import Session, AuthResponse
-from supabase_auth.errors import AuthApiError
+from supabase_auth import User, Session, AuthResponse
+from supabase_auth.errors import AuthApiError, AuthRetryableError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dh_mood_tracker.db import get_db_session
 from dh_mood_tracker.core import BaseAppException, settings
 from dh_mood_tracker.events import SupaBaseUserCreate
+from dh_mood_tracker.outbox import OutboxService
 
-from .consts import EXCEPTION_MESSAGE_MAP
-from .event_bus import EventBus, get_event_bus
+from .consts import SUPABASE_POLICIES, EXCEPTION_MESSAGE_MAP
+from .resilience import Resilience, CircuitBreaker
+
+
+def _is_supabase_failure(exception: BaseException) -> bool:
+    """
+    Признак сбоя SupaBase, а не ошибки запроса пользователя: сетевые ошибки и ответы 5xx
+
+    :param exception: исключение клиента SupaBase
+    :type exception: BaseException
+    :return: признак сбоя сервиса
+    :rtype: bool
+    """
+    if isinstance(exception, (AuthRetryableError, httpx.HTTPError)):
+        return True
+
+    return isinstance(exception, AuthApiError) and exception.status >= 500
+
+
+# Устойчивость вызовов SupaBase. Общая на процесс, чтобы предохранитель видел все запросы
+supabase_resilience: Resilience = Resilience(
+    "SupaBase",
+    SUPABASE_POLICIES,
+    CircuitBreaker(
+        settings.SUPABASE_BREAKER_FAILURE_RATE,
+        settings.SUPABASE_BREAKER_MIN_CALLS,
+        settings.SUPABASE_BREAKER_WINDOW,
+        settings.SUPABASE_BREAKER_RESET_TIMEOUT,
+    ),
+    _is_supabase_failure,
+)
 
 
 class SupaBase:
     """
     Класс для взаимодействия с сервисом SupaBase. Является фасадом для взаимодействия.
+    Блокирующие вызовы клиента выполняются в пуле потоков через supabase_resilience
 
     !!! Важно - использовать только через зависимость как в примере
 
-    :ivar _client: клиент подключения к Supabase
-    :type _client: SupaBase
-    :ivar _event_bus: шина событий приложений
-    :type _event_bus: SupaBase
+    :ivar _client: клиент подключения к Supabase или None, если еще не создан
+    :type _client: Client | None
+    :ivar _session_db: сессия подключения к БД
+    :type _session_db: AsyncSession
     """
 
     def __init__(self, session_db: AsyncSession) -> None:
@@ -39,13 +71,28 @@ class SupaBase:
         :param session_db: сессия для подключения к БД
         :type session_db: AsyncSession
         """
-        self._client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_TOKEN)
-        self._event_bus: EventBus = get_event_bus(session_db)
+        self._client: Client | None = None
+        self._session_db: AsyncSession = session_db
+
+    @property
+    def client(self) -> Client:
+        """
+        Клиент подключения к SupaBase. Создается при первом обращении,
+        чтобы запросы, обслуженные из кеша, не тратили время на создание клиента
+
+        :return: клиент подключения к SupaBase
+        :rtype: Client
+        """
+        if self._client is None:
+            self._client = create_client(settings.SUPABASE_URL, settings.SUPABASE_TOKEN)
+
+        return self._client
 
     async def create_user(self, email: str, password: str, other_data: dict[str, Any]) -> bool:
         """
         Создание пользователя в SupaBase.
-        Отправляет событие SupaBaseUserCreate после создания с UUID пользователя в SupaBase и other_data
+        Записывает событие SupaBaseUserCreate с UUID пользователя в SupaBase и other_data в outbox сразу после
+        создания: локальный пользователь создается OutboxRelay и не теряется при падении процесса
 
         !!! Важно - нет проверки на наличия пользователя в БД. Нужно выполнить вручную
 
@@ -62,6 +109,7 @@ class SupaBase:
 
         :exception IncorrectEmail: передан некорректный email
         :exception TooManySupaBaseRequest: слишком много запросов к SupaBase
+        :exception ServiceUnavailable: SupaBase недоступен
         :exception BaseAppException: неопределенная ошибка
 
         .. code-block:: python
@@ -85,25 +133,32 @@ class SupaBase:
 
                 await supabase.create_user(user_data.email, user_data.password, user_data.model_dump())
         """
+        profile: dict[str, Any] = {key: value for key, value in other_data.items() if key != "password"}
+
         try:
-            supabase_data: AuthResponse = self._client.auth.sign_up(
+            supabase_data: AuthResponse = await supabase_resilience.call(
+                "sign_up",
+                self.client.auth.sign_up,
                 {
                     "email": email,
                     "password": password,
                     "options": {
                         "email_redirect_to": "http://localhost:8000/email_confirm",
+                        # Данные профиля без пароля: по ним сверка восстанавливает потерянных локальных пользователей
+                        "data": profile,
                     },
-                }
+                },
             )
         except AuthApiError as ex:
             self._exception_adapter(ex)
 
         if supabase_data.user:
-            await self._event_bus.publish(SupaBaseUserCreate(UUID(supabase_data.user.id), other_data))
+            # Событие хранится в outbox до OUTBOX_RETENTION: пароль в него не попадает
+            await OutboxService(self._session_db).publish(SupaBaseUserCreate(UUID(supabase_data.user.id), profile))
 
         return True
 
-    def login(self, email: str, password: str, response: Response) -> bool:
+    async def login(self, email: str, password: str, response: Response) -> bool:
         """
         Аутентификация пользователя по электронной почте и паролю через SupaBase
 
@@ -119,6 +174,7 @@ class SupaBase:
         :exception IncorrectEmail: передан некорректный email
         :exception EmailNotConfirmed: адрес электронной почты не подтвержден
         :exception TooManySupaBaseRequest: слишком много запросов к SupaBase
+        :exception ServiceUnavailable: SupaBase недоступен
         :exception BaseAppException: неопределенная ошибка
 
         .. code-block:: python
@@ -132,13 +188,15 @@ class SupaBase:
                 user_service: UserService = Depends(get_user_service),
                 supabase: SupaBase = Depends(get_supabase),
             ) -> bool:
-                if not (user_data := await user_service.read_by_login(login_data.login)):
+                if not (email := await user_service.read_email_by_login(login_data.login)):
                     raise UserNotFoundByLogin(login_data.login)
 
-                return supabase.login(user_data.email, login_data.password, response)
+                return await supabase.login(email, login_data.password, response)
         """
         try:
-            auth_data: AuthResponse = self._client.auth.sign_in_with_password({"email": email, "password": password})
+            auth_data: AuthResponse = await supabase_resilience.call(
+                "sign_in", self.client.auth.sign_in_with_password, {"email": email, "password": password}
+            )
 
             if auth_data.session:
                 response.set_cookie("AccessToken", auth_data.session.access_token)
@@ -147,7 +205,7 @@ class SupaBase:
         except AuthApiError as ex:
             self._exception_adapter(ex)
 
-    def confirm_email(self, access_token: str) -> bool:
+    async def confirm_email(self, access_token: str) -> bool:
         """
         Подтверждение почты по токену
 
@@ -156,45 +214,51 @@ class SupaBase:
         :return: успешность подтверждения
         :rtype: bool
 
+        :exception ServiceUnavailable: SupaBase недоступен
+
         .. code-block:: python
             from dh_mood_tracker.utils import SupaBase, get_supabase
 
             @user_routes.get("/email_confirm", description="Подтверждения адрес электронной почты")
-            def email_confirm(access_token: str, supabase: SupaBase = Depends(get_supabase)) -> bool:
-                supabase.confirm_email(access_token)
+            async def email_confirm(access_token: str, supabase: SupaBase = Depends(get_supabase)) -> bool:
+                await supabase.confirm_email(access_token)
 
                 return True
         """
-        self._client.auth.verify_otp(
+        await supabase_resilience.call(
+            "verify",
+            self.client.auth.verify_otp,
             {
                 "type": "email",
                 "token_hash": access_token,
-            }
+            },
         )
 
         return True
 
-    def get_session_data(self) -> Session | None:
+    async def get_session_data(self) -> Session | None:
         """
         Получение данных сессии текущего пользователя
 
         :return: данные сессии или None - если нет сессии
         :rtype: Session | None
 
+        :exception ServiceUnavailable: SupaBase недоступен
+
         .. code-block:: python
             from uuid import UUID
             from supabase_auth import Session
             from dh_mood_tracker.utils import SupaBase, get_supabase
 
             async def get_user_supabase_uuid(supabase: SupaBase = Depends(get_supabase)) -> UUID:
-                supabase_data: Session = supabase.get_session_data()
+                supabase_data: Session = await supabase.get_session_data()
                 user_supabase_id: UUID = UUID(supabase_data.user.id) # UUID пользователя из SupaBase
 
                 return user_supabase_id
         """
-        return self._client.auth.get_session()
+        return await supabase_resilience.call("get_session", self.client.auth.get_session)
 
-    def set_access_token(self, access_token: str, refresh_token: str) -> None:
+    async def set_access_token(self, access_token: str, refresh_token: str) -> None:
         """
         Установка данных сессии пользователя в SupaBase
 
@@ -203,6 +267,8 @@ class SupaBase:
         :param refresh_token: токен обновления
         :type refresh_token: str
 
+        :exception ServiceUnavailable: SupaBase недоступен
+
         .. code-block:: python
             from dh_mood_tracker.utils import SupaBase, get_supabase
 
@@ -210,9 +276,105 @@ class SupaBase:
                 if not access_token or not refresh_token:
                     raise NotValidAccessToken()
 
-                supabase.set_access_token(access_token, refresh_token)
+                await supabase.set_access_token(access_token, refresh_token)
         """
-        self._client.auth.set_session(access_token, refresh_token)
+        await supabase_resilience.call("set_session", self.client.auth.set_session, access_token, refresh_token)
+
+    async def logout(self, access_token: str, response: Response) -> bool:
+        """
+        Завершение сессии пользователя в SupaBase и удаление токенов из cookie.
+        Токен доступа остается действительным до истечения срока, поэтому его нужно удалить из кеша
+
+        :param access_token: токен доступа
+        :type access_token: str
+        :param response: экземпляр ответа
+        :type response: Response
+        :return: успешность выхода
+        :rtype: bool
+
+        :exception ServiceUnavailable: SupaBase недоступен
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import SupaBase, get_supabase
+
+            @auth_routes.post("/logout", description="Выход пользователя")
+            async def user_logout(
+                response: Response,
+                access_token: str = Depends(get_access_token),
+                supabase: SupaBase = Depends(get_supabase),
+            ) -> bool:
+                return await supabase.logout(access_token, response)
+        """
+        try:
+            await supabase_resilience.call("sign_out", self.client.auth.admin.sign_out, access_token, "local")
+        except AuthApiError:
+            # Сессия уже завершена или токен истек - для выхода это не ошибка
+            pass
+
+        response.delete_cookie("AccessToken")
+        response.delete_cookie("RefreshToken")
+        return True
+
+    async def refresh(self, refresh_token: str, response: Response) -> str | None:
+        """
+        Обновление токенов по токену обновления с записью новых токенов в cookie
+
+        :param refresh_token: токен обновления
+        :type refresh_token: str
+        :param response: экземпляр ответа
+        :type response: Response
+        :return: новый токен доступа или None - если SupaBase не вернул сессию
+        :rtype: str | None
+
+        :exception NotValidAccessToken: токен обновления недействителен
+        :exception ServiceUnavailable: SupaBase недоступен
+        :exception BaseAppException: неопределенная ошибка
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import SupaBase, get_supabase
+
+            @auth_routes.post("/refresh", description="Обновление токенов доступа")
+            async def user_refresh(
+                response: Response,
+                refresh_token: str = Depends(get_refresh_token),
+                supabase: SupaBase = Depends(get_supabase),
+            ) -> bool:
+                return bool(await supabase.refresh(refresh_token, response))
+        """
+        try:
+            auth_data: AuthResponse = await supabase_resilience.call(
+                "refresh", self.client.auth.refresh_session, refresh_token
+            )
+        except AuthApiError as ex:
+            self._exception_adapter(ex)
+
+        if not auth_data.session:
+            return None
+
+        response.set_cookie("AccessToken", auth_data.session.access_token)
+        response.set_cookie("RefreshToken", auth_data.session.refresh_token)
+        return auth_data.session.access_token
+
+    async def list_users(self, page: int, per_page: int) -> list[User]:
+        """
+        Страница списка пользователей SupaBase через API администратора.
+        Требует SUPABASE_TOKEN с ролью service_role
+
+        :param page: номер страницы, начиная с 1
+        :type page: int
+        :param per_page: размер страницы
+        :type per_page: int
+        :return: пользователи страницы. Неполная страница - последняя
+        :rtype: list[User]
+
+        :exception ServiceUnavailable: SupaBase недоступен
+
+        .. code-block:: python
+            from dh_mood_tracker.utils import SupaBase
+
+            users: list[User] = await SupaBase(session_db).list_users(1, 1000)
+        """
+        return await supabase_resilience.call("list_users", self.client.auth.admin.list_users, page, per_page)
 
     @staticmethod
     def _exception_adapter(exception: Exception) -> NoReturn:
@@ -244,6 +406,16 @@ def get_supabase(session_db: AsyncSession = Depends(get_db_session)) -> SupaBase
         from dh_mood_tracker.utils import SupaBase, get_supabase
 
         async def set_user_token(supabase: SupaBase = Depends(get_supabase)) -> None:
-            supabase.set_access_token(access_token, refresh_token)
+            await supabase.set_access_token(access_token, refresh_token)
     """
     return SupaBase(session_db)
+
+
+def get_supabase_resilience() -> Resilience:
+    """
+    Метод для зависимости получения устойчивости вызовов SupaBase
+
+    :return: устойчивость вызовов SupaBase
+    :rtype: Resilience
+    """
+    return supabase_resilience
@@ -0,0 +1,17 @@
+"""
+Пакет микро-бенчмарков сервисов, кеша и шины событий
+
+Запуск с in-memory заглушками вместо PostgreSQL и Redis:
+
+.. code-block:: bash
+
+    python -m tests.benchmarks --backend memory --save
+
+Запуск против локальных PostgreSQL и Redis из настроек приложения:
+
+.. code-block:: bash
+
+    python -m tests.benchmarks --backend local --fail-on-regression
+"""
+
+__author__: str = "Digital Horizons"
@@ -0,0 +1,85 @@
+"""Точка входа запуска бенчмарков: python -m tests.benchmarks"""
+
+__author__: str = "Digital Horizons"
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+from . import cases, runner  # noqa: F401 pylint: disable=unused-import
+from .env import ENVIRONMENTS
+from .runner import BENCHMARKS, BASELINES_DIR, Comparison, BenchmarkResult, run_benchmark
+
+
+def _parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Микро-бенчмарки трекера настроения")
+    parser.add_argument("--backend", choices=sorted(ENVIRONMENTS), default="memory", help="окружение запуска")
+    parser.add_argument("-k", "--filter", default="", help="подстрока в названии бенчмарка")
+    parser.add_argument("-n", "--iterations", type=int, default=None, help="количество итераций")
+    parser.add_argument("--baseline", type=Path, default=None, help="файл базового замера")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как базовый замер")
+    parser.add_argument("--threshold", type=float, default=0.1, help="допустимое замедление медианы")
+    parser.add_argument("--fail-on-regression", action="store_true", help="код выхода 1 при регрессии")
+    return parser.parse_args()
+
+
+async def _run(backend: str, name_filter: str, iterations: int | None) -> list[BenchmarkResult]:
+    """Запуск подходящих бенчмарков в окружении"""
+    results: list[BenchmarkResult] = []
+
+    async with ENVIRONMENTS[backend]() as env:
+        for bench in BENCHMARKS.values():
+            if backend in bench.backends and name_filter in bench.name:
+                results.append(await run_benchmark(bench, env, iterations))
+
+    return results
+
+
+def _print_report(results: list[BenchmarkResult], comparisons: list[Comparison], threshold: float) -> None:
+    """Вывод таблицы результатов со сравнением"""
+    by_name: dict[str, Comparison] = {comparison.name: comparison for comparison in comparisons}
+    print(f"{'benchmark':<28}{'median us':>12}{'p95 us':>12}{'ops/s':>14}{'baseline us':>14}{'delta':>10}")
+
+    for result in results:
+        if result.error:
+            print(f"{result.name:<28}  ERROR {result.error}")
+            continue
+
+        comparison: Comparison = by_name[result.name]
+        baseline: str = f"{comparison.baseline_us:.3f}" if comparison.baseline_us else "-"
+        delta: str = f"{comparison.delta:+.1%}" if comparison.delta is not None else "-"
+        mark: str = " !" if comparison.is_regression(threshold) else ""
+        print(
+            f"{result.name:<28}{result.median_us:>12.3f}{result.p95_us:>12.3f}"
+            f"{result.ops_per_sec:>14.1f}{baseline:>14}{delta:>10}{mark}"
+        )
+
+
+def main() -> int:
+    """
+    Запуск бенчмарков, сравнение с базовым замером и его сохранение
+
+    :return: код выхода
+    :rtype: int
+    """
+    args: argparse.Namespace = _parse_args()
+    baseline_path: Path = args.baseline or BASELINES_DIR / f"{args.backend}.json"
+
+    results: list[BenchmarkResult] = asyncio.run(_run(args.backend, args.filter, args.iterations))
+    comparisons: list[Comparison] = runner.compare_results(results, runner.load_baseline(baseline_path))
+    _print_report(results, comparisons, args.threshold)
+
+    if args.save:
+        runner.save_baseline(results, baseline_path)
+        print(f"Базовый замер сохранен в {baseline_path}")
+
+    if args.fail_on_regression and any(comparison.is_regression(args.threshold) for comparison in comparisons):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""Модуль сценариев бенчмарков"""
+
+__author__: str = "Digital Horizons"
+
+import json
+import time
+import uuid
+import base64
+from typing import Any, Callable
+from itertools import count
+
+from sqlalchemy import insert
+
+from dh_mood_tracker.core import schema_response
+from dh_mood_tracker.users import UserService
+from dh_mood_tracker.utils import EventBus, RateLimit, LocalCache, RateLimiter, cache_result, email_validator
+from dh_mood_tracker.events import EventNames, SupaBaseUserCreate, decode_event, encode_event
+from dh_mood_tracker.users.model import User as UserModel
+from dh_mood_tracker.users.schemas import PublicUserData, CreateItemSchema
+from dh_mood_tracker.users.token_cache import TokenCache
+from dh_mood_tracker.utils.invalidation import CacheInvalidator
+
+from .env import BENCH_PREFIX, BenchmarkEnv, make_user_row
+from .runner import benchmark
+
+# Количество обработчиков события при замере публикации
+FAN_OUT_HANDLERS: int = 10
+# Количество ключей при замере пакетных операций Redis
+PAGE_SIZE: int = 50
+# Количество пользователей в пакете при замере вставки
+USERS_INSERT_BATCH: int = 500
+
+
+def _make_event() -> SupaBaseUserCreate:
+    """
+    Событие создания пользователя с типичными данными регистрации
+
+    :return: событие создания пользователя в SupaBase
+    :rtype: SupaBaseUserCreate
+    """
+    return SupaBaseUserCreate(
+        uuid.uuid4(),
+        {
+            "email": "john@doe.com",
+            "login": "john_doe",
+            "password": "secret",
+            "name": "John",
+            "surname": "Doe",
+            "patronymic": None,
+        },
+    )
+
+
+@benchmark("service.scalar_or_none")
+async def scalar_or_none_case(env: BenchmarkEnv) -> Callable:
+    """Чтение записи базовым сервисом по фильтру"""
+    service: UserService = UserService(env.session)  # type: ignore[arg-type]
+    login: str = env.user.login
+
+    return lambda: service.scalar_or_none(login=login)
+
+
+@benchmark("service.create", iterations=300)
+async def create_case(env: BenchmarkEnv) -> Callable:
+    """Создание записи базовым сервисом"""
+    service: UserService = UserService(env.session)  # type: ignore[arg-type]
+    counter = count()
+
+    async def operation() -> Any:
+        suffix: str = f"{next(counter)}_{uuid.uuid4().hex[:8]}"
+        schema: CreateItemSchema = CreateItemSchema.model_construct(
+            email=f"{BENCH_PREFIX}{suffix}@example.com",
+            login=f"{BENCH_PREFIX}{suffix}",
+            name=f"Name{suffix}",
+            surname=f"Surname{suffix}",
+            patronymic=None,
+            supabase_id=uuid.uuid4(),
+        )
+        return await service.create(schema)
+
+    return operation
+
+
+@benchmark("users.read_by_login")
+async def read_by_login_case(env: BenchmarkEnv) -> Callable:
+    """Чтение пользователя по логину"""
+    service: UserService = UserService(env.session)  # type: ignore[arg-type]
+    login: str = env.user.login
+
+    return lambda: service.read_by_login(login)
+
+
+@benchmark("users.read_email_by_login", backends=("local",))
+async def read_email_by_login_case(env: BenchmarkEnv) -> Callable:
+    """Чтение email по логину для входа"""
+    service: UserService = UserService(env.session)  # type: ignore[arg-type]
+    login: str = env.user.login
+
+    return lambda: service.read_email_by_login(login)
+
+
+@benchmark("users.insert", backends=("local",), iterations=100)
+async def users_insert_case(env: BenchmarkEnv) -> Callable:
+    """
+    Пакетная вставка пользователей: стоимость записи с учетом обновления индексов таблицы.
+    Вставляются только столбцы первой миграции, поэтому замер до и после перестройки индексов
+    получается запуском на ревизиях 8b04ad6488b2 и head:
+
+    .. code-block:: bash
+
+        alembic downgrade 8b04ad6488b2 && python -m tests.benchmarks --backend local -k users.insert
+        alembic upgrade head && python -m tests.benchmarks --backend local -k users.insert
+    """
+
+    async def operation() -> None:
+        rows: list[dict[str, Any]] = [make_user_row() for _ in range(USERS_INSERT_BATCH)]
+        await env.session.execute(insert(UserModel), rows)
+        await env.session.commit()
+
+    return operation
+
+
+@benchmark("users.read_by_supabase_id")
+async def read_by_supabase_id_case(env: BenchmarkEnv) -> Callable:
+    """Чтение пользователя по UUID SupaBase"""
+    service: UserService = UserService(env.session)  # type: ignore[arg-type]
+    supabase_id: uuid.UUID = env.user.supabase_id
+
+    return lambda: service.read_by_supabase_id(supabase_id)
+
+
+@benchmark("cache.hit")
+async def cache_hit_case(_: BenchmarkEnv) -> Callable:
+    """Чтение результата из кеша"""
+
+    @cache_result("bench:cache:hit:{0}", 300)
+    async def read(user_id: int) -> dict:
+        return {"id": user_id, "name": "John", "surname": "Doe"}
+
+    await read(1)
+
+    return lambda: read(1)
+
+
+@benchmark("cache.miss")
+async def cache_miss_case(_: BenchmarkEnv) -> Callable:
+    """Промах кеша: вызов функции и запись результата"""
+    counter = count()
+
+    @cache_result("bench:cache:miss:{0}", 300)
+    async def read(user_id: int) -> dict:
+        return {"id": user_id, "name": "John", "surname": "Doe"}
+
+    return lambda: read(next(counter))
+
+
+def _make_access_token() -> str:
+    """
+    Токен доступа в формате JWT со сроком действия час. Подпись не нужна: кеш читает только exp
+
+    :return: токен доступа
+    :rtype: str
+    """
+    claims: bytes = json.dumps({"sub": str(uuid.uuid4()), "exp": int(time.time()) + 3600}).encode()
+    return f"eyJhbGciOiJIUzI1NiJ9.{base64.urlsafe_b64encode(claims).decode().rstrip('=')}.signature"
+
+
+@benchmark("token_cache.hit")
+async def token_cache_hit_case(env: BenchmarkEnv) -> Callable:
+    """Получение пользователя по токену доступа из памяти процесса"""
+    token_cache: TokenCache = TokenCache(
+        env.redis_manager, LocalCache(max_size=100), CacheInvalidator(env.redis_manager, "bench:invalidate")
+    )
+    access_token: str = _make_access_token()
+    await token_cache.set(access_token, env.user)
+
+    return lambda: token_cache.get(access_token)
+
+
+@benchmark("token_cache.redis_hit")
+async def token_cache_redis_hit_case(env: BenchmarkEnv) -> Callable:
+    """Получение пользователя по токену доступа из Redis при промахе памяти процесса"""
+    local: LocalCache = LocalCache(max_size=100)
+    token_cache: TokenCache = TokenCache(
+        env.redis_manager, local, CacheInvalidator(env.redis_manager, "bench:invalidate")
+    )
+    access_token: str = _make_access_token()
+    await token_cache.set(access_token, env.user)
+
+    async def operation() -> Any:
+        local.clear()
+        return await token_cache.get(access_token)
+
+    return operation
+
+
+@benchmark("redis.get_json_loop", backends=("local",), iterations=300)
+async def redis_get_json_loop_case(env: BenchmarkEnv) -> Callable:
+    """Чтение страницы записей по одной команде на ключ"""
+    keys: list[str] = [f"bench:page:{number}" for number in range(PAGE_SIZE)]
+    await env.redis_manager.set_many_json({key: {"id": key, "name": "John"} for key in keys}, 300)
+
+    async def operation() -> Any:
+        return [await env.redis_manager.get_json(key) for key in keys]
+
+    return operation
+
+
+@benchmark("redis.get_many_json", backends=("local",), iterations=300)
+async def redis_get_many_json_case(env: BenchmarkEnv) -> Callable:
+    """Чтение страницы записей одной командой MGET"""
+    keys: list[str] = [f"bench:page:{number}" for number in range(PAGE_SIZE)]
+    await env.redis_manager.set_many_json({key: {"id": key, "name": "John"} for key in keys}, 300)
+
+    return lambda: env.redis_manager.get_many_json(keys)
+
+
+@benchmark("redis.set_many_json", backends=("local",), iterations=300)
+async def redis_set_many_json_case(env: BenchmarkEnv) -> Callable:
+    """Запись страницы записей пакетом SETEX"""
+    items: dict[str, dict] = {f"bench:page:{number}": {"id": number, "name": "John"} for number in range(PAGE_SIZE)}
+
+    return lambda: env.redis_manager.set_many_json(items, 300)
+
+
+@benchmark("cache.large_hit")
+async def cache_large_hit_case(_: BenchmarkEnv) -> Callable:
+    """Чтение из кеша большого результата, сжатого при записи"""
+
+    @cache_result("bench:cache:large:{0}", 300)
+    async def read(user_id: int) -> dict:
+        return {"id": user_id, "rows": [{"day": day, "mood": day % 5, "note": "Хороший день"} for day in range(365)]}
+
+    await read(1)
+
+    return lambda: read(1)
+
+
+@benchmark("event_bus.publish")
+async def event_bus_publish_case(env: BenchmarkEnv) -> Callable:
+    """Публикация события с рассылкой нескольким обработчикам"""
+    event_bus: EventBus = EventBus(env.session)  # type: ignore[arg-type]
+
+    async def handler(_: Any, __: Any) -> None:
+        return None
+
+    for _ in range(FAN_OUT_HANDLERS):
+        event_bus.subscribe(EventNames.SB_USER_CREATED, handler)
+
+    event: SupaBaseUserCreate = _make_event()
+
+    return lambda: event_bus.publish(event)
+
+
+@benchmark("events.to_dict", backends=("memory",))
+async def event_to_dict_case(_: BenchmarkEnv) -> Callable:
+    """Преобразование события в словарь"""
+    return _make_event().to_dict
+
+
+@benchmark("events.to_json", backends=("memory",))
+async def event_to_json_case(_: BenchmarkEnv) -> Callable:
+    """Преобразование события в строку JSON"""
+    return _make_event().to_json
+
+
+@benchmark("events.encode", backends=("memory",))
+async def event_encode_case(_: BenchmarkEnv) -> Callable:
+    """Кодирование события в msgpack"""
+    event: SupaBaseUserCreate = _make_event()
+
+    return lambda: encode_event(event)
+
+
+@benchmark("events.decode", backends=("memory",))
+async def event_decode_case(_: BenchmarkEnv) -> Callable:
+    """Декодирование события из msgpack"""
+    payload: bytes = encode_event(_make_event())
+
+    return lambda: decode_event(payload)
+
+
+@benchmark("responses.public_user", backends=("memory",))
+async def public_user_response_case(env: BenchmarkEnv) -> Callable:
+    """Сериализация ответа /auth/me из ORM модели"""
+    return lambda: schema_response(env.user, PublicUserData)
+
+
+@benchmark("validators.email", backends=("memory",))
+async def email_validator_case(_: BenchmarkEnv) -> Callable:
+    """Валидация адреса электронной почты"""
+    return lambda: email_validator("john.doe+tracker@example.com")
+
+
+@benchmark("rate_limit.hit", backends=("local",))
+async def rate_limit_hit_case(env: BenchmarkEnv) -> Callable:
+    """Проверка ограничений по IP и логину одним вызовом скрипта в Redis"""
+    limiter: RateLimiter = RateLimiter(env.redis_manager)
+    by_ip: RateLimit = RateLimit("bench:ip", limit=1_000_000, period=1)
+    by_login: RateLimit = RateLimit("bench:login", limit=1_000_000, period=1)
+
+    return lambda: limiter.hit((by_ip, "127.0.0.1"), (by_login, env.user.login))
@@ -0,0 +1,135 @@
+"""Модуль окружений запуска бенчмарков"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+from typing import Any, AsyncIterator
+from contextlib import ExitStack, asynccontextmanager
+from dataclasses import dataclass
+from unittest.mock import patch
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dh_mood_tracker.db import BaseModel, RedisManager, get_redis_manager
+from dh_mood_tracker.db.session import AsyncSessionLocal, engine
+from dh_mood_tracker.users.model import User as UserModel
+
+from .stubs import InMemoryRedis, InMemorySession
+
+# Префикс логинов и email`ов записей, создаваемых бенчмарками
+BENCH_PREFIX: str = "bench_"
+
+
+@dataclass
+class BenchmarkEnv:
+    """
+    Окружение запуска бенчмарков
+
+    :cvar backend: название окружения (memory или local)
+    :type backend: str
+    :cvar session: сессия БД или ее заглушка
+    :type session: AsyncSession | InMemorySession
+    :cvar redis_manager: менеджер Redis
+    :type redis_manager: RedisManager
+    :cvar user: заранее созданный пользователь для чтения
+    :type user: UserModel
+    """
+
+    backend: str
+    session: AsyncSession | InMemorySession
+    redis_manager: RedisManager
+    user: UserModel
+
+
+def make_user_row(**overrides: Any) -> dict[str, Any]:
+    """
+    Данные пользователя с уникальными полями. Содержат только столбцы первой миграции таблицы users,
+    поэтому вставляются и на ранних ревизиях схемы
+
+    :param overrides: переопределение полей
+    :type overrides: Any
+    :return: данные пользователя
+    :rtype: dict[str, Any]
+    """
+    suffix: str = uuid.uuid4().hex[:12]
+    data: dict[str, Any] = {
+        "email": f"{BENCH_PREFIX}{suffix}@example.com",
+        "login": f"{BENCH_PREFIX}{suffix}",
+        "name": f"Name{suffix}",
+        "surname": f"Surname{suffix}",
+        "patronymic": None,
+        "is_active": True,
+        "supabase_id": uuid.uuid4(),
+    }
+    data.update(overrides)
+    return data
+
+
+def make_user(**overrides: Any) -> UserModel:
+    """
+    Создание модели пользователя с уникальными полями
+
+    :param overrides: переопределение полей модели
+    :type overrides: Any
+    :return: модель пользователя без записи в БД
+    :rtype: UserModel
+    """
+    return UserModel(**make_user_row(**overrides))
+
+
+@asynccontextmanager
+async def memory_env() -> AsyncIterator[BenchmarkEnv]:
+    """
+    Окружение с заглушками PostgreSQL и Redis в памяти процесса
+
+    :return: окружение запуска
+    :rtype: AsyncIterator[BenchmarkEnv]
+    """
+    session: InMemorySession = InMemorySession()
+    redis_manager: RedisManager = RedisManager(InMemoryRedis())  # type: ignore[arg-type]
+
+    user: UserModel = make_user()
+    session.add(user)
+
+    with ExitStack() as stack:
+        # cache_result и invalidate_cache_pattern получают глобальный менеджер Redis сами
+        stack.enter_context(patch("dh_mood_tracker.utils.cache.get_redis_manager", lambda: redis_manager))
+        yield BenchmarkEnv("memory", session, redis_manager, user)
+
+
+@asynccontextmanager
+async def local_env() -> AsyncIterator[BenchmarkEnv]:
+    """
+    Окружение с локальными PostgreSQL и Redis из настроек приложения.
+    Созданные бенчмарками записи удаляются по префиксу логина
+
+    :return: окружение запуска
+    :rtype: AsyncIterator[BenchmarkEnv]
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(BaseModel.metadata.create_all)
+
+    async with AsyncSessionLocal() as session:
+        # Пользователь вставляется без чтения серверных значений: окружение работает и на ранних ревизиях схемы
+        row: dict[str, Any] = make_user_row()
+        user_id: int = await session.scalar(insert(UserModel).values(**row).returning(UserModel.id))
+        await session.commit()
+        user: UserModel = UserModel(id=user_id, **row)
+
+        try:
+            yield BenchmarkEnv("local", session, get_redis_manager(), user)
+        finally:
+            await session.rollback()
+            await session.execute(delete(UserModel).where(UserModel.login.startswith(BENCH_PREFIX)))
+            await session.commit()
+
+    await get_redis_manager().close()
+    await engine.dispose()
+
+
+# Окружения по названию
+ENVIRONMENTS = {
+    "memory": memory_env,
+    "local": local_env,
+}
@@ -0,0 +1,251 @@
+"""Модуль запуска бенчмарков, сохранения и сравнения базовых замеров"""
+
+__author__: str = "Digital Horizons"
+
+import os
+import sys
+import json
+import inspect
+import platform
+import statistics
+from time import perf_counter_ns
+from typing import Any, Callable, Awaitable
+from pathlib import Path
+from datetime import UTC, datetime
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+
+# Каталог с базовыми замерами по умолчанию
+BASELINES_DIR: Path = Path(__file__).parent / "baselines"
+
+# Тип фабрики замеряемой операции: получает окружение, готовит данные и возвращает операцию
+CaseFactoryType = Callable[[Any], Awaitable[Callable[[], Any]]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    Описание бенчмарка
+
+    :cvar name: уникальное название
+    :type name: str
+    :cvar factory: фабрика замеряемой операции
+    :type factory: CaseFactoryType
+    :cvar backends: окружения, в которых доступен бенчмарк
+    :type backends: tuple[str, ...]
+    :cvar iterations: количество итераций по умолчанию
+    :type iterations: int
+    """
+
+    name: str
+    factory: CaseFactoryType
+    backends: tuple[str, ...]
+    iterations: int
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Результат замера. Времена в микросекундах
+
+    :cvar name: название бенчмарка
+    :type name: str
+    :cvar iterations: количество итераций
+    :type iterations: int
+    :cvar mean_us: среднее время операции
+    :type mean_us: float
+    :cvar median_us: медианное время операции
+    :type median_us: float
+    :cvar p95_us: 95-й перцентиль времени операции
+    :type p95_us: float
+    :cvar min_us: минимальное время операции
+    :type min_us: float
+    :cvar ops_per_sec: операций в секунду по среднему времени
+    :type ops_per_sec: float
+    :cvar error: текст ошибки, если операция завершилась исключением
+    :type error: str | None
+    """
+
+    name: str
+    iterations: int = 0
+    mean_us: float = 0.0
+    median_us: float = 0.0
+    p95_us: float = 0.0
+    min_us: float = 0.0
+    ops_per_sec: float = 0.0
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    Сравнение результата с базовым замером
+
+    :cvar name: название бенчмарка
+    :type name: str
+    :cvar baseline_us: медиана базового замера
+    :type baseline_us: float | None
+    :cvar current_us: медиана текущего замера
+    :type current_us: float | None
+    :cvar delta: относительное изменение медианы (0.1 = медленнее на 10%)
+    :type delta: float | None
+    """
+
+    name: str
+    baseline_us: float | None
+    current_us: float | None
+    delta: float | None
+
+    def is_regression(self, threshold: float) -> bool:
+        """
+        Признак замедления сильнее порога
+
+        :param threshold: допустимое относительное замедление
+        :type threshold: float
+        :return: признак регрессии
+        :rtype: bool
+        """
+        return self.delta is not None and self.delta > threshold
+
+
+# Реестр бенчмарков по названию
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, backends: tuple[str, ...] = ("memory", "local"), iterations: int = 2000):
+    """
+    Декоратор регистрации бенчмарка
+
+    :param name: уникальное название бенчмарка
+    :type name: str
+    :param backends: окружения, в которых доступен бенчмарк
+    :type backends: tuple[str, ...]
+    :param iterations: количество итераций по умолчанию
+    :type iterations: int
+
+    .. code-block:: python
+        from tests.benchmarks.runner import benchmark
+
+        @benchmark("validators.email")
+        async def email_validator_case(_: BenchmarkEnv):
+            return lambda: email_validator("john@doe.com")
+    """
+
+    def decorator(factory: CaseFactoryType) -> CaseFactoryType:
+        if name in BENCHMARKS:
+            raise ValueError(f'Бенчмарк "{name}" уже зарегистрирован')
+
+        BENCHMARKS[name] = Benchmark(name, factory, backends, iterations)
+        return factory
+
+    return decorator
+
+
+async def run_benchmark(bench: Benchmark, env: Any, iterations: int | None = None, warmup: int = 50) -> BenchmarkResult:
+    """
+    Замер одного бенчмарка. Вывод в stdout во время замера подавляется
+
+    :param bench: описание бенчмарка
+    :type bench: Benchmark
+    :param env: окружение запуска
+    :type env: BenchmarkEnv
+    :param iterations: количество итераций. Если не задано - берется из бенчмарка
+    :type iterations: int | None
+    :param warmup: количество прогревочных итераций
+    :type warmup: int
+    :return: результат замера
+    :rtype: BenchmarkResult
+    """
+    iterations = iterations or bench.iterations
+    timings: list[int] = []
+
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+            operation = await bench.factory(env)
+
+            for step in range(warmup + iterations):
+                started: int = perf_counter_ns()
+                result = operation()
+                if inspect.isawaitable(result):
+                    await result
+                if step >= warmup:
+                    timings.append(perf_counter_ns() - started)
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        return BenchmarkResult(bench.name, error=f"{type(ex).__name__}: {ex}")
+
+    timings_us: list[float] = sorted(timing / 1000 for timing in timings)
+    mean_us: float = statistics.fmean(timings_us)
+
+    return BenchmarkResult(
+        name=bench.name,
+        iterations=iterations,
+        mean_us=round(mean_us, 3),
+        median_us=round(statistics.median(timings_us), 3),
+        p95_us=round(timings_us[int(len(timings_us) * 0.95) - 1], 3),
+        min_us=round(timings_us[0], 3),
+        ops_per_sec=round(1_000_000 / mean_us, 1) if mean_us else 0.0,
+    )
+
+
+def save_baseline(results: list[BenchmarkResult], path: Path) -> None:
+    """
+    Сохранение результатов как базового замера
+
+    :param results: результаты замеров
+    :type results: list[BenchmarkResult]
+    :param path: путь к файлу базового замера
+    :type path: Path
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data: dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: Path) -> dict[str, BenchmarkResult]:
+    """
+    Загрузка базового замера
+
+    :param path: путь к файлу базового замера
+    :type path: Path
+    :return: результаты по названию бенчмарка. Пустой словарь - если файла нет
+    :rtype: dict[str, BenchmarkResult]
+    """
+    if not path.exists():
+        return {}
+
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return {name: BenchmarkResult(**result) for name, result in data.get("results", {}).items()}
+
+
+def compare_results(current: list[BenchmarkResult], baseline: dict[str, BenchmarkResult]) -> list[Comparison]:
+    """
+    Сравнение текущих результатов с базовым замером по медиане
+
+    :param current: текущие результаты
+    :type current: list[BenchmarkResult]
+    :param baseline: базовые результаты по названию
+    :type baseline: dict[str, BenchmarkResult]
+    :return: сравнения по каждому текущему бенчмарку
+    :rtype: list[Comparison]
+    """
+    comparisons: list[Comparison] = []
+
+    for result in current:
+        before: BenchmarkResult | None = baseline.get(result.name)
+        baseline_us: float | None = before.median_us if before and not before.error else None
+        current_us: float | None = None if result.error else result.median_us
+        delta: float | None = None
+
+        if baseline_us and current_us is not None:
+            delta = round((current_us - baseline_us) / baseline_us, 4)
+
+        comparisons.append(Comparison(result.name, baseline_us, current_us, delta))
+
+    return comparisons
@@ -0,0 +1,176 @@
+"""Модуль in-memory заглушек PostgreSQL и Redis для бенчмарков"""
+
+__author__: str = "Digital Horizons"
+
+from typing import Any
+
+from redis import ResponseError
+from sqlalchemy import Select
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class InMemoryRedis:
+    """
+    Асинхронный клиент Redis в памяти процесса.
+    Реализует только команды, используемые RedisManager
+
+    :ivar _data: хранилище значений по ключу
+    :type _data: dict[str, Any]
+    """
+
+    def __init__(self) -> None:
+        self._data: dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any) -> bool:
+        """Установка значения"""
+        self._data[key] = value
+        return True
+
+    async def setex(self, key: str, _: int, value: Any) -> bool:
+        """Установка значения со временем жизни. Время жизни игнорируется"""
+        return await self.set(key, value)
+
+    async def get(self, key: str) -> Any:
+        """Получение значения"""
+        return self._data.get(key)
+
+    async def delete(self, *keys: str) -> int:
+        """Удаление ключей"""
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def exists(self, *keys: str) -> int:
+        """Количество существующих ключей"""
+        return sum(key in self._data for key in keys)
+
+    async def incrby(self, key: str, amount: int = 1) -> int:
+        """Инкремент счетчика"""
+        self._data[key] = int(self._data.get(key, 0)) + amount
+        return self._data[key]
+
+    async def publish(self, _: str, __: str) -> int:
+        """Публикация сообщения. Подписчиков нет"""
+        return 0
+
+    async def mget(self, keys: list[str]) -> list[Any]:
+        """Получение значений по нескольким ключам"""
+        return [self._data.get(key) for key in keys]
+
+    async def sadd(self, key: str, *values: Any) -> int:
+        """Добавление значений в множество"""
+        members: set = self._data.setdefault(key, set())
+        added: int = len(set(values) - members)
+        members.update(values)
+        return added
+
+    async def smembers(self, key: str) -> set:
+        """Члены множества"""
+        return set(self._data.get(key, set()))
+
+    async def expire(self, key: str, _: int) -> bool:
+        """Установка времени жизни. Время жизни игнорируется"""
+        return key in self._data
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        """Добавление значений в упорядоченное множество"""
+        members: dict[str, float] = self._data.setdefault(key, {})
+        added: int = len(mapping.keys() - members.keys())
+        members.update(mapping)
+        return added
+
+    async def execute_command(self, *args: Any, **_: Any) -> Any:
+        """Выполнение команды по названию. Поддерживаются GET и MGET, остальные отклоняются как в Redis"""
+        command, *params = args
+        if command == "GET":
+            return self._data.get(params[0])
+        if command == "MGET":
+            return [self._data.get(key) for key in params]
+        raise ResponseError(f"unknown command '{command}'")
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":  # pylint: disable=unused-argument
+        """Пакет команд"""
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    """
+    Пакет команд InMemoryRedis. Команды копятся и выполняются по порядку при execute
+
+    :ivar command_stack: отложенные команды
+    :type command_stack: list[Any]
+    """
+
+    def __init__(self, redis: InMemoryRedis) -> None:
+        self._redis: InMemoryRedis = redis
+        self.command_stack: list[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        command = getattr(self._redis, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "InMemoryPipeline":
+            self.command_stack.append(command(*args, **kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        """Выполнение отложенных команд"""
+        commands, self.command_stack = self.command_stack, []
+        return [await command for command in commands]
+
+    async def reset(self) -> None:
+        """Сброс отложенных команд"""
+        for command in self.command_stack:
+            command.close()
+        self.command_stack = []
+
+
+class InMemorySession:
+    """
+    Сессия БД в памяти процесса. Хранит модели в списке и фильтрует их по условиям равенства запроса
+
+    :ivar _rows: сохраненные модели
+    :type _rows: list[Any]
+    """
+
+    def __init__(self) -> None:
+        self._rows: list[Any] = []
+
+    async def scalar(self, statement: Select) -> Any:
+        """
+        Выполнение запроса с условиями вида column == value или lower(column) == value
+
+        :param statement: запрос SELECT
+        :type statement: Select
+        :return: первая подходящая модель или None
+        :rtype: Any
+        """
+        criteria = statement.whereclause
+        clauses = getattr(criteria, "clauses", [criteria]) if criteria is not None else []
+        filters: list[tuple[str, Any, bool]] = [self._parse_clause(clause) for clause in clauses]
+
+        for row in self._rows:
+            if all(
+                (getattr(row, key).lower() if lower else getattr(row, key)) == value for key, value, lower in filters
+            ):
+                return row
+
+        return None
+
+    @staticmethod
+    def _parse_clause(clause: Any) -> tuple[str, Any, bool]:
+        """Колонка, значение и признак сравнения без учета регистра из условия равенства"""
+        if isinstance(clause.left, FunctionElement):
+            return clause.left.clauses.clauses[0].key, clause.right.value, True
+
+        return clause.left.key, clause.right.value, False
+
+    def add(self, model: Any) -> None:
+        """Добавление модели с выдачей идентификатора"""
+        model.id = len(self._rows) + 1
+        self._rows.append(model)
+
+    async def commit(self) -> None:
+        """Фиксация транзакции"""
+
+    async def refresh(self, _: Any) -> None:
+        """Обновление модели из БД"""
@@ -0,0 +1,43 @@
+"""Дымовые тесты бенчмарков на in-memory заглушках"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+
+import pytest
+
+from . import cases  # noqa: F401 pylint: disable=unused-import
+from .env import memory_env
+from .runner import BENCHMARKS, Benchmark, BenchmarkResult, run_benchmark, compare_results
+
+
+def _memory_benchmarks() -> list:
+    """Параметры теста по бенчмаркам, доступным на заглушках"""
+    return [pytest.param(bench, id=name) for name, bench in BENCHMARKS.items() if "memory" in bench.backends]
+
+
+@pytest.mark.parametrize("bench", _memory_benchmarks())
+def test_benchmark_runs(bench: Benchmark) -> None:
+    """Бенчмарк выполняется без ошибок и дает осмысленные замеры"""
+
+    async def run() -> BenchmarkResult:
+        async with memory_env() as env:
+            return await run_benchmark(bench, env, iterations=20, warmup=2)
+
+    result: BenchmarkResult = asyncio.run(run())
+
+    assert result.error is None, result.error
+    assert result.iterations == 20
+    assert 0 < result.min_us <= result.median_us <= result.p95_us
+
+
+def test_compare_results_detects_regression() -> None:
+    """Сравнение с базовым замером считает относительное изменение медианы"""
+    baseline = {"case": BenchmarkResult("case", iterations=10, median_us=10.0)}
+    current = [BenchmarkResult("case", iterations=10, median_us=12.0), BenchmarkResult("new", median_us=1.0)]
+
+    comparisons = compare_results(current, baseline)
+
+    assert comparisons[0].delta == pytest.approx(0.2)
+    assert comparisons[0].is_regression(0.1)
+    assert comparisons[1].delta is None
@@ -0,0 +1,11 @@
+"""
+Пакет нагрузочного тестирования с локальной имитацией GoTrue (аутентификация SupaBase)
+
+Прогон против реального ASGI приложения и локального PostgreSQL:
+
+.. code-block:: bash
+
+    python -m tests.load --users 500 --concurrency 100 --latency-ms 30 --error-rate 0.01
+"""
+
+__author__: str = "Digital Horizons"
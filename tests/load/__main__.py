@@ -0,0 +1,82 @@
+"""Точка входа нагрузочного прогона: python -m tests.load"""
+
+__author__: str = "Digital Horizons"
+
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+from dataclasses import asdict
+
+from dh_mood_tracker.main import app
+
+from .harness import LoadConfig, LoadReport, run_load
+from .fake_gotrue import FakeGoTrueConfig
+
+
+def _parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон /auth/register, /auth/login и /auth/me")
+    parser.add_argument("--users", type=int, default=100, help="количество виртуальных пользователей")
+    parser.add_argument("--concurrency", type=int, default=20, help="одновременно работающих пользователей")
+    parser.add_argument("--me-requests", type=int, default=5, help="запросов /auth/me на пользователя")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="задержка ответа имитации GoTrue")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="разброс задержки имитации GoTrue")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов имитации с ошибкой")
+    parser.add_argument("--error-status", type=int, default=429, help="HTTP код инъецируемой ошибки")
+    parser.add_argument("--no-autoconfirm", action="store_true", help="подтверждать email через /users/email_confirm")
+    parser.add_argument("--keep-users", action="store_true", help="не удалять созданных пользователей")
+    parser.add_argument("--json", type=Path, default=None, help="файл для сохранения отчета")
+    return parser.parse_args()
+
+
+def _print_report(report: LoadReport) -> None:
+    """Вывод таблицы отчета"""
+    print(f"Длительность: {report.duration_s} с, пропускная способность: {report.throughput} запр/с")
+    print(
+        f"{'endpoint':<22}{'count':>8}{'errors':>8}{'rps':>10}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    )
+
+    for name, stats in report.endpoints.items():
+        print(
+            f"{name:<22}{stats.count:>8}{stats.errors:>8}{stats.throughput:>10}{stats.p50_ms:>10}"
+            f"{stats.p90_ms:>10}{stats.p95_ms:>10}{stats.p99_ms:>10}{stats.max_ms:>10}"
+        )
+
+    print(f"Запросы к GoTrue: {report.auth_requests}")
+
+
+def main() -> int:
+    """
+    Нагрузочный прогон с выводом и сохранением отчета
+
+    :return: код выхода
+    :rtype: int
+    """
+    args: argparse.Namespace = _parse_args()
+    config: LoadConfig = LoadConfig(
+        users=args.users,
+        concurrency=args.concurrency,
+        me_requests=args.me_requests,
+        fake=FakeGoTrueConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            autoconfirm=not args.no_autoconfirm,
+        ),
+        cleanup=not args.keep_users,
+    )
+
+    report: LoadReport = asyncio.run(run_load(app, config))
+    _print_report(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(asdict(report), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""Модуль локального сервера-имитации GoTrue (аутентификация SupaBase)"""
+
+__author__: str = "Digital Horizons"
+
+import hmac
+import json
+import time
+import uuid
+import base64
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Any
+from datetime import UTC, datetime
+from dataclasses import field, dataclass
+
+import uvicorn
+from fastapi import Header, FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+# Секрет подписи выдаваемых токенов доступа
+JWT_SECRET: bytes = b"fake-gotrue-secret"
+# Время жизни токена доступа в секундах
+ACCESS_TOKEN_TTL: int = 3600
+
+
+@dataclass
+class FakeGoTrueConfig:
+    """
+    Настройки поведения имитации
+
+    :cvar latency_ms: средняя задержка ответа
+    :type latency_ms: float
+    :cvar jitter_ms: разброс задержки в обе стороны
+    :type jitter_ms: float
+    :cvar error_rate: доля ответов с ошибкой
+    :type error_rate: float
+    :cvar error_status: HTTP код инъецируемой ошибки. 429 имитирует ограничение частоты запросов SupaBase
+    :type error_status: int
+    :cvar autoconfirm: подтверждать email сразу при регистрации
+    :type autoconfirm: bool
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 429
+    autoconfirm: bool = True
+
+
+@dataclass
+class FakeUser:
+    """
+    Пользователь имитации
+
+    :cvar id: UUID пользователя
+    :type id: str
+    :cvar email: адрес электронной почты
+    :type email: str
+    :cvar password: пароль
+    :type password: str
+    :cvar user_metadata: дополнительные данные регистрации
+    :type user_metadata: dict[str, Any]
+    :cvar created_at: время регистрации
+    :type created_at: str
+    :cvar confirmed_at: время подтверждения email
+    :type confirmed_at: str | None
+    """
+
+    id: str
+    email: str
+    password: str
+    user_metadata: dict[str, Any] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now(UTC).isoformat())
+    confirmed_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Пользователь в формате ответа GoTrue
+
+        :return: данные пользователя
+        :rtype: dict[str, Any]
+        """
+        return {
+            "id": self.id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": self.email,
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": self.user_metadata,
+            "created_at": self.created_at,
+            "updated_at": self.created_at,
+            "confirmed_at": self.confirmed_at,
+            "email_confirmed_at": self.confirmed_at,
+        }
+
+
+def _b64(data: bytes) -> str:
+    """Кодирование base64url без выравнивания"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def make_jwt(payload: dict[str, Any]) -> str:
+    """
+    Выпуск JWT с подписью HS256
+
+    :param payload: данные токена
+    :type payload: dict[str, Any]
+    :return: токен
+    :rtype: str
+    """
+    header: str = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    body: str = _b64(json.dumps(payload).encode())
+    signature: bytes = hmac.new(JWT_SECRET, f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64(signature)}"
+
+
+def read_jwt(token: str) -> dict[str, Any] | None:
+    """
+    Проверка подписи и срока JWT
+
+    :param token: токен
+    :type token: str
+    :return: данные токена или None - если токен недействителен
+    :rtype: dict[str, Any] | None
+    """
+    try:
+        header, body, signature = token.split(".")
+    except ValueError:
+        return None
+
+    expected: str = _b64(hmac.new(JWT_SECRET, f"{header}.{body}".encode(), hashlib.sha256).digest())
+    if not hmac.compare_digest(expected, signature):
+        return None
+
+    payload: dict[str, Any] = json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+    return payload if payload.get("exp", 0) > time.time() else None
+
+
+class FakeGoTrueState:
+    """
+    Состояние имитации: пользователи, токены обновления и токены подтверждения email
+
+    :ivar users: пользователи по email
+    :type users: dict[str, FakeUser]
+    :ivar refresh_tokens: email пользователя по токену обновления
+    :type refresh_tokens: dict[str, str]
+    :ivar confirmation_tokens: токен подтверждения по email
+    :type confirmation_tokens: dict[str, str]
+    :ivar requests: количество запросов по операции
+    :type requests: dict[str, int]
+    """
+
+    def __init__(self) -> None:
+        self.users: dict[str, FakeUser] = {}
+        self.refresh_tokens: dict[str, str] = {}
+        self.confirmation_tokens: dict[str, str] = {}
+        self.requests: dict[str, int] = {}
+
+    def user_by_id(self, user_id: str) -> FakeUser | None:
+        """Поиск пользователя по UUID"""
+        return next((user for user in self.users.values() if user.id == user_id), None)
+
+    def issue_session(self, user: FakeUser) -> dict[str, Any]:
+        """
+        Выпуск сессии пользователя
+
+        :param user: пользователь
+        :type user: FakeUser
+        :return: сессия в формате ответа GoTrue
+        :rtype: dict[str, Any]
+        """
+        now: int = int(time.time())
+        refresh_token: str = uuid.uuid4().hex
+        self.refresh_tokens[refresh_token] = user.email
+        access_token: str = make_jwt(
+            {
+                "sub": user.id,
+                "email": user.email,
+                "aud": "authenticated",
+                "role": "authenticated",
+                "iat": now,
+                "exp": now + ACCESS_TOKEN_TTL,
+                "session_id": uuid.uuid4().hex,
+            }
+        )
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": now + ACCESS_TOKEN_TTL,
+            "user": user.to_dict(),
+        }
+
+
+def _error(status_code: int, message: str, error_code: str) -> JSONResponse:
+    """Ответ с ошибкой в формате GoTrue"""
+    return JSONResponse({"code": status_code, "error_code": error_code, "msg": message}, status_code=status_code)
+
+
+def create_fake_gotrue_app(config: FakeGoTrueConfig, state: FakeGoTrueState) -> FastAPI:
+    """
+    Создание ASGI приложения имитации GoTrue под префиксом /auth/v1
+
+    :param config: настройки поведения
+    :type config: FakeGoTrueConfig
+    :param state: состояние имитации
+    :type state: FakeGoTrueState
+    :return: приложение
+    :rtype: FastAPI
+    """
+    app: FastAPI = FastAPI(title="Fake GoTrue")
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        operation: str = request.url.path.removeprefix("/auth/v1/")
+        state.requests[operation] = state.requests.get(operation, 0) + 1
+
+        if config.latency_ms or config.jitter_ms:
+            delay_ms: float = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+            await asyncio.sleep(max(delay_ms, 0.0) / 1000)
+
+        if config.error_rate and random.random() < config.error_rate:
+            if config.error_status == 429:
+                return _error(
+                    429,
+                    "For security purposes, you can only request this after 10 seconds.",
+                    "over_request_rate_limit",
+                )
+            return _error(config.error_status, "Injected failure", "unexpected_failure")
+
+        return await call_next(request)
+
+    @app.post("/auth/v1/signup")
+    async def sign_up(request: Request):
+        body: dict[str, Any] = await request.json()
+        email: str = body.get("email", "")
+
+        if "@" not in email:
+            return _error(400, f'Email address "{email}" is invalid', "email_address_invalid")
+        if email in state.users:
+            return _error(422, "User already registered", "user_already_exists")
+
+        user: FakeUser = FakeUser(str(uuid.uuid4()), email, body.get("password", ""), body.get("data") or {})
+        state.users[email] = user
+
+        if config.autoconfirm:
+            user.confirmed_at = user.created_at
+            return state.issue_session(user)
+
+        state.confirmation_tokens[email] = uuid.uuid4().hex
+        return user.to_dict()
+
+    @app.post("/auth/v1/token")
+    async def token(request: Request, grant_type: str):
+        body: dict[str, Any] = await request.json()
+
+        if grant_type == "password":
+            user: FakeUser | None = state.users.get(body.get("email", ""))
+            if not user or user.password != body.get("password"):
+                return _error(400, "Invalid login credentials", "invalid_credentials")
+            if not user.confirmed_at:
+                return _error(400, "Email not confirmed", "email_not_confirmed")
+            return state.issue_session(user)
+
+        if grant_type == "refresh_token":
+            email: str | None = state.refresh_tokens.pop(body.get("refresh_token", ""), None)
+            if not email:
+                return _error(400, "Invalid Refresh Token: Refresh Token Not Found", "refresh_token_not_found")
+            return state.issue_session(state.users[email])
+
+        return _error(400, f"Unsupported grant type {grant_type}", "validation_failed")
+
+    @app.post("/auth/v1/verify")
+    async def verify(request: Request):
+        body: dict[str, Any] = await request.json()
+        token_hash: str | None = body.get("token_hash")
+        email: str | None = next(
+            (email for email, value in state.confirmation_tokens.items() if value == token_hash), None
+        )
+
+        if not email:
+            return _error(403, "Email link is invalid or has expired", "otp_expired")
+
+        del state.confirmation_tokens[email]
+        user: FakeUser = state.users[email]
+        user.confirmed_at = datetime.now(UTC).isoformat()
+        return state.issue_session(user)
+
+    @app.get("/auth/v1/user")
+    async def get_user(authorization: str = Header("")):
+        payload: dict[str, Any] | None = read_jwt(authorization.removeprefix("Bearer "))
+        user: FakeUser | None = state.user_by_id(payload["sub"]) if payload else None
+
+        if not user:
+            return _error(403, "invalid JWT: unable to parse or verify signature", "bad_jwt")
+
+        return user.to_dict()
+
+    @app.get("/auth/v1/admin/users")
+    async def list_users(page: int = 1, per_page: int = 50):
+        users: list[FakeUser] = list(state.users.values())[(page - 1) * per_page : page * per_page]
+        return {"users": [user.to_dict() for user in users], "aud": "authenticated"}
+
+    @app.post("/auth/v1/logout")
+    async def logout():
+        return Response(status_code=204)
+
+    @app.get("/auth/v1/health")
+    async def health():
+        return {"version": "fake", "name": "GoTrue", "description": "Fake GoTrue"}
+
+    return app
+
+
+class FakeGoTrueServer:
+    """
+    Сервер имитации GoTrue в фоновом потоке текущего процесса
+
+    :ivar config: настройки поведения. Можно менять во время работы
+    :type config: FakeGoTrueConfig
+    :ivar state: состояние имитации
+    :type state: FakeGoTrueState
+
+    .. code-block:: python
+        from dh_mood_tracker.core import settings
+        from tests.load.fake_gotrue import FakeGoTrueConfig, FakeGoTrueServer
+
+        with FakeGoTrueServer(FakeGoTrueConfig(latency_ms=30, error_rate=0.01)) as fake:
+            settings.SUPABASE_URL = fake.url
+            ...
+    """
+
+    def __init__(self, config: FakeGoTrueConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config: FakeGoTrueConfig = config or FakeGoTrueConfig()
+        self.state: FakeGoTrueState = FakeGoTrueState()
+        self._server: uvicorn.Server = uvicorn.Server(
+            uvicorn.Config(
+                create_fake_gotrue_app(self.config, self.state),
+                host=host,
+                port=port,
+                log_level="warning",
+                lifespan="off",
+            )
+        )
+        self._thread: threading.Thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        Адрес сервера для SUPABASE_URL
+
+        :return: адрес сервера
+        :rtype: str
+        """
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGoTrueServer":
+        """
+        Запуск сервера с ожиданием готовности
+
+        :return: запущенный сервер
+        :rtype: FakeGoTrueServer
+        """
+        self._thread.start()
+
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Сервер имитации GoTrue не запустился")
+            time.sleep(0.01)
+
+        return self
+
+    def stop(self) -> None:
+        """Остановка сервера"""
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeGoTrueServer":
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
@@ -0,0 +1,277 @@
+"""Модуль генератора нагрузки на роуты аутентификации"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import uuid
+import asyncio
+import statistics
+from typing import Any
+from collections import Counter, defaultdict
+from dataclasses import field, dataclass
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import delete, select
+
+from dh_mood_tracker.core import settings
+from dh_mood_tracker.db.session import AsyncSessionLocal
+from dh_mood_tracker.users.model import User as UserModel
+
+from .fake_gotrue import FakeGoTrueConfig, FakeGoTrueServer
+
+# Префикс логинов пользователей, создаваемых нагрузкой
+LOAD_PREFIX: str = "load_"
+
+
+@dataclass
+class LoadConfig:
+    """
+    Настройки нагрузки
+
+    :cvar users: количество виртуальных пользователей
+    :type users: int
+    :cvar concurrency: количество одновременно работающих виртуальных пользователей
+    :type concurrency: int
+    :cvar me_requests: количество запросов /auth/me на пользователя после входа
+    :type me_requests: int
+    :cvar fake: настройки имитации GoTrue
+    :type fake: FakeGoTrueConfig
+    :cvar cleanup: удалять созданных пользователей из БД после прогона
+    :type cleanup: bool
+    """
+
+    users: int = 100
+    concurrency: int = 20
+    me_requests: int = 5
+    fake: FakeGoTrueConfig = field(default_factory=FakeGoTrueConfig)
+    cleanup: bool = True
+
+
+@dataclass
+class EndpointStats:
+    """
+    Статистика по роуту. Времена в миллисекундах
+
+    :cvar count: количество запросов
+    :type count: int
+    :cvar errors: количество ответов с кодом не 2xx
+    :type errors: int
+    :cvar throughput: запросов в секунду за время прогона
+    :type throughput: float
+    :cvar p50_ms: медиана задержки
+    :type p50_ms: float
+    :cvar p90_ms: 90-й перцентиль задержки
+    :type p90_ms: float
+    :cvar p95_ms: 95-й перцентиль задержки
+    :type p95_ms: float
+    :cvar p99_ms: 99-й перцентиль задержки
+    :type p99_ms: float
+    :cvar max_ms: максимальная задержка
+    :type max_ms: float
+    :cvar statuses: количество ответов по HTTP коду
+    :type statuses: dict[int, int]
+    """
+
+    count: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p90_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    statuses: dict[int, int]
+
+
+@dataclass
+class LoadReport:
+    """
+    Отчет о прогоне нагрузки
+
+    :cvar duration_s: длительность прогона
+    :type duration_s: float
+    :cvar throughput: запросов в секунду по всем роутам
+    :type throughput: float
+    :cvar endpoints: статистика по роутам
+    :type endpoints: dict[str, EndpointStats]
+    :cvar auth_requests: количество запросов к имитации GoTrue по операции
+    :type auth_requests: dict[str, int]
+    """
+
+    duration_s: float
+    throughput: float
+    endpoints: dict[str, EndpointStats]
+    auth_requests: dict[str, int]
+
+
+class _Recorder:
+    """
+    Сборщик задержек и кодов ответов
+
+    :ivar latencies: задержки в миллисекундах по роуту
+    :type latencies: dict[str, list[float]]
+    :ivar statuses: коды ответов по роуту
+    :type statuses: dict[str, Counter]
+    """
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs: Any) -> int:
+        """
+        Выполнение запроса с замером задержки
+
+        :return: HTTP код ответа. 599 - при исключении во время запроса
+        :rtype: int
+        """
+        started: float = time.perf_counter()
+        try:
+            status_code: int = (await client.request(method, url, **kwargs)).status_code
+        except Exception:  # pylint: disable=broad-exception-caught
+            status_code = 599
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        self.statuses[name][status_code] += 1
+        return status_code
+
+    def report(self, duration_s: float, auth_requests: dict[str, int]) -> LoadReport:
+        """Построение отчета"""
+        endpoints: dict[str, EndpointStats] = {}
+
+        for name, latencies in self.latencies.items():
+            statuses: Counter = self.statuses[name]
+            endpoints[name] = EndpointStats(
+                count=len(latencies),
+                errors=sum(count for status, count in statuses.items() if not 200 <= status < 300),
+                throughput=round(len(latencies) / duration_s, 1),
+                p50_ms=_percentile(latencies, 50),
+                p90_ms=_percentile(latencies, 90),
+                p95_ms=_percentile(latencies, 95),
+                p99_ms=_percentile(latencies, 99),
+                max_ms=round(max(latencies), 2),
+                statuses=dict(statuses),
+            )
+
+        total: int = sum(stats.count for stats in endpoints.values())
+        return LoadReport(round(duration_s, 3), round(total / duration_s, 1), endpoints, dict(auth_requests))
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    """Перцентиль по методу включающих квантилей"""
+    if len(values) == 1:
+        return round(values[0], 2)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[percent - 1], 2)
+
+
+async def _virtual_user(
+    number: int,
+    run_id: str,
+    config: LoadConfig,
+    transport: httpx.ASGITransport,
+    fake: FakeGoTrueServer,
+    recorder: _Recorder,
+) -> None:
+    """Сценарий виртуального пользователя: регистрация, подтверждение, вход и запросы /auth/me"""
+    suffix: str = f"{run_id}_{number}"
+    email: str = f"{LOAD_PREFIX}{suffix}@example.com"
+    password: str = "load-password"
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        registered: int = await recorder.request(
+            client,
+            "/auth/register",
+            "POST",
+            "/auth/register",
+            json={
+                "email": email,
+                "login": f"{LOAD_PREFIX}{suffix}",
+                "password": password,
+                "name": f"Name{suffix}",
+                "surname": f"Surname{suffix}",
+                "patronymic": None,
+            },
+        )
+        if registered != 200:
+            return
+
+        if token_hash := fake.state.confirmation_tokens.get(email):
+            await recorder.request(
+                client, "/users/email_confirm", "GET", "/users/email_confirm", params={"access_token": token_hash}
+            )
+
+        # Локальный пользователь создается OutboxRelay после записи события, а не в запросе регистрации
+        if not await _wait_for_user(f"{LOAD_PREFIX}{suffix}"):
+            return
+
+        login: int = await recorder.request(
+            client, "/auth/login", "POST", "/auth/login", json={"login": f"{LOAD_PREFIX}{suffix}", "password": password}
+        )
+        if login != 200:
+            return
+
+        for _ in range(config.me_requests):
+            await recorder.request(client, "/auth/me", "POST", "/auth/me")
+
+
+async def _wait_for_user(login: str, timeout: float = 5.0) -> bool:
+    """Ожидание создания локального пользователя по событию из outbox"""
+    deadline: float = time.perf_counter() + timeout
+
+    while time.perf_counter() < deadline:
+        async with AsyncSessionLocal() as session:
+            if await session.scalar(select(UserModel.id).where(UserModel.login == login)):
+                return True
+        await asyncio.sleep(0.01)
+
+    return False
+
+
+async def _cleanup(run_id: str) -> None:
+    """Удаление пользователей, созданных прогоном"""
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(UserModel).where(UserModel.login.startswith(f"{LOAD_PREFIX}{run_id}_")))
+        await session.commit()
+
+
+async def run_load(app: FastAPI, config: LoadConfig) -> LoadReport:
+    """
+    Прогон нагрузки на приложение с имитацией GoTrue вместо SupaBase
+
+    :param app: ASGI приложение
+    :type app: FastAPI
+    :param config: настройки нагрузки
+    :type config: LoadConfig
+    :return: отчет о прогоне
+    :rtype: LoadReport
+
+    .. code-block:: python
+        from dh_mood_tracker.main import app
+        from tests.load.harness import LoadConfig, run_load
+
+        report: LoadReport = asyncio.run(run_load(app, LoadConfig(users=500, concurrency=100)))
+    """
+    run_id: str = uuid.uuid4().hex[:8]
+    recorder: _Recorder = _Recorder()
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(config.concurrency)
+
+    with FakeGoTrueServer(config.fake) as fake:
+        original_url: str = settings.SUPABASE_URL
+        settings.SUPABASE_URL = fake.url
+        transport: httpx.ASGITransport = httpx.ASGITransport(app=app)
+
+        async def limited(number: int) -> None:
+            async with semaphore:
+                await _virtual_user(number, run_id, config, transport, fake, recorder)
+
+        try:
+            async with app.router.lifespan_context(app):
+                started: float = time.perf_counter()
+                await asyncio.gather(*(limited(number) for number in range(config.users)))
+                duration_s: float = time.perf_counter() - started
+        finally:
+            settings.SUPABASE_URL = original_url
+            if config.cleanup:
+                await _cleanup(run_id)
+
+        return recorder.report(duration_s, fake.state.requests)
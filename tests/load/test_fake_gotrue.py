@@ -0,0 +1,47 @@
+"""Тесты совместимости имитации GoTrue с клиентом SupaBase"""
+
+__author__: str = "Digital Horizons"
+
+import pytest
+from supabase import Client, create_client
+from supabase_auth.errors import AuthApiError
+
+from .fake_gotrue import FakeGoTrueConfig, FakeGoTrueServer
+
+
+@pytest.fixture(name="fake", scope="module")
+def fake_fixture():
+    """Запущенная имитация GoTrue без задержек и ошибок"""
+    with FakeGoTrueServer(FakeGoTrueConfig(autoconfirm=False)) as fake:
+        yield fake
+
+
+def test_sign_up_verify_login_and_session(fake: FakeGoTrueServer) -> None:
+    """Полный путь регистрации и входа через клиент SupaBase"""
+    client: Client = create_client(fake.url, "anon-key")
+    sign_up = client.auth.sign_up({"email": "john@example.com", "password": "secret"})
+
+    assert sign_up.user is not None and sign_up.session is None
+
+    with pytest.raises(AuthApiError, match="Email not confirmed"):
+        client.auth.sign_in_with_password({"email": "john@example.com", "password": "secret"})
+
+    client.auth.verify_otp({"type": "email", "token_hash": fake.state.confirmation_tokens["john@example.com"]})
+    login = client.auth.sign_in_with_password({"email": "john@example.com", "password": "secret"})
+
+    other: Client = create_client(fake.url, "anon-key")
+    other.auth.set_session(login.session.access_token, login.session.refresh_token)
+
+    assert other.auth.get_session().user.id == sign_up.user.id
+
+
+def test_error_injection(fake: FakeGoTrueServer) -> None:
+    """Инъекция ошибки 429 дает сообщение, которое приложение отображает в TooManySupaBaseRequest"""
+    client: Client = create_client(fake.url, "anon-key")
+    fake.config.error_rate = 1.0
+
+    try:
+        with pytest.raises(AuthApiError, match="For security purposes"):
+            client.auth.sign_up({"email": "jane@example.com", "password": "secret"})
+    finally:
+        fake.config.error_rate = 0.0
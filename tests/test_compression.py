@@ -0,0 +1,64 @@
+"""Тесты сжатия значений кеша в Redis"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+
+import pytest
+
+from dh_mood_tracker.db import RedisManager
+from dh_mood_tracker.core import dumps, loads
+from tests.benchmarks.stubs import InMemoryRedis
+from dh_mood_tracker.db.tracking import ClientSideCache
+from dh_mood_tracker.db.compression import ZLIB_HEADER, CompressionError, compress, decompress
+
+LARGE_VALUE: bytes = dumps({"rows": [{"day": day, "mood": day % 5} for day in range(500)]})
+
+
+def test_large_value_round_trip() -> None:
+    """Значение от порога сжимается с заголовком и восстанавливается без изменений"""
+    stored: bytes = compress(LARGE_VALUE, "zlib", 1024)
+
+    assert stored.startswith(ZLIB_HEADER)
+    assert len(stored) < len(LARGE_VALUE)
+    assert decompress(stored) == LARGE_VALUE
+
+
+def test_small_value_is_not_compressed() -> None:
+    """Значение меньше порога хранится как есть"""
+    value: bytes = dumps({"name": "JohnDoe"})
+
+    assert compress(value, "zlib", 1024) is value
+
+
+def test_plain_value_is_decoded() -> None:
+    """Несжатое значение, записанное до включения сжатия, читается как есть"""
+    assert decompress(b'{"name":"JohnDoe"}') == b'{"name":"JohnDoe"}'
+
+
+def test_corrupted_value_is_rejected() -> None:
+    """Поврежденное сжатое значение отклоняется"""
+    with pytest.raises(CompressionError):
+        decompress(ZLIB_HEADER + b"not zlib")
+
+
+def test_get_key_decompresses_values() -> None:
+    """get_key возвращает распакованную строку сжатых данных, в том числе для отслеживаемых ключей"""
+    redis: InMemoryRedis = InMemoryRedis()
+    manager: RedisManager = RedisManager(redis)
+    data: dict = loads(LARGE_VALUE)
+
+    async def scenario() -> list[str | None]:
+        await manager.set_json("user:1", data)
+        await manager.set_json("config:1", data)
+        untracked: str | None = await manager.get_key("config:1")
+
+        tracking: ClientSideCache = ClientSideCache(manager.get_client, ["user:"], 10)
+        tracking._ready = True  # pylint: disable=protected-access
+        manager._tracking = tracking  # pylint: disable=protected-access
+        return [untracked, await manager.get_key("user:1"), await manager.get_key("user:1")]
+
+    values: list[str | None] = asyncio.run(scenario())
+
+    assert redis._data["user:1"].startswith(ZLIB_HEADER)  # pylint: disable=protected-access
+    assert [loads(value) for value in values] == [data, data, data]
@@ -0,0 +1,68 @@
+"""Тесты условных GET запросов"""
+
+__author__: str = "Digital Horizons"
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import Request, Response
+
+from dh_mood_tracker.core import make_etag, conditional_response
+
+ETAG: str = make_etag("user", 1, datetime(2026, 10, 19, 12, 0, 0, 500, tzinfo=UTC).isoformat())
+LAST_MODIFIED: datetime = datetime(2026, 10, 19, 12, 0, 0, 500, tzinfo=UTC)
+
+
+def _request(**headers: str) -> Request:
+    """GET запрос с заголовками"""
+    return Request({"type": "http", "method": "GET", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]})
+
+
+def _respond(request: Request) -> tuple[Response, list[int]]:
+    """Условный ответ и количество построений тела"""
+    built: list[int] = []
+
+    def build() -> Response:
+        built.append(1)
+        return Response(b"{}", media_type="application/json")
+
+    return conditional_response(request, ETAG, build, last_modified=LAST_MODIFIED), built
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"if-none-match": ETAG},
+        {"if-none-match": f'"other", W/{ETAG}'},
+        {"if-none-match": "*"},
+        {"if-modified-since": "Mon, 19 Oct 2026 12:00:00 GMT"},
+    ],
+)
+def test_not_modified_skips_build(headers: dict[str, str]) -> None:
+    """Совпадение версии: 304 без тела и без построения ответа, заголовки версии сохраняются"""
+    response, built = _respond(_request(**headers))
+
+    assert response.status_code == 304
+    assert not response.body and not built
+    assert response.headers["etag"] == ETAG
+    assert response.headers["last-modified"] == "Mon, 19 Oct 2026 12:00:00 GMT"
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"if-none-match": '"other"'},
+        # If-None-Match важнее If-Modified-Since
+        {"if-none-match": '"other"', "if-modified-since": "Mon, 19 Oct 2026 12:00:00 GMT"},
+        {"if-modified-since": (LAST_MODIFIED - timedelta(seconds=1)).strftime("%a, %d %b %Y %H:%M:%S GMT")},
+        {"if-modified-since": "not a date"},
+    ],
+)
+def test_modified_builds_response(headers: dict[str, str]) -> None:
+    """Версия не совпала: ответ с телом и заголовками версии"""
+    response, built = _respond(_request(**headers))
+
+    assert response.status_code == 200 and built
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "private, no-cache"
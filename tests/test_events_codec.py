@@ -0,0 +1,55 @@
+"""Тесты бинарного кодирования событий"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+import msgpack
+
+from dh_mood_tracker.events import SupaBaseUserCreate, decode_event, encode_event
+
+
+def test_event_round_trip() -> None:
+    """Событие восстанавливается с тем же идентификатором, временем создания и данными"""
+    event: SupaBaseUserCreate = SupaBaseUserCreate(uuid.uuid4(), {"login": "john_doe", "patronymic": None})
+
+    decoded = decode_event(encode_event(event))
+
+    assert isinstance(decoded, SupaBaseUserCreate)
+    assert decoded.event_id == event.event_id
+    assert decoded.created_at == event.created_at
+    assert decoded.to_dict() == event.to_dict()
+
+
+def test_event_time_is_fixed() -> None:
+    """Метка времени события не меняется между обращениями"""
+    event: SupaBaseUserCreate = SupaBaseUserCreate(uuid.uuid4(), {})
+
+    assert event.timestamp == event.timestamp == event.to_dict()["timestamp"]
+
+
+@pytest.mark.parametrize(
+    ("payload", "message"),
+    [
+        (b"\xc1", "Поврежденные данные события"),
+        (msgpack.packb((1, "unknown", 1)), "Поврежденные данные события"),
+        (
+            msgpack.packb((99, "supabase_user_created", 1, b"0" * 16, datetime.now(UTC), {}), datetime=True),
+            "Неизвестная версия конверта",
+        ),
+        (
+            msgpack.packb((1, "unknown", 1, uuid.uuid4().bytes, datetime.now(UTC), {}), datetime=True),
+            "Неизвестное событие",
+        ),
+        (
+            msgpack.packb((1, "supabase_user_created", 1, uuid.uuid4().bytes, datetime.now(UTC), {}), datetime=True),
+            "Поврежденные данные события",
+        ),
+    ],
+)
+def test_decode_rejects_invalid_payload(payload: bytes, message: str) -> None:
+    """Поврежденные данные, неизвестная версия конверта, неизвестное событие и данные без полей отклоняются"""
+    with pytest.raises(ValueError, match=message):
+        decode_event(payload)
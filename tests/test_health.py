@@ -0,0 +1,53 @@
+"""Тесты фоновой проверки зависимостей"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from typing import Any
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.health import HealthCheck, HealthMonitor
+
+
+async def _ok() -> None:
+    """Доступная зависимость"""
+
+
+async def _down() -> None:
+    """Недоступная зависимость"""
+    raise ConnectionError("refused")
+
+
+async def _hang() -> None:
+    """Зависшая зависимость"""
+    await asyncio.sleep(10)
+
+
+def _snapshot(*checks: HealthCheck) -> dict[str, Any]:
+    """Состояние после одной проверки всех зависимостей"""
+    monitor: HealthMonitor = HealthMonitor(list(checks), interval=60.0, timeout=0.05)
+    asyncio.run(monitor.run_checks())
+    return monitor.snapshot()
+
+
+def test_not_ready_before_checks() -> None:
+    """До первой проверки приложение не готово"""
+    assert HealthMonitor([HealthCheck("postgres", _ok)], interval=60.0, timeout=1.0).snapshot()["ready"] is False
+
+
+def test_critical_dependency_down() -> None:
+    """Недоступная критичная зависимость делает приложение неготовым и попадает в ответ с задержкой"""
+    snapshot: dict[str, Any] = _snapshot(HealthCheck("postgres", _down), HealthCheck("redis", _ok))
+
+    assert snapshot["ready"] is False
+    assert snapshot["checks"]["postgres"]["error"] == "ConnectionError: refused"
+    assert snapshot["checks"]["redis"]["healthy"] is True
+    assert snapshot["checks"]["redis"]["latency_ms"] >= 0
+
+
+def test_optional_dependency_down() -> None:
+    """Зависшая некритичная зависимость отсекается таймаутом и не влияет на готовность"""
+    snapshot: dict[str, Any] = _snapshot(HealthCheck("redis", _ok), HealthCheck("supabase", _hang, critical=False))
+
+    assert snapshot["ready"] is True
+    assert snapshot["checks"]["supabase"]["healthy"] is False
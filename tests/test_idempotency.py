@@ -0,0 +1,160 @@
+"""Тесты идемпотентной обработки запросов"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from typing import Any
+
+import pytest
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db import RedisManager
+from dh_mood_tracker.core import loads, settings
+from dh_mood_tracker.utils import Idempotency, IdempotentRequest
+from tests.benchmarks.stubs import InMemoryRedis
+from dh_mood_tracker.utils.exceptions import IdempotencyKeyReused, IdempotentRequestInProgress
+from dh_mood_tracker.utils.idempotency import BEGIN_SCRIPT, FINISH_SCRIPT, REPLAYED_HEADER
+
+
+class ScriptRedis(InMemoryRedis):
+    """Redis в памяти со скриптами идемпотентности, выполняемыми атомарно в цикле событий"""
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Хранилище значений по ключу"""
+        return self._data
+
+    def register_script(self, script: str) -> "Script":
+        """Регистрация скрипта"""
+        return Script(self, script)
+
+
+class Script:
+    """Зарегистрированный скрипт"""
+
+    def __init__(self, redis: ScriptRedis, script: str) -> None:
+        self.registered_client: ScriptRedis = redis
+        self._script: str = script
+
+    async def __call__(self, keys: list[str], args: list[Any]) -> Any:
+        record: Any = self.registered_client.data.get(keys[0])
+        if self._script == BEGIN_SCRIPT:
+            if record is None:
+                self.registered_client.data[keys[0]] = args[0]
+            return record
+
+        assert self._script == FINISH_SCRIPT
+        if record != args[0]:
+            return 0
+        if args[1] == "":
+            del self.registered_client.data[keys[0]]
+        else:
+            self.registered_client.data[keys[0]] = args[1]
+        return 1
+
+
+def _request(redis: ScriptRedis, key: str | None = "key") -> IdempotentRequest:
+    return IdempotentRequest(Idempotency(RedisManager(redis)), "scope", key)
+
+
+def test_replays_stored_response() -> None:
+    """Повтор ключа получает сохраненный ответ без повторного вызова обработчика"""
+    redis: ScriptRedis = ScriptRedis()
+    calls: list[int] = []
+
+    async def handler() -> dict[str, int]:
+        calls.append(1)
+        return {"value": len(calls)}
+
+    async def scenario() -> None:
+        first = await _request(redis).run({"login": "user"}, handler, status_code=202)
+        second = await _request(redis).run({"login": "user"}, handler, status_code=202)
+
+        assert (first.status_code, first.body) == (202, b'{"value":1}')
+        assert (second.status_code, second.body) == (202, b'{"value":1}')
+        assert second.headers[REPLAYED_HEADER] == "true"
+        assert REPLAYED_HEADER not in first.headers
+
+    asyncio.run(scenario())
+    assert calls == [1]
+
+
+def test_fingerprint_is_hmac_without_plain_body() -> None:
+    """В Redis хранится HMAC тела, а не пароль или его несоленый хеш; другое тело с тем же ключом - 422"""
+    redis: ScriptRedis = ScriptRedis()
+
+    async def handler() -> bool:
+        return True
+
+    async def scenario() -> None:
+        await _request(redis).run({"password": "secret"}, handler)
+
+        with pytest.raises(IdempotencyKeyReused):
+            await _request(redis).run({"password": "other"}, handler)
+
+    asyncio.run(scenario())
+
+    record: str = redis.data["idempotency:scope:key"]
+    assert "secret" not in record
+    assert len(loads(record)["fingerprint"]) == 64
+
+
+def test_owner_separates_keys() -> None:
+    """Одинаковые ключи разных владельцев не пересекаются"""
+    redis: ScriptRedis = ScriptRedis()
+
+    async def handler() -> int:
+        return 1
+
+    async def scenario() -> None:
+        await _request(redis).run({"score": 1}, handler, owner=1)
+        await _request(redis).run({"score": 2}, handler, owner=2)
+
+    asyncio.run(scenario())
+    assert {"idempotency:scope:1:key", "idempotency:scope:2:key"} <= set(redis.data)
+
+
+def test_in_flight_duplicate_waits_then_conflicts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Дубль ждет ответа первого запроса, а не дождавшись за IDEMPOTENCY_WAIT_TIMEOUT - получает 409"""
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_TIMEOUT", 0.2)
+    redis: ScriptRedis = ScriptRedis()
+    calls: list[int] = []
+
+    async def handler(delay: float) -> int:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return len(calls)
+
+    async def scenario() -> None:
+        first = asyncio.create_task(_request(redis).run({}, lambda: handler(0.1)))
+        await asyncio.sleep(0.01)
+        duplicate = await _request(redis).run({}, lambda: handler(0.1))
+        assert (await first).body == duplicate.body == b"1"
+
+        slow = asyncio.create_task(_request(redis, "slow").run({}, lambda: handler(1.0)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(IdempotentRequestInProgress):
+            await _request(redis, "slow").run({}, lambda: handler(1.0))
+        slow.cancel()
+
+    asyncio.run(scenario())
+    assert calls == [1, 1]
+
+
+def test_failed_handler_releases_lock() -> None:
+    """Ошибка обработчика не сохраняется: блокировка снимается, повтор выполняется заново"""
+    redis: ScriptRedis = ScriptRedis()
+
+    async def failing() -> None:
+        raise RuntimeError()
+
+    async def handler() -> int:
+        return 1
+
+    async def scenario() -> None:
+        with pytest.raises(RuntimeError):
+            await _request(redis).run({}, failing)
+        assert "idempotency:scope:key" not in redis.data
+        assert (await _request(redis).run({}, handler)).body == b"1"
+
+    asyncio.run(scenario())
@@ -0,0 +1,53 @@
+"""Тесты удаления записей кеша в памяти процесса во всех воркерах"""
+
+__author__: str = "Digital Horizons"
+
+import pytest
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db import RedisManager
+from dh_mood_tracker.core import dumps
+from dh_mood_tracker.utils import LocalCache, CacheInvalidator
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"not json",
+        dumps([1, 2]),
+        dumps({"origin": "other", "operations": "token"}),
+        dumps({"origin": "other", "operations": [{"keys": ["token"]}]}),
+        dumps({"origin": "other", "operations": [1, None]}),
+        dumps({"origin": "other", "operations": [{"cache": "auth_token", "keys": "token"}]}),
+        dumps({"origin": "other", "operations": [{"cache": "auth_token", "tags": [["user:1"]]}]}),
+    ],
+)
+def test_malformed_message_is_skipped(data: bytes) -> None:
+    """Некорректное сообщение пропускается без исключения и не удаляет записи"""
+    invalidator: CacheInvalidator = CacheInvalidator(RedisManager(), "cache:invalidate")
+    cache: LocalCache = invalidator.register("auth_token", LocalCache(10))
+    cache.set("token", "user", ttl=60, tags=["user:1"])
+
+    invalidator._handle(data)  # pylint: disable=protected-access
+
+    assert cache.get("token") == "user"
+
+
+def test_valid_operations_applied_after_malformed() -> None:
+    """Корректные операции сообщения применяются, даже если соседняя операция некорректна"""
+    invalidator: CacheInvalidator = CacheInvalidator(RedisManager(), "cache:invalidate")
+    cache: LocalCache = invalidator.register("auth_token", LocalCache(10))
+    cache.set("token", "user", ttl=60)
+    cache.set("other", "user", ttl=60, tags=["user:2"])
+
+    invalidator._handle(  # pylint: disable=protected-access
+        dumps(
+            {
+                "origin": "other",
+                "operations": [{"keys": ["x"]}, {"cache": "auth_token", "keys": ["token"], "tags": ["user:2"]}],
+            }
+        )
+    )
+
+    assert cache.get("token") is None
+    assert cache.get("other") is None
@@ -0,0 +1,42 @@
+"""Тесты операций миграций без блокировки записи в таблицы"""
+
+__author__: str = "Digital Horizons"
+
+import io
+
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db.migration_ops import backfill, _index_sql, drop_index_concurrently, create_index_concurrently
+
+
+def test_index_sql() -> None:
+    """Текст индекса со всеми параметрами, CONCURRENTLY и ON ONLY"""
+    assert (
+        _index_sql("ux_users_login", "users", ["lower(login)"], True, None, ["email"], "is_active", "CONCURRENTLY")
+        == "CREATE UNIQUE INDEX CONCURRENTLY ux_users_login ON users (lower(login)) INCLUDE (email) WHERE is_active"
+    )
+    assert (
+        _index_sql("ix_mood", "mood_entries", ["user_id", "recorded_at"], False, "btree", None, None, "ON ONLY")
+        == "CREATE INDEX ix_mood ON ONLY mood_entries USING btree (user_id, recorded_at)"
+    )
+
+
+def test_offline_mode_emits_plain_statements() -> None:
+    """В режиме offline секции и строки неизвестны: выводятся обычные операторы"""
+    output: io.StringIO = io.StringIO()
+    context: MigrationContext = MigrationContext.configure(
+        dialect_name="postgresql", opts={"as_sql": True, "output_buffer": output}
+    )
+
+    with Operations.context(context):
+        create_index_concurrently("ix_users_login", "users", ["login"], include=["email"])
+        drop_index_concurrently("ix_users_login")
+        assert backfill("users", "name = login", "name IS NULL") == 0
+
+    assert [line for line in output.getvalue().splitlines() if line] == [
+        "CREATE INDEX ix_users_login ON users (login) INCLUDE (email);",
+        "DROP INDEX IF EXISTS ix_users_login;",
+        "UPDATE users SET name = login WHERE name IS NULL;",
+    ]
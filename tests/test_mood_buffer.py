@@ -0,0 +1,275 @@
+"""Тесты буфера приема записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import uuid
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from redis import ConnectionError as RedisConnectionError
+from sqlalchemy.exc import OperationalError
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db import ShardRouter, RedisManager
+from dh_mood_tracker.core import dumps_str
+from dh_mood_tracker.moods import MoodIngestBuffer
+from tests.benchmarks.stubs import InMemoryRedis
+
+STREAM: str = "moods:ingest"
+DEAD_LETTER_STREAM: str = "moods:ingest:dead"
+
+
+class StreamRedis(InMemoryRedis):
+    """Redis в памяти с потоками и одной группой читателей"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.streams: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+        self.pending: dict[str, tuple[str, float]] = {}
+        self._last_delivered: str = "0-0"
+        self._sequence: int = 0
+
+    async def xadd(self, stream: str, fields: dict[str, Any]) -> str:
+        """Добавление записи в поток"""
+        self._sequence += 1
+        message_id: str = f"{int(time.time() * 1000)}-{self._sequence}"
+        self.streams.setdefault(stream, []).append((message_id, dict(fields)))
+        return message_id
+
+    async def xgroup_create(self, stream: str, *_: Any, **__: Any) -> bool:
+        """Создание группы читателей"""
+        self.streams.setdefault(stream, [])
+        return True
+
+    async def xreadgroup(self, _: str, consumer: str, streams: dict[str, str], count: int) -> list:
+        """Чтение записей группы: "0" - свои неподтвержденные, ">" - новые"""
+        stream, message_id = next(iter(streams.items()))
+        stored: dict[str, dict[str, Any]] = dict(self.streams.get(stream, []))
+
+        if message_id == "0":
+            messages = [(key, stored.get(key, {})) for key, (owner, _) in self.pending.items() if owner == consumer]
+        else:
+            messages = [(key, fields) for key, fields in self.streams.get(stream, []) if key > self._last_delivered]
+            for key, _ in messages[:count]:
+                self.pending[key] = (consumer, time.monotonic())
+                self._last_delivered = key
+
+        return [[stream, messages[:count]]] if messages else []
+
+    async def xautoclaim(self, _: str, __: str, consumer: str, min_idle_time: int, count: int) -> list:
+        """Перехват неподтвержденных записей других читателей"""
+        claimed: list[str] = [
+            key
+            for key, (_, delivered) in self.pending.items()
+            if (time.monotonic() - delivered) * 1000 >= min_idle_time
+        ][:count]
+        for key in claimed:
+            self.pending[key] = (consumer, time.monotonic())
+        return ["0-0", claimed, []]
+
+    async def xack(self, _: str, __: str, *message_ids: str) -> int:
+        """Подтверждение записей"""
+        return sum(self.pending.pop(key, None) is not None for key in message_ids)
+
+    async def xdel(self, stream: str, *message_ids: str) -> int:
+        """Удаление записей из потока"""
+        before: int = len(self.streams.get(stream, []))
+        self.streams[stream] = [item for item in self.streams.get(stream, []) if item[0] not in message_ids]
+        return before - len(self.streams[stream])
+
+    async def xlen(self, stream: str) -> int:
+        """Количество записей в потоке"""
+        return len(self.streams.get(stream, []))
+
+    async def xrange(self, stream: str, count: int) -> list:
+        """Первые записи потока"""
+        return self.streams.get(stream, [])[:count]
+
+
+class DownRedis(InMemoryRedis):
+    """Недоступный Redis"""
+
+    async def xadd(self, *_: Any) -> str:
+        """Добавление записи в поток"""
+        raise RedisConnectionError("Redis недоступен")
+
+
+class RecordingSession:
+    """Сессия БД, запоминающая вставленные записи. При failing вставка завершается ошибкой БД"""
+
+    def __init__(self, inserted: list[dict[str, Any]], failing: bool = False) -> None:
+        self._inserted: list[dict[str, Any]] = inserted
+        self._failing: bool = failing
+
+    async def __aenter__(self) -> "RecordingSession":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        return None
+
+    async def execute(self, _: Any, params: dict[str, list]) -> SimpleNamespace:
+        """Вставка пакета"""
+        if self._failing:
+            raise OperationalError("INSERT", {}, OSError("БД недоступна"))
+        self._inserted.extend({"entry_id": str(entry_id)} for entry_id in params["entry_ids"])
+        return SimpleNamespace(rowcount=len(params["entry_ids"]))
+
+    async def commit(self) -> None:
+        """Фиксация транзакции"""
+
+    async def rollback(self) -> None:
+        """Откат транзакции"""
+
+
+def _buffer(
+    redis: InMemoryRedis, inserted: list[dict[str, Any]], failing: bool = False, claim_idle: float = 30.0
+) -> MoodIngestBuffer:
+    router: ShardRouter = ShardRouter([lambda: RecordingSession(inserted, failing)])
+    return MoodIngestBuffer(RedisManager(redis), router, STREAM, "writers", 100, 0.01, claim_idle, DEAD_LETTER_STREAM)
+
+
+def _entry() -> dict[str, Any]:
+    return {
+        "entry_id": str(uuid.uuid4()),
+        "user_id": 1,
+        "shard_key": str(uuid.uuid4()),
+        "score": 7,
+        "note": None,
+        "recorded_at": "2026-10-19T12:00:00+00:00",
+    }
+
+
+def test_flush_inserts_batch_and_removes_messages() -> None:
+    """Пакет вставляется одним запросом, затем записи подтверждаются (XACK) и удаляются из потока (XDEL)"""
+    redis: StreamRedis = StreamRedis()
+    inserted: list[dict[str, Any]] = []
+    buffer: MoodIngestBuffer = _buffer(redis, inserted)
+    entries: list[dict[str, Any]] = [_entry(), _entry()]
+
+    async def scenario() -> None:
+        for entry in entries:
+            await buffer.append(entry)
+        assert await buffer.flush() == 2
+        assert await buffer.flush() == 0
+
+    asyncio.run(scenario())
+
+    assert [entry["entry_id"] for entry in inserted] == [entry["entry_id"] for entry in entries]
+    assert not redis.streams[STREAM] and not redis.pending
+    assert (buffer.metrics.accepted, buffer.metrics.flushes, buffer.metrics.flushed) == (2, 1, 2)
+
+
+def test_failed_insert_keeps_messages_pending() -> None:
+    """При ошибке БД записи остаются неподтвержденными и записываются следующей попыткой"""
+    redis: StreamRedis = StreamRedis()
+    inserted: list[dict[str, Any]] = []
+    failing: MoodIngestBuffer = _buffer(redis, inserted, failing=True)
+    entry: dict[str, Any] = _entry()
+
+    async def scenario() -> None:
+        await failing.append(entry)
+        assert await failing.flush() == 0
+        assert len(redis.pending) == 1
+
+        # Тот же процесс после восстановления БД сначала перечитывает свои неподтвержденные записи
+        failing._router = ShardRouter([lambda: RecordingSession(inserted)])  # pylint: disable=protected-access
+        assert await failing.flush() == 1
+
+    asyncio.run(scenario())
+
+    assert [item["entry_id"] for item in inserted] == [entry["entry_id"]]
+    assert failing.metrics.failures == 1 and "OperationalError" in failing.metrics.last_error
+    assert not redis.pending and not redis.streams[STREAM]
+
+
+def test_unparseable_messages_are_dead_lettered() -> None:
+    """Нечитаемые записи переносятся в поток недоставленных записей, остальные записи пакета вставляются"""
+    redis: StreamRedis = StreamRedis()
+    inserted: list[dict[str, Any]] = []
+    buffer: MoodIngestBuffer = _buffer(redis, inserted)
+    entry: dict[str, Any] = _entry()
+
+    async def scenario() -> None:
+        await redis.xadd(STREAM, {"d": "not json"})
+        await redis.xadd(STREAM, {"d": dumps_str({**_entry(), "shard_key": "not uuid"})})
+        await redis.xadd(STREAM, {"d": dumps_str({**_entry(), "recorded_at": "yesterday"})})
+        await buffer.append(entry)
+        assert await buffer.flush() == 4
+        assert await buffer.flush() == 0
+
+    asyncio.run(scenario())
+
+    assert [item["entry_id"] for item in inserted] == [entry["entry_id"]]
+    assert not redis.streams[STREAM] and not redis.pending
+    dead: list[dict[str, Any]] = [fields for _, fields in redis.streams[DEAD_LETTER_STREAM]]
+    assert [fields["d"] for fields in dead][0] == "not json"
+    assert all(fields["error"] and fields["id"] for fields in dead)
+    assert buffer.metrics.dead_letters == 3
+
+
+def test_claims_messages_of_stopped_consumer() -> None:
+    """Записи, зависшие у остановленного процесса, забираются другим процессом (XAUTOCLAIM) и записываются"""
+    redis: StreamRedis = StreamRedis()
+    inserted: list[dict[str, Any]] = []
+    stopped: MoodIngestBuffer = _buffer(redis, inserted, failing=True)
+    stopped._consumer = "stopped"  # pylint: disable=protected-access
+    other: MoodIngestBuffer = _buffer(redis, inserted, claim_idle=0.0)
+    entry: dict[str, Any] = _entry()
+
+    async def scenario() -> None:
+        await stopped.append(entry)
+        assert await stopped.flush() == 0
+        assert await other.flush() == 0
+
+        await other._claim()  # pylint: disable=protected-access
+        assert await other.flush() == 1
+
+    asyncio.run(scenario())
+
+    assert [item["entry_id"] for item in inserted] == [entry["entry_id"]]
+    assert not redis.pending
+
+
+def test_direct_write_when_redis_down() -> None:
+    """При недоступности Redis запись сразу вставляется в БД"""
+    inserted: list[dict[str, Any]] = []
+    buffer: MoodIngestBuffer = _buffer(DownRedis(), inserted)
+    entry: dict[str, Any] = _entry()
+
+    asyncio.run(buffer.append(entry))
+
+    assert [item["entry_id"] for item in inserted] == [entry["entry_id"]]
+    assert (buffer.metrics.accepted, buffer.metrics.direct_writes) == (1, 1)
+
+
+def test_loop_survives_unexpected_errors() -> None:
+    """Неожиданная ошибка цикла учитывается в метриках, а цикл продолжает записывать пакеты"""
+    redis: StreamRedis = StreamRedis()
+    inserted: list[dict[str, Any]] = []
+    buffer: MoodIngestBuffer = _buffer(redis, inserted)
+    calls: list[int] = []
+    flush = buffer.flush
+
+    async def flaky_flush() -> int:
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("сбой")
+        return await flush()
+
+    buffer.flush = flaky_flush  # type: ignore[method-assign]
+
+    async def scenario() -> dict[str, Any]:
+        await buffer.start()
+        await buffer.append(_entry())
+        await asyncio.sleep(0.1)
+        snapshot: dict[str, Any] = await buffer.snapshot()
+        await buffer.stop()
+        assert not (await buffer.snapshot())["running"]
+        return snapshot
+
+    snapshot: dict[str, Any] = asyncio.run(scenario())
+
+    assert snapshot["running"] and snapshot["failures"] == 1 and "RuntimeError" in snapshot["last_error"]
+    assert len(inserted) == 1 and snapshot["backlog"] == 0
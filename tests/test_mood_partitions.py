@@ -0,0 +1,29 @@
+"""Тесты месячных секций записей настроения"""
+
+__author__: str = "Digital Horizons"
+
+from datetime import date
+
+from dh_mood_tracker.moods import partitions
+from dh_mood_tracker.moods.partitions import add_months, upcoming_months, create_partition_sql
+
+
+def test_upcoming_months_cross_year() -> None:
+    """Месяцы считаются от первого дня текущего месяца с переходом через год"""
+    assert upcoming_months(3, date(2026, 11, 17)) == [date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)]
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_create_partition_sql() -> None:
+    """Границы секции - полночь по UTC первых дней месяца и следующего месяца"""
+    sql: str = create_partition_sql(date(2026, 12, 1))
+
+    assert "mood_entries_2026_12 PARTITION OF mood_entries" in sql
+    assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+
+
+def test_partition_pattern() -> None:
+    """Шаблон секций не захватывает родительскую таблицу"""
+    assert partitions.PARTITION_PATTERN.match(partitions.partition_name(date(2026, 1, 1)))
+    assert partitions.PARTITION_PATTERN.match("mood_entries_default")
+    assert not partitions.PARTITION_PATTERN.match("mood_entries")
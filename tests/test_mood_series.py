@@ -0,0 +1,34 @@
+"""Тесты ряда настроения"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.core import BaseBadRequestAppException, settings
+from dh_mood_tracker.moods import MoodBucket, MoodService
+from dh_mood_tracker.moods.exceptions import TooManyBuckets, UnknownTimeZone, InvalidBucketStep, InvalidSeriesPeriod
+
+END: datetime = datetime(2026, 10, 19, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "start, bucket, step, time_zone, exception",
+    [
+        (END, MoodBucket.DAY, 1, "UTC", InvalidSeriesPeriod),
+        (END - timedelta(days=30), MoodBucket.MONTH, 2, "UTC", InvalidBucketStep),
+        (END - timedelta(hours=settings.MOOD_SERIES_MAX_BUCKETS), MoodBucket.HOUR, 1, "UTC", TooManyBuckets),
+        (END - timedelta(days=30), MoodBucket.DAY, 1, "Mars/Base", UnknownTimeZone),
+    ],
+)
+def test_series_rejected_before_query(
+    start: datetime, bucket: MoodBucket, step: int, time_zone: str, exception: type[BaseBadRequestAppException]
+) -> None:
+    """Некорректный ряд отклоняется с кодом 400 до запроса к БД"""
+    with pytest.raises(exception) as error:
+        asyncio.run(MoodService(None).series(1, start, END, bucket, step, time_zone))
+
+    assert error.value.status_code == 400
@@ -0,0 +1,35 @@
+"""Тесты расчета пула соединений с PostgreSQL"""
+
+__author__: str = "Digital Horizons"
+
+from sqlalchemy.pool import NullPool
+
+from dh_mood_tracker.core import Settings
+from dh_mood_tracker.db.pool import PoolSizing, get_pool_sizing, get_engine_options
+
+
+def test_budget_is_shared_between_processes() -> None:
+    """Все процессы всех реплик вместе не превышают бюджет соединений"""
+    config: Settings = Settings(DB_CONNECTION_BUDGET=80, DB_WORKERS=8, DB_REPLICAS=2)
+
+    sizing: PoolSizing = get_pool_sizing(config)
+
+    assert sizing == PoolSizing(pool_size=2, max_overflow=3)
+    assert sizing.max_connections * 8 * 2 <= 80
+
+
+def test_process_keeps_one_connection_over_budget() -> None:
+    """При бюджете меньше количества процессов у процесса остается одно соединение"""
+    assert get_pool_sizing(Settings(DB_CONNECTION_BUDGET=4, DB_WORKERS=8)) == PoolSizing(1, 0)
+
+
+def test_pgbouncer_mode_without_pool() -> None:
+    """Режим PgBouncer без пула выключает кеш подготовленных выражений asyncpg"""
+    options: dict = get_engine_options(Settings(DB_PGBOUNCER=True, DB_POOL_SIZE=0))
+
+    connect_args: dict = options["connect_args"]
+
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+    assert connect_args["statement_cache_size"] == connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
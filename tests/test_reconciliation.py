@@ -0,0 +1,118 @@
+"""Тесты сверки пользователей с SupaBase"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+import asyncio
+from uuid import UUID
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+from datetime import UTC, datetime
+
+from supabase_auth import User
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.reconciliation import Difference, UserReconciler, merge_diff, fetch_remote_users
+
+
+class DeactivateSession:
+    """Сессия БД, деактивирующая пользователей с заданными идентификаторами"""
+
+    def __init__(self, user_ids: list[int]) -> None:
+        self._user_ids: list[int] = user_ids
+
+    async def execute(self, _: Any) -> SimpleNamespace:
+        """Выполнение UPDATE ... RETURNING id"""
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self._user_ids))
+
+    async def commit(self) -> None:
+        """Фиксация транзакции"""
+
+
+class RecordingTokenCache:
+    """Кеш пользователей по токену, запоминающий удаленных пользователей"""
+
+    def __init__(self) -> None:
+        self.evicted: list[int] = []
+
+    async def evict_user(self, user_id: int) -> None:
+        """Удаление токенов пользователя"""
+        self.evicted.append(user_id)
+
+
+async def _stream(ids: list[UUID]) -> AsyncIterator[UUID]:
+    """Локальный поток UUID"""
+    for supabase_id in ids:
+        yield supabase_id
+
+
+def _diff(remote: list[UUID], local: list[UUID]) -> list[tuple[Difference, UUID]]:
+    """Расхождения двух отсортированных списков"""
+
+    async def collect() -> list[tuple[Difference, UUID]]:
+        return [item async for item in merge_diff(remote, _stream(local))]
+
+    return asyncio.run(collect())
+
+
+def _user(supabase_id: UUID) -> User:
+    """Пользователь SupaBase"""
+    return User(
+        id=str(supabase_id), app_metadata={}, user_metadata={}, aud="authenticated", created_at=datetime.now(UTC)
+    )
+
+
+def test_merge_diff_matches_set_difference() -> None:
+    """Слияние отсортированных потоков дает ту же разность, что и операции над множествами"""
+    ids: list[UUID] = [uuid.uuid4() for _ in range(1000)]
+    remote: set[UUID] = set(ids[:700])
+    local: set[UUID] = set(ids[300:])
+
+    result: list[tuple[Difference, UUID]] = _diff(sorted(remote), sorted(local))
+
+    assert {item for kind, item in result if kind is Difference.MISSING} == remote - local
+    assert {item for kind, item in result if kind is Difference.ORPHAN} == local - remote
+    assert [item for _, item in result] == sorted(remote ^ local)
+
+
+def test_merge_diff_empty_sides() -> None:
+    """Пустая сторона: все UUID другой стороны - расхождения"""
+    ids: list[UUID] = sorted(uuid.uuid4() for _ in range(3))
+
+    assert _diff(ids, []) == [(Difference.MISSING, item) for item in ids]
+    assert _diff([], ids) == [(Difference.ORPHAN, item) for item in ids]
+    assert not _diff(ids, ids)
+
+
+def test_fetch_remote_users_bounded_concurrency() -> None:
+    """Страницы читаются не более чем concurrency запросами одновременно до первой неполной страницы"""
+    users: list[User] = [_user(uuid.uuid4()) for _ in range(2050)]
+    in_flight: list[int] = [0, 0]
+    pages: list[int] = []
+
+    async def list_page(page: int, per_page: int) -> list[User]:
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        pages.append(page)
+        await asyncio.sleep(0.001)
+        in_flight[0] -= 1
+        return users[(page - 1) * per_page : page * per_page]
+
+    remote = asyncio.run(fetch_remote_users(list_page, 100, 4))
+
+    assert [user.supabase_id for user in remote] == sorted(UUID(user.id) for user in users)
+    assert in_flight[1] <= 4
+    assert max(pages) <= 21 + 3
+
+
+def test_deactivate_evicts_cached_tokens() -> None:
+    """Токены деактивированных пользователей удаляются из кеша"""
+    token_cache: RecordingTokenCache = RecordingTokenCache()
+    reconciler: UserReconciler = UserReconciler(None, token_cache=token_cache)  # type: ignore[arg-type]
+
+    session: DeactivateSession = DeactivateSession([3, 7])
+
+    deactivated: int = asyncio.run(reconciler._deactivate(session, [uuid.uuid4()]))  # pylint: disable=protected-access
+
+    assert deactivated == 2
+    assert token_cache.evicted == [3, 7]
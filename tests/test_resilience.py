@@ -0,0 +1,119 @@
+"""Тесты устойчивости вызовов внешних сервисов"""
+
+__author__: str = "Digital Horizons"
+
+import time
+import asyncio
+
+import pytest
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.utils.exceptions import ServiceUnavailable
+from dh_mood_tracker.utils.resilience import Resilience, CircuitState, CircuitBreaker, ResiliencePolicy
+
+
+class ServiceDown(Exception):
+    """Сбой сервиса"""
+
+
+class BadRequest(Exception):
+    """Ошибка запроса, не означающая сбой сервиса"""
+
+
+def _resilience(policy: ResiliencePolicy, min_calls: int = 2, reset_timeout: float = 60.0) -> Resilience:
+    """Устойчивость с предохранителем, размыкающимся, когда все min_calls вызовов завершились сбоем"""
+    return Resilience(
+        "Service",
+        {"operation": policy},
+        CircuitBreaker(failure_rate=1.0, min_calls=min_calls, window=10, reset_timeout=reset_timeout),
+        lambda ex: isinstance(ex, ServiceDown),
+    )
+
+
+def _fail(exception: type[Exception]) -> None:
+    raise exception()
+
+
+def test_retries_only_idempotent_operations() -> None:
+    """Идемпотентная операция повторяется до успеха, неидемпотентная выполняется один раз"""
+    calls: list[int] = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise ServiceDown()
+        return "ok"
+
+    resilience = _resilience(ResiliencePolicy(retries=2, idempotent=True, backoff=0), min_calls=10)
+    assert asyncio.run(resilience.call("operation", flaky)) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+    resilience = _resilience(ResiliencePolicy(retries=2, idempotent=False))
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(resilience.call("operation", flaky))
+    assert len(calls) == 1
+
+
+def test_request_errors_do_not_open_circuit() -> None:
+    """Ошибки запроса пробрасываются как есть и не размыкают предохранитель"""
+    resilience = _resilience(ResiliencePolicy())
+
+    for _ in range(5):
+        with pytest.raises(BadRequest):
+            asyncio.run(resilience.call("operation", _fail, BadRequest))
+
+    assert resilience.breaker.state == CircuitState.CLOSED
+
+
+def test_circuit_opens_and_recovers() -> None:
+    """Предохранитель размыкается по доле сбоев, отклоняет вызовы и замыкается после пробного успеха"""
+    resilience = _resilience(ResiliencePolicy(), reset_timeout=0.05)
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailable):
+            asyncio.run(resilience.call("operation", _fail, ServiceDown))
+    assert resilience.breaker.state == CircuitState.OPEN
+
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(resilience.call("operation", lambda: "ok"))
+    assert resilience.snapshot()["circuit"]["rejected"] == 1
+
+    time.sleep(0.06)
+    assert asyncio.run(resilience.call("operation", lambda: "ok")) == "ok"
+    assert resilience.breaker.state == CircuitState.CLOSED
+
+
+def test_timeout_and_bulkhead() -> None:
+    """Зависший вызов прерывается по таймауту, а лишний одновременный вызов отклоняется"""
+    resilience = _resilience(ResiliencePolicy(max_concurrency=1, timeout=0.2, acquire_timeout=0.01))
+
+    async def run() -> list[BaseException | None]:
+        return await asyncio.gather(
+            resilience.call("operation", time.sleep, 0.5),
+            resilience.call("operation", time.sleep, 0),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, ServiceUnavailable)
+    assert isinstance(second, ServiceUnavailable)
+    assert resilience.snapshot()["operations"]["operation"]["rejected"] == 1
+
+
+def test_bulkhead_holds_slot_until_thread_finishes() -> None:
+    """Место вызова, прерванного таймаутом, освобождается только после завершения его потока"""
+    resilience = _resilience(ResiliencePolicy(max_concurrency=1, timeout=0.05, acquire_timeout=0.01), min_calls=10)
+
+    async def run() -> tuple[BaseException | None, BaseException | None, float]:
+        first = await asyncio.gather(resilience.call("operation", time.sleep, 0.3), return_exceptions=True)
+        # Поток первого вызова еще работает: места нет
+        second = await asyncio.gather(resilience.call("operation", time.sleep, 0), return_exceptions=True)
+        await asyncio.sleep(0.35)
+        return first[0], second[0], await resilience.call("operation", time.monotonic)
+
+    first, second, third = asyncio.run(run())
+    assert isinstance(first, ServiceUnavailable)
+    assert isinstance(second, ServiceUnavailable)
+    assert third > 0
+    assert resilience.snapshot()["operations"]["operation"] == {"in_flight": 0, "max_concurrency": 1, "rejected": 1}
@@ -0,0 +1,84 @@
+"""Тесты планировщика периодических задач"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db import RedisManager
+from tests.benchmarks.stubs import InMemoryRedis
+from dh_mood_tracker.scheduler import Job, Scheduler, CronSchedule, LeaderElection
+
+MOMENT: datetime = datetime(2026, 10, 19, 12, 30, 45, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("* * * * *", datetime(2026, 10, 19, 12, 31, tzinfo=UTC)),
+        ("*/15 * * * *", datetime(2026, 10, 19, 12, 45, tzinfo=UTC)),
+        ("15 3 * * *", datetime(2026, 10, 20, 3, 15, tzinfo=UTC)),
+        ("0 0 1 * *", datetime(2026, 11, 1, tzinfo=UTC)),
+        ("0 9 * * 1-5", datetime(2026, 10, 20, 9, 0, tzinfo=UTC)),
+        # Воскресенье - 0 и 7
+        ("0 0 * * 7", datetime(2026, 10, 25, tzinfo=UTC)),
+        # День месяца или день недели
+        ("0 0 13 * 5", datetime(2026, 10, 23, tzinfo=UTC)),
+        ("0 0 29 2 *", datetime(2028, 2, 29, tzinfo=UTC)),
+        ("30 4 1,15 1-3/2 *", datetime(2027, 1, 1, 4, 30, tzinfo=UTC)),
+    ],
+)
+def test_cron_next_after(expression: str, expected: datetime) -> None:
+    """Ближайший запуск строго после момента"""
+    assert CronSchedule(expression).next_after(MOMENT) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * 0 * *", "5-1 * * * *", "*/0 * * * *"])
+def test_cron_invalid(expression: str) -> None:
+    """Некорректное выражение отклоняется при создании"""
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_job_requires_single_schedule() -> None:
+    """Задача задается ровно одним из интервала и расписания"""
+    with pytest.raises(ValueError):
+        Job("job", asyncio.sleep)
+    with pytest.raises(ValueError):
+        Job("job", asyncio.sleep, interval=1.0, cron="* * * * *")
+
+    assert Job("job", asyncio.sleep, interval=5.0).next_run(100.0) == 105.0
+
+
+def test_run_without_overlap_and_failures() -> None:
+    """Цикл задачи не запускает ее повторно до окончания запуска, ошибки учитываются и не останавливают цикл"""
+    running: list[int] = [0, 0]
+    calls: list[int] = []
+
+    async def work() -> int:
+        running[0] += 1
+        running[1] = max(running)
+        calls.append(1)
+        await asyncio.sleep(0.03)
+        running[0] -= 1
+        if len(calls) % 2 == 0:
+            raise RuntimeError("сбой")
+        return len(calls)
+
+    async def scenario() -> Scheduler:
+        redis_manager: RedisManager = RedisManager(InMemoryRedis())
+        job: Job = Job("work", work, interval=0.001, singleton=False, run_at_start=True)
+        scheduler: Scheduler = Scheduler(redis_manager, [job], LeaderElection(redis_manager, "leader", 1.0))
+        await scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+        return scheduler
+
+    stats = asyncio.run(scenario()).stats["work"]
+
+    assert running[1] == 1
+    assert stats.runs >= 2 and stats.failures >= 2
+    assert stats.last_error == "RuntimeError: сбой"
@@ -0,0 +1,85 @@
+"""Тесты распределения данных пользователей по шардам"""
+
+__author__: str = "Digital Horizons"
+
+import uuid
+import asyncio
+from typing import Any
+from collections import Counter
+
+import pytest
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db.sharding import ShardRouter, jump_hash, shard_key_hash
+
+KEYS: list[uuid.UUID] = [uuid.UUID(int=index * 0x9E3779B97F4A7C15 % (1 << 128)) for index in range(10000)]
+
+
+class FakeSession:
+    """Сессия шарда, фиксирующая транзакцию"""
+
+    def __init__(self) -> None:
+        self.committed: bool = False
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        pass
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        pass
+
+
+def test_jump_hash_balanced() -> None:
+    """Ключи распределяются по шардам равномерно"""
+    counts: Counter = Counter(jump_hash(shard_key_hash(key), 4) for key in KEYS)
+
+    assert set(counts) == {0, 1, 2, 3}
+    assert all(abs(count - len(KEYS) / 4) < len(KEYS) * 0.03 for count in counts.values())
+
+
+def test_jump_hash_adding_shard_moves_only_to_new_shard() -> None:
+    """При добавлении шарда ключи переезжают только на него и в доле около 1 / N"""
+    hashes: list[int] = [shard_key_hash(key) for key in KEYS]
+    moved: list[int] = [jump_hash(key, 5) for key in hashes if jump_hash(key, 4) != jump_hash(key, 5)]
+
+    assert set(moved) == {4}
+    assert abs(len(moved) - len(KEYS) / 5) < len(KEYS) * 0.03
+
+
+def test_router_single_shard() -> None:
+    """Без шардирования все пользователи в одном шарде"""
+    router: ShardRouter = ShardRouter([FakeSession])
+
+    assert len(router) == 1
+    assert {router.shard_of(key) for key in KEYS[:100]} == {0}
+
+
+def test_router_requires_shards() -> None:
+    """Маршрутизатор без шардов не создается"""
+    with pytest.raises(ValueError):
+        ShardRouter([])
+
+
+def test_scatter_gather_concurrent_in_shard_order() -> None:
+    """Запросы выполняются на всех шардах параллельно, результаты - по номеру шарда"""
+    router: ShardRouter = ShardRouter([FakeSession, FakeSession, FakeSession])
+    running: set[int] = set()
+    overlapped: list[bool] = []
+
+    async def query(session: FakeSession, shard: int) -> tuple[int, FakeSession]:
+        running.add(shard)
+        # Последний шард отвечает первым
+        await asyncio.sleep(0.01 * (3 - shard))
+        overlapped.append(len(running) == 3)
+        return shard, session
+
+    results: list[tuple[int, FakeSession]] = asyncio.run(router.scatter_gather(query))
+
+    assert [shard for shard, _ in results] == [0, 1, 2]
+    assert all(session.committed for _, session in results)
+    assert all(overlapped)
@@ -0,0 +1,121 @@
+"""Тесты поиска пользователей"""
+
+__author__: str = "Digital Horizons"
+
+import asyncio
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+import dh_mood_tracker.users  # noqa: F401 pylint: disable=unused-import
+from dh_mood_tracker.db import RedisManager
+from dh_mood_tracker.core import loads, settings
+from dh_mood_tracker.users import UserService
+from tests.benchmarks.stubs import InMemoryRedis
+from dh_mood_tracker.users.routes import user_search
+from dh_mood_tracker.users.service import _escape_like
+
+
+class RowsResult:
+    """Результат запроса со строками"""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows: list[dict[str, Any]] = rows
+
+    def mappings(self) -> list[dict[str, Any]]:
+        """Строки результата"""
+        return self._rows
+
+
+class SearchSession:
+    """Сессия БД, возвращающая строки id от after + 1 и запоминающая текст запросов"""
+
+    def __init__(self, total: int) -> None:
+        self._total: int = total
+        self.statements: list[str] = []
+        self.params: list[dict[str, Any]] = []
+
+    async def execute(self, statement: Any) -> RowsResult:
+        """Выполнение запроса"""
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        self.params.append(compiled.params)
+        after: int = compiled.params.get("id_1", 0)
+        limit: int = compiled.params["param_1"]
+        ids: list[int] = list(range(after + 1, self._total + 1))[:limit]
+        return RowsResult(
+            [{"id": user_id, "login": f"user{user_id}", "name": None, "surname": None} for user_id in ids]
+        )
+
+
+class CountingService:
+    """Сервис поиска, считающий обращения к БД"""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    async def search(self, *args: Any) -> dict[str, Any]:
+        """Поиск"""
+        self.calls.append(args)
+        return {"items": [{"id": len(self.calls), "login": "ivan", "name": None, "surname": None}], "next_after": None}
+
+
+def test_escape_like() -> None:
+    """Спецсимволы шаблона LIKE экранируются, а обратная косая черта - первой"""
+    assert _escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
+    assert _escape_like("ivan") == "ivan"
+
+
+def test_search_keyset_pages() -> None:
+    """Страница выбирается по id > after с limit + 1 строкой: лишняя строка означает следующую страницу"""
+    session: SearchSession = SearchSession(total=5)
+    service: UserService = UserService(session)
+
+    async def scenario() -> list[dict[str, Any]]:
+        first: dict[str, Any] = await service.search("a_b%", limit=2)
+        second: dict[str, Any] = await service.search("a_b%", after=first["next_after"], limit=2)
+        last: dict[str, Any] = await service.search("a_b%", after=second["next_after"], limit=2)
+        return [first, second, last]
+
+    pages: list[dict[str, Any]] = asyncio.run(scenario())
+
+    assert [[item["id"] for item in page["items"]] for page in pages] == [[1, 2], [3, 4], [5]]
+    assert [page["next_after"] for page in pages] == [2, 4, None]
+    assert "OFFSET" not in session.statements[1] and "users.id > %(id_1)s" in session.statements[1]
+    assert [params["param_1"] for params in session.params] == [3, 3, 3]
+
+
+def test_search_pattern_is_escaped() -> None:
+    """Строка поиска подставляется в шаблон ILIKE с экранированием"""
+    session: SearchSession = SearchSession(total=0)
+
+    asyncio.run(UserService(session).search("50%_off"))
+
+    assert "ILIKE" in session.statements[0] and "ESCAPE '\\'" in session.statements[0]
+    assert "%50\\%\\_off%" in session.params[0].values()
+
+
+def test_search_route_caches_short_first_pages() -> None:
+    """Первая страница короткого запроса берется из кеша, ключ не зависит от регистра"""
+    redis_manager: RedisManager = RedisManager(InMemoryRedis())
+    service: CountingService = CountingService()
+
+    async def search(q: str, fuzzy: bool = False, after: int | None = None) -> dict[str, Any]:
+        response = await user_search(q, fuzzy, after, 20, service, redis_manager, None)
+        return loads(response.body)
+
+    async def scenario() -> list[dict[str, Any]]:
+        return [
+            await search("Ivan"),
+            await search("ivan"),
+            await search("ivan", fuzzy=True),
+            await search("ivan", after=1),
+            await search("i" * (settings.USER_SEARCH_CACHE_PREFIX_LENGTH + 1)),
+            await search("i" * (settings.USER_SEARCH_CACHE_PREFIX_LENGTH + 1)),
+        ]
+
+    pages: list[dict[str, Any]] = asyncio.run(scenario())
+
+    # Повтор в другом регистре - из кеша, нечеткий поиск, следующие страницы и длинные запросы - из БД
+    assert [page["items"][0]["id"] for page in pages] == [1, 1, 2, 3, 4, 5]
+    assert service.calls[0] == ("Ivan", False, None, 20)